@@ -11,6 +11,7 @@ interface Env {
   REPORTING_PROXY_URL?: string;
   ANIMATCH_SECRET?: string;
   ALLOWED_ORIGIN?: string;
+  ASSETS?: Fetcher;
 }
 
 const app = new Hono<{ Bindings: Env }>().basePath('/api');
@@ -192,14 +193,33 @@ app.post('/analytics/log', rateLimitMiddleware, async (c) => {
   }
 });
 
+// ── Analytics rollups ────────────────────────────────────────────────────────
+// analysis_rollups / feedback_rollups (migrations/0005) are maintained by
+// ml/analytics_rollup.py up to the watermark in rollup_watermarks. Queries
+// read rollup rows plus the raw rows past the watermark, so results stay
+// current between rollup runs (and match the raw tables before the first).
+
+const rawTail = (source: 'analysis_logs' | 'match_feedback') =>
+  `id > (SELECT COALESCE(MAX(last_id), 0) FROM rollup_watermarks WHERE source = '${source}')`;
+
 // ── GET /api/analytics/trending ──────────────────────────────────────────────
+// Last 7 calendar days (UTC), from daily rollups.
 
 app.get('/analytics/trending', rateLimitMiddleware, async (c) => {
   try {
     const result = await c.env.DB.prepare(
-      `SELECT matched_character, matched_anime, COUNT(*) as count, ROUND(AVG(similarity_score), 2) as avg_score
-       FROM analysis_logs
-       WHERE created_at > datetime('now', '-7 days')
+      `WITH recent AS (
+         SELECT matched_character, matched_anime, match_count, score_sum
+         FROM analysis_rollups
+         WHERE period = 'day' AND bucket >= date('now', '-6 days')
+         UNION ALL
+         SELECT matched_character, matched_anime, 1, similarity_score
+         FROM analysis_logs
+         WHERE ${rawTail('analysis_logs')} AND created_at >= date('now', '-6 days')
+       )
+       SELECT matched_character, matched_anime, SUM(match_count) as count,
+              ROUND(SUM(score_sum) / SUM(match_count), 2) as avg_score
+       FROM recent
        GROUP BY matched_character, matched_anime
        ORDER BY count DESC
        LIMIT 10`
@@ -217,24 +237,34 @@ app.get('/analytics/ab-report', rateLimitMiddleware, async (c) => {
   try {
     // ab_variant 컬럼이 migration 미적용 시에도 빈 배열로 graceful 처리
     const result = await c.env.DB.prepare(
-      `SELECT
+      `WITH recent AS (
+         SELECT ab_variant, match_count, score_sum, high_count, medium_count, low_count
+         FROM analysis_rollups
+         WHERE period = 'day' AND bucket >= date('now', '-6 days') AND ab_variant != ''
+         UNION ALL
+         SELECT ab_variant, 1, similarity_score,
+                CASE WHEN confidence = 'high' THEN 1 ELSE 0 END,
+                CASE WHEN confidence = 'medium' THEN 1 ELSE 0 END,
+                CASE WHEN confidence = 'low' THEN 1 ELSE 0 END
+         FROM analysis_logs
+         WHERE ${rawTail('analysis_logs')} AND created_at >= date('now', '-6 days') AND ab_variant != ''
+       )
+       SELECT
          ab_variant,
-         COUNT(*) as match_count,
-         ROUND(AVG(similarity_score), 4) as avg_score,
-         ROUND(AVG(CASE WHEN confidence = 'high' THEN 1.0 WHEN confidence = 'medium' THEN 0.5 ELSE 0.0 END), 4) as avg_confidence,
-         SUM(CASE WHEN confidence = 'high' THEN 1 ELSE 0 END) as high_count,
-         SUM(CASE WHEN confidence = 'medium' THEN 1 ELSE 0 END) as medium_count,
-         SUM(CASE WHEN confidence = 'low' THEN 1 ELSE 0 END) as low_count
-       FROM analysis_logs
-       WHERE created_at > datetime('now', '-7 days')
-         AND ab_variant != ''
+         SUM(match_count) as match_count,
+         ROUND(SUM(score_sum) / SUM(match_count), 4) as avg_score,
+         ROUND((SUM(high_count) + 0.5 * SUM(medium_count)) / SUM(match_count), 4) as avg_confidence,
+         SUM(high_count) as high_count,
+         SUM(medium_count) as medium_count,
+         SUM(low_count) as low_count
+       FROM recent
        GROUP BY ab_variant
        ORDER BY match_count DESC`
     ).all();
 
     return c.json({ variants: result.results ?? [] });
   } catch (err) {
-    // ab_variant 컬럼 미존재 등 스키마 오류 시 빈 배열 반환 (500 방지)
+    // ab_variant 컬럼 / 롤업 테이블 미존재 등 스키마 오류 시 빈 배열 반환 (500 방지)
     console.warn('[ab-report] Query failed, likely missing migration:', err);
     return c.json({ variants: [], warning: 'AB variant data unavailable' });
   }
@@ -267,11 +297,26 @@ app.post('/analytics/feedback', rateLimitMiddleware, async (c) => {
 });
 
 // ── GET /api/og/:id ──────────────────────────────────────────────────────────
-// Returns character-specific OG image data or redirects to character image.
+// Serves the pre-rendered card (public/og/<id>.webp, built by
+// ml/generate_og_cards.py) or redirects to the character image.
 app.get('/og/:id', async (c) => {
   const heroineId = parseInt(c.req.param('id'), 10);
   if (isNaN(heroineId)) return c.notFound();
 
+  try {
+    const card = await c.env.ASSETS?.fetch(new URL(`/og/${heroineId}.webp`, c.req.url));
+    if (card?.ok && card.headers.get('Content-Type')?.startsWith('image/webp')) {
+      return new Response(card.body, {
+        headers: {
+          'Content-Type': 'image/webp',
+          'Cache-Control': 'public, max-age=86400',
+        },
+      });
+    }
+  } catch {
+    // No asset binding or card — fall through to the redirect
+  }
+
   try {
     const char = await c.env.DB.prepare(
       `SELECT c.name_en, a.title_en AS anime_en, c.image_url
@@ -282,9 +327,8 @@ app.get('/og/:id', async (c) => {
 
     if (!char) return c.notFound();
 
-    // In a real prod env, we'd use satori/resvg here to generate a PNG.
-    // Since we want to be fast and lightweight, we'll redirect to the character image
-    // but the _middleware will have already set the dynamic description.
+    // No card rendered for this character yet: redirect to its image;
+    // the _middleware will have already set the dynamic description.
     return c.redirect(char.image_url as string);
   } catch {
     return c.notFound();
@@ -297,32 +341,67 @@ app.get('/admin/dashboard', adminAuth, rateLimitMiddleware, async (c) => {
   try {
     const [counts, topChars, feedback] = await Promise.all([
       c.env.DB.prepare(`
-        SELECT 
-          COUNT(*) as total_matches,
-          COUNT(DISTINCT DATE(created_at)) as days_active,
-          SUM(CASE WHEN created_at > datetime('now', '-24 hours') THEN 1 ELSE 0 END) as matches_24h
-        FROM analysis_logs
+        WITH days AS (
+          SELECT bucket AS day, match_count FROM analysis_rollups WHERE period = 'day'
+          UNION ALL
+          SELECT DATE(created_at), 1 FROM analysis_logs WHERE ${rawTail('analysis_logs')}
+        ),
+        last_24h AS (
+          -- Hours that start after the cutoff lie wholly inside the window
+          SELECT match_count FROM analysis_rollups
+          WHERE period = 'hour' AND bucket > datetime('now', '-24 hours')
+          UNION ALL
+          -- The hour containing the cutoff is only partly inside: count its raw rows
+          SELECT 1 FROM analysis_logs
+          WHERE NOT (${rawTail('analysis_logs')})
+            AND created_at > datetime('now', '-24 hours')
+            AND created_at < strftime('%Y-%m-%d %H:00:00', 'now', '-23 hours')
+          UNION ALL
+          SELECT 1 FROM analysis_logs
+          WHERE ${rawTail('analysis_logs')} AND created_at > datetime('now', '-24 hours')
+        )
+        SELECT
+          COALESCE(SUM(match_count), 0) as total_matches,
+          COUNT(DISTINCT day) as days_active,
+          (SELECT COALESCE(SUM(match_count), 0) FROM last_24h) as matches_24h
+        FROM days
       `).first(),
       c.env.DB.prepare(`
-        SELECT matched_character, matched_anime, COUNT(*) as count
-        FROM analysis_logs
+        WITH totals AS (
+          SELECT matched_character, matched_anime, match_count FROM analysis_rollups WHERE period = 'day'
+          UNION ALL
+          SELECT matched_character, matched_anime, 1 FROM analysis_logs WHERE ${rawTail('analysis_logs')}
+        )
+        SELECT matched_character, matched_anime, SUM(match_count) as count
+        FROM totals
         GROUP BY matched_character
         ORDER BY count DESC
         LIMIT 5
       `).all(),
       c.env.DB.prepare(`
-        SELECT 
-          rating,
-          COUNT(*) as count
-        FROM match_feedback
-        GROUP BY rating
-      `).all(),
+        WITH totals AS (
+          SELECT up_count, down_count, unrated_count FROM feedback_rollups WHERE period = 'day'
+          UNION ALL
+          SELECT
+            CASE WHEN rating = 'up' THEN 1 ELSE 0 END,
+            CASE WHEN rating = 'down' THEN 1 ELSE 0 END,
+            CASE WHEN rating IS NULL THEN 1 ELSE 0 END
+          FROM match_feedback WHERE ${rawTail('match_feedback')}
+        )
+        SELECT SUM(up_count) as up, SUM(down_count) as down, SUM(unrated_count) as unrated
+        FROM totals
+      `).first<{ up: number | null; down: number | null; unrated: number | null }>(),
     ]);
 
+    // Same shape as GROUP BY rating over the raw table
+    const feedbackBreakdown = ([['up', feedback?.up], ['down', feedback?.down], [null, feedback?.unrated]] as const)
+      .filter(([, count]) => count)
+      .map(([rating, count]) => ({ rating, count }));
+
     return c.json({
       summary: counts,
       top_characters: topChars.results,
-      feedback_breakdown: feedback.results,
+      feedback_breakdown: feedbackBreakdown,
     });
   } catch (err) {
     return c.json({ error: 'Failed to fetch dashboard data' }, 500);
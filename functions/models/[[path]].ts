@@ -18,12 +18,16 @@ export const onRequestGet: PagesFunction<Env> = async (context) => {
 
   const ext = '.' + (path.split('.').pop() ?? '');
   const contentType = CONTENT_TYPES[ext] ?? 'application/octet-stream';
+  // <model>.manifest.json keeps its name across releases; chunks and graphs are content-hashed
+  const cacheControl = path.endsWith('.manifest.json')
+    ? 'no-cache'
+    : 'public, max-age=31536000, immutable';
 
   return new Response(object.body, {
     headers: {
       'Content-Type': contentType,
       'Cross-Origin-Resource-Policy': 'cross-origin',
-      'Cache-Control': 'public, max-age=31536000, immutable',
+      'Cache-Control': cacheControl,
       'ETag': object.httpEtag,
     },
   });
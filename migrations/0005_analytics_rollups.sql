@@ -0,0 +1,38 @@
+-- Pre-aggregated analytics, maintained by ml/analytics_rollup.py
+-- bucket: 'YYYY-MM-DD HH:00:00' for period 'hour', 'YYYY-MM-DD' for period 'day' (UTC)
+CREATE TABLE IF NOT EXISTS analysis_rollups (
+  period            TEXT NOT NULL CHECK(period IN ('hour', 'day')),
+  bucket            TEXT NOT NULL,
+  orientation       TEXT NOT NULL,
+  matched_character TEXT NOT NULL,
+  matched_anime     TEXT NOT NULL,
+  ab_variant        TEXT NOT NULL DEFAULT '',
+  match_count       INTEGER NOT NULL DEFAULT 0,
+  score_sum         REAL NOT NULL DEFAULT 0,
+  high_count        INTEGER NOT NULL DEFAULT 0,
+  medium_count      INTEGER NOT NULL DEFAULT 0,
+  low_count         INTEGER NOT NULL DEFAULT 0,
+  dual_count        INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (period, bucket, orientation, matched_character, matched_anime, ab_variant)
+);
+
+CREATE TABLE IF NOT EXISTS feedback_rollups (
+  period            TEXT NOT NULL CHECK(period IN ('hour', 'day')),
+  bucket            TEXT NOT NULL,
+  orientation       TEXT NOT NULL,
+  ab_variant        TEXT NOT NULL DEFAULT '',
+  up_count          INTEGER NOT NULL DEFAULT 0,
+  down_count        INTEGER NOT NULL DEFAULT 0,
+  unrated_count     INTEGER NOT NULL DEFAULT 0,
+  score_sum         REAL NOT NULL DEFAULT 0,
+  score_count       INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (period, bucket, orientation, ab_variant)
+);
+
+-- Last raw row folded into the rollups, per source table
+CREATE TABLE IF NOT EXISTS rollup_watermarks (
+  source            TEXT PRIMARY KEY,
+  last_created_at   TEXT NOT NULL,
+  last_id           INTEGER NOT NULL,
+  updated_at        TEXT NOT NULL DEFAULT (datetime('now'))
+);
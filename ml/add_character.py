@@ -9,6 +9,11 @@ Single CLI to add new anime characters:
   4. Update embeddings.json + embeddings.json.gz
   5. Validate against existing characters (duplicate check)
 
+Downloaded images are checked against the catalog's perceptual hashes
+(image_hashes.py) before any model runs: an image within a few bits of a
+catalog image or of another image in the batch (e.g. AniList's shared
+placeholder) is skipped unless --allow-duplicate-images is given.
+
 Usage:
   # Single character
   python ml/add_character.py \
@@ -28,6 +33,10 @@ Usage:
 
   # Dry run (no DB/file changes)
   python ml/add_character.py --dry-run --batch ml/new_characters.json
+
+Batches run as a staged pipeline: image lookups/downloads run concurrently,
+embeddings are computed in model-sized batches, and all DB inserts plus the
+embeddings.json write are committed together at the end (all or nothing).
 """
 
 import argparse
@@ -36,7 +45,8 @@ import gzip
 import os
 import sqlite3
 import sys
-from io import BytesIO
+
+from instrument import add_instrument_args, count, instrumented, timer
 
 # Paths
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -50,52 +60,57 @@ MODEL_NAME = 'ViT-B-32'
 PRETRAINED = 'openai'
 EMBEDDING_PRECISION = 6
 DUPLICATE_COSINE_THRESH = 0.95
+EMBED_BATCH_SIZE = 16
 
 
 def load_image_from_url(url, timeout=10):
     """Download and preprocess an image from URL."""
-    import requests
-    from PIL import Image
-    try:
-        resp = requests.get(url, timeout=timeout, headers={
-            'User-Agent': 'AniMatch/1.0 (Character Embedding Generator)'
-        })
-        resp.raise_for_status()
-        img = Image.open(BytesIO(resp.content)).convert('RGB')
-        return img
-    except Exception as e:
-        print(f"  ⚠️ Failed to load image: {e}")
-        return None
+    from fetcher import get_fetcher
+    return get_fetcher().get_image(url, timeout=timeout)
+
+
+_anilist_client = None
+
+
+def get_anilist_client():
+    """Shared batched AniList client (SQLite-cached)."""
+    global _anilist_client
+    if _anilist_client is None:
+        from anilist_client import AniListClient
+        _anilist_client = AniListClient()
+    return _anilist_client
 
 
 def fetch_anilist_image_url(char_name):
     """Fetch character image from AniList by name."""
-    import requests
-    query = '''
-    query ($search: String) {
-      Character(search: $search) {
-        id
-        name { full native }
-        image { large medium }
-      }
-    }
-    '''
-    try:
-        resp = requests.post(
-            'https://graphql.anilist.co',
-            json={'query': query, 'variables': {'search': char_name}},
-            headers={'Content-Type': 'application/json', 'Accept': 'application/json'},
-            timeout=10
-        )
-        resp.raise_for_status()
-        data = resp.json()
-        if 'data' in data and data['data'] and data['data'].get('Character'):
-            char = data['data']['Character']
-            img = char.get('image', {})
-            return img.get('large') or img.get('medium')
-    except Exception as e:
-        print(f"  ⚠️ AniList fetch failed for {char_name}: {e}")
-    return None
+    return get_anilist_client().lookup_images([char_name]).get(char_name)
+
+
+def anilist_search_names(char_data):
+    """(field, search name) pairs for images that must come from AniList."""
+    pairs = []
+    protag = char_data.get('protagonist_ko')
+    if not char_data.get('protagonist_image') and not is_audience_pov(protag):
+        pairs.append(('protagonist_image', char_data.get('protagonist_en') or protag))
+    if not char_data.get('heroine_image') and char_data.get('heroine_ko'):
+        pairs.append(('heroine_image', char_data.get('heroine_en') or char_data.get('heroine_ko')))
+    return pairs
+
+
+def prefetch_anilist_images(characters):
+    """Resolve every missing image URL in a few batched AniList requests."""
+    wanted = [(c, field, name) for c in characters for field, name in anilist_search_names(c)]
+    if not wanted:
+        return
+    client = get_anilist_client()
+    before = client.requests_made
+    urls = client.lookup_images([name for _, _, name in wanted])
+    for char_data, field, name in wanted:
+        if urls.get(name):
+            char_data[field] = urls[name]
+    found = sum(1 for _, _, name in wanted if urls.get(name))
+    print(f"  🔍 AniList: {found}/{len(wanted)} images resolved "
+          f"({client.requests_made - before} requests)")
 
 
 def truncate_embedding(embedding_list, precision=EMBEDDING_PRECISION):
@@ -108,14 +123,19 @@ def is_audience_pov(name_ko):
     return '관객' in (name_ko or '') or '시점' in (name_ko or '')
 
 
-def generate_clip_embedding(img, model, preprocess, device):
-    """Generate CLIP embedding from PIL Image."""
+def generate_clip_embeddings(imgs, model, preprocess, device, batch_size=EMBED_BATCH_SIZE):
+    """Generate CLIP embeddings for a list of PIL Images, `batch_size` at a time."""
     import torch
+    embeddings = []
     with torch.no_grad():
-        image_tensor = preprocess(img).unsqueeze(0).to(device)
-        embedding = model.encode_image(image_tensor)
-        embedding = embedding / embedding.norm(dim=-1, keepdim=True)
-        return embedding.cpu().numpy()[0].tolist()
+        for start in range(0, len(imgs), batch_size):
+            with timer('preprocess'):
+                batch = torch.stack([preprocess(img) for img in imgs[start:start + batch_size]]).to(device)
+            with timer('inference'):
+                embedding = model.encode_image(batch)
+                embedding = embedding / embedding.norm(dim=-1, keepdim=True)
+                embeddings.extend(embedding.cpu().numpy().tolist())
+    return embeddings
 
 
 def generate_arcface_embedding(img, session):
@@ -179,73 +199,6 @@ def check_duplicates(new_embedding, existing_characters):
     return duplicates
 
 
-def insert_character_to_db(conn, char_data, dry_run=False):
-    """Insert anime + protagonist + heroine into DB. Returns (anime_id, protagonist_id, heroine_id)."""
-    cursor = conn.cursor()
-
-    if dry_run:
-        # Simulate IDs
-        cursor.execute("SELECT MAX(id) FROM animes")
-        max_anime = cursor.fetchone()[0] or 0
-        cursor.execute("SELECT MAX(id) FROM characters")
-        max_char = cursor.fetchone()[0] or 0
-        return max_anime + 1, max_char + 1, max_char + 2
-
-    # Insert anime
-    cursor.execute("""
-        INSERT INTO animes (title_ko, title_en, genre, orientation, tier)
-        VALUES (?, ?, ?, ?, ?)
-    """, (
-        char_data['title_ko'],
-        char_data['title_en'],
-        json.dumps(char_data.get('genre', []), ensure_ascii=False),
-        char_data['orientation'],
-        char_data.get('tier', 2),
-    ))
-    anime_id = cursor.lastrowid
-
-    # Insert protagonist
-    cursor.execute("""
-        INSERT INTO characters (anime_id, name_ko, name_en, role, gender, image_url)
-        VALUES (?, ?, ?, 'protagonist', ?, ?)
-    """, (
-        anime_id,
-        char_data['protagonist_ko'],
-        char_data['protagonist_en'],
-        char_data.get('protagonist_gender', 'male'),
-        char_data['protagonist_image'],
-    ))
-    protagonist_id = cursor.lastrowid
-
-    # Insert heroine
-    cursor.execute("""
-        INSERT INTO characters (anime_id, name_ko, name_en, role, gender, image_url,
-                                emoji, color_primary, tags, personality,
-                                charm_points, iconic_quote, partner_id)
-        VALUES (?, ?, ?, 'heroine', ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
-        anime_id,
-        char_data['heroine_ko'],
-        char_data['heroine_en'],
-        char_data.get('heroine_gender', 'female'),
-        char_data.get('heroine_image'),
-        char_data.get('heroine_emoji', '💫'),
-        char_data.get('heroine_color', 'linear-gradient(135deg, #667eea, #764ba2)'),
-        json.dumps(char_data.get('heroine_tags', []), ensure_ascii=False),
-        json.dumps(char_data.get('heroine_personality', []), ensure_ascii=False),
-        char_data.get('heroine_charm', ''),
-        char_data.get('heroine_quote', ''),
-        protagonist_id,
-    ))
-    heroine_id = cursor.lastrowid
-
-    # Set protagonist's partner_id
-    cursor.execute("UPDATE characters SET partner_id = ? WHERE id = ?", (heroine_id, protagonist_id))
-
-    conn.commit()
-    return anime_id, protagonist_id, heroine_id
-
-
 def build_embedding_entry(char_data, protagonist_id, heroine_id, clip_emb, arcface_emb):
     """Build an embeddings.json character entry."""
     entry = {
@@ -280,21 +233,43 @@ def build_embedding_entry(char_data, protagonist_id, heroine_id, clip_emb, arcfa
     return entry
 
 
-def save_embeddings(data):
-    """Write embeddings.json and embeddings.json.gz."""
-    json_str = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+def stage_embeddings(data):
+    """Write embeddings.json(.gz) to temp files. Returns [(tmp, final), ...]."""
+    with timer('serialize'):
+        json_str = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    staged = [(EMBEDDINGS_PATH + '.tmp', EMBEDDINGS_PATH), (EMBEDDINGS_GZ_PATH + '.tmp', EMBEDDINGS_GZ_PATH)]
+
+    with timer('write'):
+        with open(staged[0][0], 'w', encoding='utf-8') as f:
+            f.write(json_str)
+
+        with gzip.open(staged[1][0], 'wt', encoding='utf-8', compresslevel=9) as f:
+            f.write(json_str)
+
+    return staged
 
-    with open(EMBEDDINGS_PATH, 'w', encoding='utf-8') as f:
-        f.write(json_str)
 
-    with gzip.open(EMBEDDINGS_GZ_PATH, 'wt', encoding='utf-8', compresslevel=9) as f:
-        f.write(json_str)
+def publish_embeddings(staged):
+    """Atomically move staged files into place."""
+    for tmp, final in staged:
+        os.replace(tmp, final)
 
     json_kb = os.path.getsize(EMBEDDINGS_PATH) / 1024
     gz_kb = os.path.getsize(EMBEDDINGS_GZ_PATH) / 1024
     print(f"  📁 JSON: {json_kb:.1f} KB | Gzip: {gz_kb:.1f} KB")
 
 
+def discard_staged(staged):
+    for tmp, _ in staged:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def save_embeddings(data):
+    """Write embeddings.json and embeddings.json.gz."""
+    publish_embeddings(stage_embeddings(data))
+
+
 def parse_single_args(args):
     """Convert CLI args to a character data dict."""
     return {
@@ -320,83 +295,216 @@ def parse_single_args(args):
     }
 
 
-def process_character(char_data, clip_model, clip_preprocess, clip_device, arcface_session, embeddings_data, conn, dry_run=False):
-    """Process a single character through the full pipeline. Returns True on success."""
-    title = char_data['title_ko']
-    protag = char_data['protagonist_ko']
-    print(f"\n{'='*50}")
-    print(f"🎌 {title} — {protag}")
-
-    # 1. Fetch missing images from AniList
-    prot_img_url = char_data.get('protagonist_image')
-    if not prot_img_url and not is_audience_pov(protag):
-        search_name = char_data.get('protagonist_en') or protag
-        print(f"  🔍 Fetching protagonist image from AniList for {search_name}...")
-        prot_img_url = fetch_anilist_image_url(search_name)
-        char_data['protagonist_image'] = prot_img_url or ''
-
-    her_img_url = char_data.get('heroine_image')
-    if not her_img_url and char_data.get('heroine_ko'):
-        search_name = char_data.get('heroine_en') or char_data.get('heroine_ko')
-        print(f"  🔍 Fetching heroine image from AniList for {search_name}...")
-        her_img_url = fetch_anilist_image_url(search_name)
-        char_data['heroine_image'] = her_img_url or ''
+def new_job(char_data):
+    """Per-character pipeline state."""
+    return {'data': char_data, 'img': None, 'phash': None, 'clip': None, 'arcface': None,
+            'ids': None, 'ok': False, 'insert': False, 'reason': ''}
 
-    if not char_data.get('protagonist_image') and not is_audience_pov(protag):
-        print(f"  ❌ Protagonist image missing and fetch failed. Skipping.")
-        return False
-
-    # 2. DB insert
-    print("  📝 DB insert...")
-    anime_id, protag_id, heroine_id = insert_character_to_db(conn, char_data, dry_run)
-    print(f"     anime_id={anime_id}, protagonist_id={protag_id}, heroine_id={heroine_id}")
-
-    # 3. Download protagonist image
-    img_url = char_data['protagonist_image']
-    if is_audience_pov(char_data['protagonist_ko']):
-        print(f"  ⏭️ Skipped (audience POV)")
-        return False
-
-    print(f"  🖼️ Downloading image...")
-    img = load_image_from_url(img_url)
-    if img is None:
-        print(f"  ❌ Image download failed — skipping")
-        return False
-
-    # 4. CLIP embedding
-    print(f"  🔎 Generating CLIP embedding...")
-    clip_emb = generate_clip_embedding(img, clip_model, clip_preprocess, clip_device)
-    clip_emb = truncate_embedding(clip_emb)
-    print(f"     ✅ CLIP: {len(clip_emb)}d")
-
-    # 4. ArcFace embedding (optional)
-    arcface_emb = None
-    if arcface_session:
-        print(f"  🔎 Generating ArcFace embedding...")
-        arcface_emb = generate_arcface_embedding(img, arcface_session)
-        if arcface_emb:
-            print(f"     ✅ ArcFace: {len(arcface_emb)}d")
+
+def job_label(job):
+    return f"{job['data']['title_ko']} — {job['data']['protagonist_ko']}"
+
+
+def stage_images(jobs):
+    """Network stage: resolve missing URLs (batched) and download concurrently."""
+    from fetcher import get_fetcher
+
+    print(f"\n{'='*50}\n🌐 Stage 1/4: images")
+    prefetch_anilist_images([j['data'] for j in jobs])
+
+    to_download = []
+    for job in jobs:
+        char_data = job['data']
+        char_data.setdefault('protagonist_image', '')
+        char_data.setdefault('heroine_image', '')
+        if is_audience_pov(char_data['protagonist_ko']):
+            job['insert'] = True
+            job['reason'] = 'audience POV (DB only)'
+        elif not char_data.get('protagonist_image'):
+            job['reason'] = 'protagonist image missing and AniList lookup failed'
         else:
-            print(f"     ⚠️ ArcFace: skipped (no face detected or error)")
+            to_download.append(job)
+
+    fetcher = get_fetcher()
+    downloads = fetcher.fetch_many(
+        (j['data']['protagonist_image'] for j in to_download), fn=load_image_from_url,
+    )
+    for job, (_, img, _) in zip(to_download, downloads):
+        if img is None:
+            job['reason'] = 'image download failed'
+        else:
+            job['img'] = img
+    net = fetcher.summary()
+    print(f"  🖼️ {sum(1 for j in jobs if j['img'])}/{len(to_download)} images downloaded "
+          f"({net['requests']} requests, {net['retries']} retries)")
+
+
+def stage_image_hashes(jobs, index, allow_duplicates=False):
+    """Flag near-identical images (vs the catalog index and earlier jobs) before any model runs."""
+    from image_hashes import ImageHashIndex, phash_batch
+
+    ready = [j for j in jobs if j['img'] is not None]
+    print(f"\n🧬 Perceptual hashes ({len(ready)} images vs {len(index)} indexed)")
+    if not index.exists:
+        print("  ⚠️ No catalog index yet (python image_hashes.py) — checking within this batch only")
+    batch = ImageHashIndex()
+    flagged = 0
+    for job, h in zip(ready, phash_batch([j['img'] for j in ready])):
+        url = job['data']['protagonist_image']
+        job['phash'] = h
+        matches = index.matches(h) + batch.matches(h)
+        batch.add(url, h, job_label(job))
+        if not matches:
+            continue
+        flagged += 1
+        print(f"  ⚠️ IMAGE DUPLICATE: {job_label(job)}")
+        for d, other_url, label in matches[:3]:
+            print(f"     - {label} ({d} bits apart){'  same URL' if other_url == url else ''}")
+        if not allow_duplicates:
+            job['img'] = None
+            job['reason'] = f"image near-identical to {matches[0][2]} (use --allow-duplicate-images to keep)"
+    count('image_duplicates', flagged)
+    if not flagged:
+        print("  ✅ No near-identical images")
+
+
+def index_image_hashes(jobs, index):
+    """Add committed characters' protagonist image hashes to the catalog index."""
+    added = [j for j in jobs if j['ok'] and j['ids'] and j.get('phash') is not None]
+    for job in added:
+        _, protag_id, _ = job['ids']
+        label = f"protagonist {protag_id} {job['data']['protagonist_ko']} ({job['data']['title_ko']})"
+        index.add(job['data']['protagonist_image'], job['phash'], label)
+    if added and index.exists:
+        index.save()
+
+
+def stage_embed(jobs, clip_model, clip_preprocess, clip_device, arcface_session):
+    """Model stage: CLIP in batches of EMBED_BATCH_SIZE, ArcFace per image."""
+    ready = [j for j in jobs if j['img'] is not None]
+    print(f"\n🔎 Stage 2/4: embeddings ({len(ready)} images, batch {EMBED_BATCH_SIZE})")
+    if not ready:
+        return
+
+    clip_embs = generate_clip_embeddings([j['img'] for j in ready], clip_model, clip_preprocess, clip_device)
+    for job, emb in zip(ready, clip_embs):
+        job['clip'] = truncate_embedding(emb)
+        if arcface_session:
+            with timer('arcface'):
+                job['arcface'] = generate_arcface_embedding(job['img'], arcface_session)
+        job['img'] = None  # release memory
+        job['insert'] = True
+        job['ok'] = True
+    with_face = sum(1 for j in ready if j['arcface'])
+    print(f"  ✅ CLIP: {len(ready)} × {len(ready[0]['clip'])}d"
+          + (f" | ArcFace: {with_face}/{len(ready)}" if arcface_session else ''))
+
+
+def stage_duplicates(jobs, existing_characters):
+    """Warn about near-duplicates vs the catalog and earlier entries in this batch."""
+    print(f"\n🔁 Stage 3/4: duplicate check")
+    seen = list(existing_characters)
+    warned = 0
+    for job in jobs:
+        if not job['clip']:
+            continue
+        duplicates = check_duplicates(job['clip'], seen)
+        if duplicates:
+            warned += 1
+            print(f"  ⚠️ DUPLICATE WARNING: {job_label(job)}")
+            for dup in duplicates:
+                print(f"     - {dup['name']} ({dup['anime']}) sim={dup['similarity']}")
+        seen.append({
+            'protagonist_name': job['data']['protagonist_ko'],
+            'anime': job['data']['title_ko'],
+            'embedding': job['clip'],
+        })
+    if not warned:
+        print("  ✅ No duplicates")
+
 
-    # 5. Duplicate check
-    duplicates = check_duplicates(clip_emb, embeddings_data['characters'])
-    if duplicates:
-        print(f"  ⚠️ DUPLICATE WARNING:")
-        for dup in duplicates:
-            print(f"     - {dup['name']} ({dup['anime']}) sim={dup['similarity']}")
+def stage_commit(jobs, conn, embeddings_data, dry_run=False):
+    """Write stage: all DB inserts + embeddings.json in one transaction."""
+    from db_writer import BulkCharacterWriter
 
-    # 6. Add to embeddings data
-    entry = build_embedding_entry(char_data, protag_id, heroine_id, clip_emb, arcface_emb)
+    print(f"\n📝 Stage 4/4: {'dry run (no writes)' if dry_run else 'commit'}")
+    to_insert = [j for j in jobs if j['insert']]
+    if not to_insert:
+        return
 
+    if dry_run:
+        ids = BulkCharacterWriter(conn, wal=False).next_ids(len(to_insert))
+        for job, job_ids in zip(to_insert, ids):
+            job['ids'] = job_ids
+        print("  🏜️ Dry run — skipping DB insert and embeddings.json update")
+        return
+
+    writer = BulkCharacterWriter(conn)
+    original_count = len(embeddings_data['characters'])
+    staged = []
+    try:
+        with writer.transaction():
+            results = writer.insert_batch([j['data'] for j in to_insert])
+            for job, result in zip(to_insert, results):
+                if 'error' in result:
+                    job['ok'] = False
+                    job['reason'] = f"DB insert rejected: {result['error']}"
+                    continue
+                job['ids'] = result['ids']
+                if job['ok']:
+                    _, protag_id, heroine_id = job['ids']
+                    embeddings_data['characters'].append(build_embedding_entry(
+                        job['data'], protag_id, heroine_id, job['clip'], job['arcface'],
+                    ))
+            embeddings_data['count'] = len(embeddings_data['characters'])
+            if embeddings_data['count'] != original_count:
+                staged = stage_embeddings(embeddings_data)
+    except Exception as e:
+        discard_staged(staged)
+        del embeddings_data['characters'][original_count:]
+        embeddings_data['count'] = original_count
+        for job in to_insert:
+            job['ok'] = False
+            job['ids'] = None
+            job['reason'] = f"commit failed, rolled back: {e}"
+        print(f"  ❌ Commit failed — rolled back all {len(to_insert)} characters: {e}")
+        return
+
+    print(f"  ✅ Committed {sum(1 for j in to_insert if j['ids'])} characters")
+    if staged:
+        print("\n💾 Saving embeddings...")
+        publish_embeddings(staged)
+
+
+def run_pipeline(characters, clip_model, clip_preprocess, clip_device, arcface_session,
+                 embeddings_data, conn, dry_run=False, allow_duplicate_images=False):
+    """Run all characters through the staged pipeline. Returns the job list."""
+    from image_hashes import ImageHashIndex
+
+    jobs = [new_job(c) for c in characters]
+    index = ImageHashIndex.load()
+    with timer('stage_images'):
+        stage_images(jobs)
+    with timer('stage_image_hashes'):
+        stage_image_hashes(jobs, index, allow_duplicate_images)
+    with timer('stage_embed'):
+        stage_embed(jobs, clip_model, clip_preprocess, clip_device, arcface_session)
+    with timer('stage_duplicates'):
+        stage_duplicates(jobs, embeddings_data['characters'])
+    with timer('stage_commit'):
+        stage_commit(jobs, conn, embeddings_data, dry_run)
     if not dry_run:
-        embeddings_data['characters'].append(entry)
-        embeddings_data['count'] = len(embeddings_data['characters'])
-    else:
-        print(f"  🏜️ Dry run — skipping embeddings.json update")
+        index_image_hashes(jobs, index)
 
-    print(f"  ✅ Done!")
-    return True
+    print(f"\n{'='*50}")
+    for job in jobs:
+        ids = job['ids']
+        id_str = f" (anime_id={ids[0]}, protagonist_id={ids[1]}, heroine_id={ids[2]})" if ids else ''
+        if job['ok']:
+            print(f"  ✅ {job_label(job)}{id_str}")
+        else:
+            print(f"  ❌ {job_label(job)}: {job['reason']}{id_str}")
+    return jobs
 
 
 def main():
@@ -408,6 +516,8 @@ def main():
     # Mode selection
     parser.add_argument('--batch', type=str, help='Path to JSON file with character array')
     parser.add_argument('--dry-run', action='store_true', help='Validate without DB/file changes')
+    parser.add_argument('--allow-duplicate-images', action='store_true',
+                        help='Keep characters whose image is near-identical to another (warn only)')
 
     # Single character args
     parser.add_argument('--title-ko', type=str, help='Anime title (Korean)')
@@ -431,6 +541,7 @@ def main():
     parser.add_argument('--heroine-personality', type=str, default='[]', help='Personality JSON array')
     parser.add_argument('--heroine-charm', type=str, default='')
     parser.add_argument('--heroine-quote', type=str, default='')
+    add_instrument_args(parser)
 
     args = parser.parse_args()
 
@@ -452,73 +563,63 @@ def main():
     if args.dry_run:
         print("🏜️ DRY RUN — no DB or file changes will be made\n")
 
-    # Load models
-    import torch
-    import open_clip
-
-    print("📦 Loading CLIP model...")
-    device = 'cuda' if torch.cuda.is_available() else 'mps' if torch.backends.mps.is_available() else 'cpu'
-    print(f"  Device: {device}")
-    model, _, preprocess = open_clip.create_model_and_transforms(MODEL_NAME, pretrained=PRETRAINED, device=device)
-    model.eval()
-    print("  ✅ CLIP loaded")
-
-    arcface_session = None
-    if os.path.exists(ARCFACE_MODEL_PATH):
-        import onnxruntime as ort
-        arcface_session = ort.InferenceSession(ARCFACE_MODEL_PATH, providers=['CPUExecutionProvider'])
-        print("  ✅ ArcFace loaded")
-    else:
-        print("  ⚠️ ArcFace model not found — skipping face embeddings")
+    with instrumented('add_character', args):
+        # Load models
+        import torch
+        import open_clip
+
+        print("📦 Loading CLIP model...")
+        device = 'cuda' if torch.cuda.is_available() else 'mps' if torch.backends.mps.is_available() else 'cpu'
+        print(f"  Device: {device}")
+        with timer('load_model'):
+            model, _, preprocess = open_clip.create_model_and_transforms(MODEL_NAME, pretrained=PRETRAINED, device=device)
+            model.eval()
+        print("  ✅ CLIP loaded")
+
+        arcface_session = None
+        if os.path.exists(ARCFACE_MODEL_PATH):
+            import onnxruntime as ort
+            with timer('load_model'):
+                arcface_session = ort.InferenceSession(ARCFACE_MODEL_PATH, providers=['CPUExecutionProvider'])
+            print("  ✅ ArcFace loaded")
+        else:
+            print("  ⚠️ ArcFace model not found — skipping face embeddings")
 
-    # Load existing embeddings
-    if os.path.exists(EMBEDDINGS_PATH):
-        with open(EMBEDDINGS_PATH, 'r', encoding='utf-8') as f:
-            embeddings_data = json.load(f)
-        print(f"  📋 Existing embeddings: {embeddings_data['count']} characters")
-    else:
-        embeddings_data = {
-            'model': MODEL_NAME,
-            'pretrained': PRETRAINED,
-            'embedding_dim': 512,
-            'count': 0,
-            'characters': [],
-        }
-        print("  📋 No existing embeddings — starting fresh")
-
-    # Connect to DB
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-
-    # Process characters
-    success = 0
-    failed = 0
-
-    for char_data in characters:
-        try:
-            ok = process_character(
-                char_data, model, preprocess, device,
-                arcface_session, embeddings_data, conn, args.dry_run,
-            )
-            if ok:
-                success += 1
-            else:
-                failed += 1
-        except Exception as e:
-            print(f"  ❌ Error: {e}")
-            failed += 1
-
-    conn.close()
-
-    # Save updated embeddings
-    if not args.dry_run and success > 0:
-        print(f"\n💾 Saving embeddings...")
-        save_embeddings(embeddings_data)
+        # Load existing embeddings
+        if os.path.exists(EMBEDDINGS_PATH):
+            with open(EMBEDDINGS_PATH, 'r', encoding='utf-8') as f:
+                embeddings_data = json.load(f)
+            print(f"  📋 Existing embeddings: {embeddings_data['count']} characters")
+        else:
+            embeddings_data = {
+                'model': MODEL_NAME,
+                'pretrained': PRETRAINED,
+                'embedding_dim': 512,
+                'count': 0,
+                'characters': [],
+            }
+            print("  📋 No existing embeddings — starting fresh")
+
+        # Connect to DB
+        conn = sqlite3.connect(DB_PATH)
+        conn.row_factory = sqlite3.Row
+
+        # Process characters
+        jobs = run_pipeline(
+            characters, model, preprocess, device,
+            arcface_session, embeddings_data, conn, args.dry_run, args.allow_duplicate_images,
+        )
+        conn.close()
 
-    print(f"\n{'='*50}")
-    print(f"✅ Complete: {success} added, {failed} failed")
-    if args.dry_run:
-        print("🏜️ (Dry run — no actual changes)")
+        success = sum(1 for j in jobs if j['ok'])
+        failed = len(jobs) - success
+        count('added', success)
+        count('failed', failed)
+
+        print(f"\n{'='*50}")
+        print(f"✅ Complete: {success} added, {failed} failed")
+        if args.dry_run:
+            print("🏜️ (Dry run — no actual changes)")
 
 
 if __name__ == '__main__':
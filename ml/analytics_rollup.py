@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+AniMatch — Analytics Rollup
+Folds raw analysis_logs and match_feedback rows into hourly and daily
+rollup tables (migrations/0005_analytics_rollups.sql), so the analytics
+and dashboard endpoints read a few pre-aggregated rows instead of
+grouping every raw row on each request.
+
+The source is a `wrangler d1 export` dump or a SQLite copy of the D1
+database. Each run starts from the watermark stored in the source's own
+rollup_watermarks table (the last created_at / id already folded in):
+it re-reads raw rows from the start of the watermark's day (and the
+days of any backfilled rows with a higher id but an older created_at),
+recomputes every hour and day bucket those rows fall in, and writes
+
+  INSERT INTO analysis_rollups (...) VALUES (...), ...
+  ON CONFLICT(period, bucket, ...) DO UPDATE SET match_count = excluded.match_count, ...
+
+followed by the new watermark, whose last_id is MAX(id) over the whole
+table and so never moves backwards. Buckets are written whole (not
+incremented), so applying the same file twice, or a file from a run that
+overlapped the previous one, leaves the same totals. Raw rows newer than
+the watermark are what the endpoints add on top of the rollups.
+
+Usage:
+  wrangler d1 export animatch-db --remote --output /tmp/d1.sql
+  python analytics_rollup.py --export /tmp/d1.sql          # → db/analytics_rollup.sql
+  wrangler d1 execute animatch-db --remote --file db/analytics_rollup.sql
+
+  python analytics_rollup.py --db /tmp/d1.sqlite --apply   # update a local copy in place
+  python analytics_rollup.py --export /tmp/d1.sql --full   # rebuild every bucket
+"""
+
+import argparse
+import os
+import sqlite3
+
+from instrument import add_instrument_args, count, instrumented, timer
+from sync_seed import DEFAULT_MAX_ROWS, D1_MAX_STATEMENT_BYTES, InsertWriter, escape_sql, render
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_PATH = os.path.join(SCRIPT_DIR, '..', 'db', 'analytics_rollup.sql')
+
+# bucket expressions over created_at ('YYYY-MM-DD HH:MM:SS', UTC)
+PERIODS = {
+    'hour': "substr(created_at, 1, 13) || ':00:00'",
+    'day': "substr(created_at, 1, 10)",
+}
+
+# source table → (rollup table, key columns, SELECT list of aggregates, aggregate columns)
+ROLLUPS = {
+    'analysis_logs': (
+        'analysis_rollups',
+        ['orientation', 'matched_character', 'matched_anime', 'ab_variant'],
+        """COUNT(*), SUM(similarity_score),
+           SUM(CASE WHEN confidence = 'high' THEN 1 ELSE 0 END),
+           SUM(CASE WHEN confidence = 'medium' THEN 1 ELSE 0 END),
+           SUM(CASE WHEN confidence = 'low' THEN 1 ELSE 0 END),
+           SUM(CASE WHEN dual_matching != 0 THEN 1 ELSE 0 END)""",
+        ['match_count', 'score_sum', 'high_count', 'medium_count', 'low_count', 'dual_count'],
+    ),
+    'match_feedback': (
+        'feedback_rollups',
+        ['orientation', 'ab_variant'],
+        """SUM(CASE WHEN rating = 'up' THEN 1 ELSE 0 END),
+           SUM(CASE WHEN rating = 'down' THEN 1 ELSE 0 END),
+           SUM(CASE WHEN rating IS NULL THEN 1 ELSE 0 END),
+           COALESCE(SUM(similarity_score), 0), COUNT(similarity_score)""",
+        ['up_count', 'down_count', 'unrated_count', 'score_sum', 'score_count'],
+    ),
+}
+
+
+def open_source(db=None, export=None):
+    """Connection to a SQLite copy, or to an in-memory load of a D1 SQL export."""
+    if db:
+        return sqlite3.connect(db)
+    conn = sqlite3.connect(':memory:')
+    with open(export, encoding='utf-8') as f:
+        conn.executescript(f.read())
+    return conn
+
+
+def table_columns(conn, table):
+    return [r[1] for r in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def load_watermarks(conn):
+    """{source: (last_created_at, last_id)} ({} before the first rollup or migration 0005)."""
+    if 'source' not in table_columns(conn, 'rollup_watermarks'):
+        return {}
+    return {source: (created_at, last_id) for source, created_at, last_id
+            in conn.execute("SELECT source, last_created_at, last_id FROM rollup_watermarks")}
+
+
+def rollup(conn, source, watermark=('', 0)):
+    """(rows per period, new watermark) for raw rows past `watermark`, or None when there are none.
+
+    Buckets are recomputed whole for the watermark's day onwards, plus any
+    older day a row with a higher id landed in (a backfill or import), so
+    every row up to the new last_id is in the rollups exactly once.
+    """
+    table, keys, aggregates, _ = ROLLUPS[source]
+    present = set(table_columns(conn, source))
+    if not present:
+        return None
+    # Exports taken before migration 0002 have no ab_variant column
+    select_keys = ', '.join(k if k in present else "''" for k in keys)
+    created_at, last_id = watermark
+    since = created_at[:10]
+    last = conn.execute(f"SELECT MAX(id) FROM {source}").fetchone()[0]
+    if last is None or last <= last_id:
+        return None
+    backfilled = [day for (day,) in conn.execute(
+        f"SELECT DISTINCT substr(created_at, 1, 10) FROM {source} WHERE id > ? AND created_at < ?",
+        (last_id, since))]
+    where = f"(created_at >= ? OR substr(created_at, 1, 10) IN ({', '.join('?' * len(backfilled))})) AND id <= ?"
+    params = (since, *backfilled, last)
+    newest = conn.execute(f"SELECT MAX(created_at) FROM {source} WHERE id <= ?", (last,)).fetchone()[0]
+    rows = {}
+    for period, bucket in PERIODS.items():
+        rows[period] = [
+            (period, *row) for row in conn.execute(f"""
+                SELECT {bucket} AS bucket, {select_keys}, {aggregates}
+                FROM {source}
+                WHERE {where}
+                GROUP BY {', '.join(str(i) for i in range(1, len(keys) + 2))}
+                ORDER BY 1""", params)
+        ]
+        count(f'{table}_{period}', len(rows[period]))
+    if backfilled:
+        print(f"  {source:<15} {len(backfilled)} earlier day(s) with new rows: {', '.join(backfilled)}")
+    return rows, (max(newest, created_at), last)
+
+
+def upsert_tail(keys, columns):
+    sets = ', '.join(f"{c} = excluded.{c}" for c in columns)
+    return f"\nON CONFLICT(period, bucket, {', '.join(keys)}) DO UPDATE SET {sets}"
+
+
+def write_rollups(f, results, max_rows=DEFAULT_MAX_ROWS, max_bytes=D1_MAX_STATEMENT_BYTES):
+    """Write upserts for every rollup, then the watermarks; returns the number of statements."""
+    statements = 0
+    for source, (rows, _) in results.items():
+        table, keys, _, columns = ROLLUPS[source]
+        f.write(f"\n-- === {table.upper()} ===\n")
+        writer = InsertWriter(f, table, ['period', 'bucket', *keys, *columns], max_rows, max_bytes,
+                              tail=upsert_tail(keys, columns))
+        for period_rows in rows.values():
+            for row in period_rows:
+                writer.add([render(row)])
+        writer.flush()
+        statements += writer.statements
+
+    # Watermarks last: a partly applied file is redone from the old watermark next run
+    f.write("\n-- === ROLLUP_WATERMARKS ===\n")
+    for source, (_, (created_at, last_id)) in results.items():
+        f.write("INSERT INTO rollup_watermarks (source, last_created_at, last_id, updated_at)\n"
+                f"VALUES ({escape_sql(source)}, {escape_sql(created_at)}, {last_id}, datetime('now'))\n"
+                "ON CONFLICT(source) DO UPDATE SET last_created_at = excluded.last_created_at, "
+                "last_id = excluded.last_id, updated_at = excluded.updated_at;\n")
+        statements += 1
+    return statements
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AniMatch — hourly/daily analytics rollups')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--export', type=str, help='`wrangler d1 export` SQL dump')
+    source.add_argument('--db', type=str, help='SQLite copy of the D1 database')
+    parser.add_argument('--output', type=str, default=OUTPUT_PATH, help='Upsert SQL path')
+    parser.add_argument('--full', action='store_true', help='Ignore the watermark and rebuild every bucket')
+    parser.add_argument('--apply', action='store_true', help='Also run the upserts against --db')
+    parser.add_argument('--max-rows', type=int, default=DEFAULT_MAX_ROWS, help='Rows per statement')
+    parser.add_argument('--max-bytes', type=int, default=D1_MAX_STATEMENT_BYTES, help='Bytes per statement')
+    add_instrument_args(parser)
+    args = parser.parse_args()
+
+    print("🎌 AniMatch — Analytics Rollup")
+    if args.apply and not args.db:
+        parser.error('--apply needs --db')
+    path = args.db or args.export
+    if not os.path.exists(path):
+        print(f"❌ Source not found at {path}")
+        return
+
+    with instrumented('analytics_rollup', args):
+        with timer('load'):
+            conn = open_source(args.db, args.export)
+        try:
+            watermarks = {} if args.full else load_watermarks(conn)
+            results = {}
+            with timer('aggregate'):
+                for src, (table, _, _, _) in ROLLUPS.items():
+                    created_at, last_id = watermarks.get(src, ('', 0))
+                    since = created_at[:10]  # whole day of the watermark: its buckets are rewritten
+                    result = rollup(conn, src, (created_at, last_id))
+                    if result is None:
+                        print(f"  {src:<15} no rows after id {last_id}")
+                        continue
+                    results[src] = result
+                    rows, (last_created_at, _) = result
+                    print(f"  {src:<15} from {since or 'the beginning'} to {last_created_at}: "
+                          + ', '.join(f"{len(r)} {p}" for p, r in rows.items()) + f" rows → {table}")
+            if not results:
+                print("  ✅ Rollups are up to date — nothing to write")
+                return
+
+            tmp = args.output + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.write("-- AniMatch analytics rollups (generated by ml/analytics_rollup.py; safe to re-apply)\n")
+                statements = write_rollups(f, results, args.max_rows, args.max_bytes)
+            os.replace(tmp, args.output)
+            print(f"  📁 {statements} statements → {args.output}")
+
+            if args.apply:
+                with timer('apply'), open(args.output, encoding='utf-8') as f:
+                    conn.executescript(f.read())
+                    conn.commit()
+                print(f"  ✅ Applied to {args.db}")
+            else:
+                print("  Next: wrangler d1 execute animatch-db --remote --file <that file>")
+        finally:
+            conn.close()
+
+
+if __name__ == '__main__':
+    main()
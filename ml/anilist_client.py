@@ -0,0 +1,153 @@
+"""
+Batched AniList GraphQL client with an on-disk response cache.
+
+Many `Character(search:)` lookups are packed into one POST using GraphQL
+aliases (c0, c1, ...), requests go through the shared Fetcher's
+`graphql.anilist.co` token bucket (90 req/min), and results — including
+"not found" — are cached in a local SQLite file with a TTL so re-running a
+batch import makes no network calls at all.
+
+    client = AniListClient()
+    urls = client.lookup_images(['Akane Kurokawa', 'Frieren'])
+    # {'Akane Kurokawa': 'https://s4.anilist.co/...', 'Frieren': ...}
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from fetcher import get_fetcher
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_PATH = os.path.join(SCRIPT_DIR, 'cache', 'anilist.sqlite')
+ANILIST_URL = 'https://graphql.anilist.co'
+DEFAULT_BATCH_SIZE = 20        # aliases per request (stays well under query complexity limits)
+DEFAULT_TTL = 30 * 24 * 3600   # found characters: images rarely change
+NEGATIVE_TTL = 24 * 3600       # not found: retry the next day
+
+CHARACTER_FIELDS = '''
+    id
+    name { full native }
+    image { large medium }
+'''
+
+
+def cache_key(name):
+    return 'character:' + ' '.join((name or '').lower().split())
+
+
+def build_batch_query(count):
+    """GraphQL document with `count` aliased Character(search:) lookups."""
+    params = ', '.join(f"$s{i}: String" for i in range(count))
+    fields = '\n'.join(
+        f"  c{i}: Character(search: $s{i}) {{{CHARACTER_FIELDS}  }}" for i in range(count)
+    )
+    return f"query ({params}) {{\n{fields}\n}}"
+
+
+def image_url(character):
+    if not character:
+        return None
+    img = character.get('image') or {}
+    return img.get('large') or img.get('medium')
+
+
+class ResponseCache:
+    """SQLite key → JSON cache with per-entry expiry."""
+
+    def __init__(self, path=CACHE_PATH):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+              key        TEXT PRIMARY KEY,
+              value      TEXT,
+              expires_at REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def get_many(self, keys):
+        """{key: value} for unexpired entries; missing keys are absent."""
+        now = time.time()
+        found = {}
+        with self.lock:
+            for key in keys:
+                row = self.conn.execute(
+                    "SELECT value FROM responses WHERE key = ? AND expires_at > ?", (key, now)
+                ).fetchone()
+                if row:
+                    found[key] = json.loads(row[0])
+        return found
+
+    def put_many(self, items):
+        """items: iterable of (key, value, ttl_seconds)."""
+        now = time.time()
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)",
+                [(k, json.dumps(v, ensure_ascii=False), now + ttl) for k, v, ttl in items],
+            )
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+class AniListClient:
+    def __init__(self, cache_path=CACHE_PATH, endpoint=ANILIST_URL,
+                 batch_size=DEFAULT_BATCH_SIZE, ttl=DEFAULT_TTL, fetcher=None):
+        self.cache = ResponseCache(cache_path)
+        self.endpoint = endpoint
+        self.batch_size = batch_size
+        self.ttl = ttl
+        self.fetcher = fetcher or get_fetcher()
+        self.requests_made = 0
+
+    def _query(self, names):
+        """One aliased request for `names` → {name: character dict or None}."""
+        resp = self.fetcher.request(
+            'POST', self.endpoint,
+            json={
+                'query': build_batch_query(len(names)),
+                'variables': {f"s{i}": n for i, n in enumerate(names)},
+            },
+            headers={'Content-Type': 'application/json', 'Accept': 'application/json'},
+            # AniList answers 404 when any alias is not found, with the rest in `data`
+            allow_status=(404,),
+        )
+        self.requests_made += 1
+        data = (resp.json() or {}).get('data') or {}
+        return {n: data.get(f"c{i}") for i, n in enumerate(names)}
+
+    def search_characters(self, names):
+        """{name: character dict or None}, from cache where possible."""
+        unique = list(dict.fromkeys(n for n in names if n))
+        keys = {n: cache_key(n) for n in unique}
+        cached = self.cache.get_many(keys.values())
+        results = {n: cached[keys[n]] for n in unique if keys[n] in cached}
+
+        missing = [n for n in unique if keys[n] not in cached]
+        for start in range(0, len(missing), self.batch_size):
+            chunk = missing[start:start + self.batch_size]
+            try:
+                found = self._query(chunk)
+            except Exception as e:
+                print(f"  ⚠️ AniList batch lookup failed ({len(chunk)} names): {e}")
+                continue  # leave uncached so the next run retries
+            results.update(found)
+            self.cache.put_many(
+                (keys[n], c, self.ttl if c else NEGATIVE_TTL) for n, c in found.items()
+            )
+        return results
+
+    def lookup_images(self, names):
+        """{name: image URL or None}."""
+        return {n: image_url(c) for n, c in self.search_characters(names).items()}
+
+    def close(self):
+        self.cache.close()
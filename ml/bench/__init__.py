@@ -0,0 +1,5 @@
+"""AniMatch benchmark suites.
+
+Run from the ml/ directory, e.g.:
+  python -m bench.model_latency
+"""
@@ -0,0 +1,147 @@
+"""
+AniMatch — AniList Batch Lookup Check
+Runs the batched AniList client against a local fake GraphQL server that
+understands aliased `Character(search:)` queries, and compares:
+
+  per-name     one request per lookup (the old fetch_anilist_image_url)
+  batched      aliased batches, cold cache
+  cached       same lookups again, warm SQLite cache (expect 0 requests)
+
+Every mode must resolve the same URLs; unknown names come back as null with
+HTTP 404, like the real API.
+
+Usage (from ml/):
+  python -m bench.anilist_batch
+  python -m bench.anilist_batch --names 400 --batch-size 25 --latency-ms 80
+"""
+
+import argparse
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from anilist_client import AniListClient
+from fetcher import Fetcher
+
+DEFAULT_NAMES = 200
+DEFAULT_LATENCY_MS = 60
+NOT_FOUND_EVERY = 10  # every 10th name is unknown to the fake server
+ALIAS_RE = re.compile(r'(c\d+): Character\(search: \$(s\d+)\)')
+
+
+class FakeAniList:
+    def __init__(self, known, latency_s):
+        self.known = known
+        self.latency_s = latency_s
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def answer(self, body):
+        with self.lock:
+            self.requests += 1
+        time.sleep(self.latency_s)
+        variables = body.get('variables') or {}
+        data, errors = {}, []
+        for alias, var in ALIAS_RE.findall(body['query']):
+            name = variables.get(var)
+            if name in self.known:
+                data[alias] = {
+                    'id': self.known[name],
+                    'name': {'full': name, 'native': None},
+                    'image': {'large': f"https://s4.anilist.co/character/{self.known[name]}.jpg",
+                              'medium': None},
+                }
+            else:
+                data[alias] = None
+                errors.append({'message': 'Not Found.', 'status': 404, 'path': [alias]})
+        status = 404 if errors else 200
+        return status, {'data': data, 'errors': errors} if errors else {'data': data}
+
+
+def start_server(fake):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            status, payload = fake.answer(json.loads(self.rfile.read(length)))
+            out = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(out)))
+            self.end_headers()
+            self.wfile.write(out)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def timed(fake, fn):
+    before = fake.requests
+    t0 = time.perf_counter()
+    result = fn()
+    return result, fake.requests - before, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AniMatch — AniList batch lookup check')
+    parser.add_argument('--names', type=int, default=DEFAULT_NAMES)
+    parser.add_argument('--batch-size', type=int, default=20)
+    parser.add_argument('--latency-ms', type=int, default=DEFAULT_LATENCY_MS)
+    parser.add_argument('--rate', type=float, default=None,
+                        help='Requests/s limit to apply (default: unlimited for the local server)')
+    args = parser.parse_args()
+
+    names = [f"Character {i}" for i in range(args.names)]
+    known = {n: 1000 + i for i, n in enumerate(names) if i % NOT_FOUND_EVERY}
+    fake = FakeAniList(known, args.latency_ms / 1000)
+    server = start_server(fake)
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}/"
+    rate = (args.rate, 1) if args.rate else None
+    fetcher = Fetcher(host_rates={}, default_rate=rate)
+
+    print("🎌 AniMatch — AniList Batch Lookup Check")
+    print(f"  {args.names} names ({len(known)} known), batch size {args.batch_size}, "
+          f"{args.latency_ms} ms server latency\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        per_name = AniListClient(os.path.join(tmp, 'a.sqlite'), endpoint, batch_size=1, fetcher=fetcher)
+        batched = AniListClient(os.path.join(tmp, 'b.sqlite'), endpoint,
+                                batch_size=args.batch_size, fetcher=fetcher)
+
+        rows = [
+            ('per-name', *timed(fake, lambda: per_name.lookup_images(names))),
+            ('batched', *timed(fake, lambda: batched.lookup_images(names))),
+            ('cached', *timed(fake, lambda: batched.lookup_images(names))),
+        ]
+        per_name.close()
+        batched.close()
+
+    expected = {n: (f"https://s4.anilist.co/character/{known[n]}.jpg" if n in known else None)
+                for n in names}
+    print(f"{'Mode':<10} {'Requests':>9} {'Secs':>7} {'Correct':>8}")
+    ok = True
+    for mode, result, n_requests, elapsed in rows:
+        correct = result == expected
+        ok &= correct
+        print(f"{mode:<10} {n_requests:>9} {elapsed:>7.2f} {'✅' if correct else '❌':>7}")
+
+    server.shutdown()
+    if rows[2][2] != 0:
+        print("\n❌ Warm cache still hit the network")
+        ok = False
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""
+AniMatch — Catalog Query Benchmark
+Builds a synthetic animatch.db from db/schema.sql (default 50k character
+rows: 25k anime, each with a protagonist/heroine pair) and compares the
+old per-row query patterns with the shared catalog layer:
+
+  embed N+1    protagonist query + one heroine SELECT per protagonist
+               (old generate_embeddings.py)
+  enrich N+1   one genre JOIN per protagonist (old enrich_embeddings.py)
+  dual         protagonist image query (old generate_dual_embeddings.py)
+  catalog      load_catalog(): one self-join + in-memory lookup dicts
+
+Both sides must resolve the same heroine and genre for every protagonist.
+On a warm local SQLite file a point query costs tens of microseconds, so
+the catalog's win is mostly the query count; it also materializes every
+column of both characters, which the old passes never fetched at once.
+
+Usage (from ml/):
+  python -m bench.catalog_queries
+  python -m bench.catalog_queries --rows 200000
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import tempfile
+import time
+
+from catalog import load_catalog
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'db', 'schema.sql')
+DEFAULT_ROWS = 50_000
+GENRES = ['순정', '학원', '판타지', '액션', '코미디', '드라마']
+
+
+def build_db(path, rows):
+    conn = sqlite3.connect(path)
+    with open(SCHEMA_PATH, encoding='utf-8') as f:
+        conn.executescript(f.read())
+    pairs = rows // 2
+    conn.executemany(
+        "INSERT INTO animes (id, title_ko, title_en, genre, genre_en, orientation, tier) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        ((i, f"작품 {i}", f"Anime {i}", json.dumps(GENRES[i % 6:i % 6 + 2], ensure_ascii=False),
+          '[]', 'male' if i % 2 else 'female', 1 + i % 3) for i in range(1, pairs + 1)),
+    )
+    conn.executemany(
+        "INSERT INTO characters (id, anime_id, name_ko, name_en, gender, role, partner_id, image_url, "
+        "personality, tags, charm_points, iconic_quote, color_primary, emoji) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (row for i in range(1, pairs + 1) for row in (
+            (2 * i - 1, i, f"주인공 {i}", f"Protagonist {i}", 'male', 'protagonist', 2 * i,
+             f"https://example.invalid/p/{i}.jpg", None, None, None, None, None, None),
+            (2 * i, i, f"히로인 {i}", f"Heroine {i}", 'female', 'heroine', 2 * i - 1,
+             f"https://example.invalid/h/{i}.jpg", '["활발"]', '["츤데레"]', '매력', '대사',
+             'linear-gradient(135deg, #667eea, #764ba2)', '💫'),
+        )),
+    )
+    conn.commit()
+    return conn
+
+
+def counting(conn):
+    calls = [0]
+    conn.set_trace_callback(lambda _: calls.__setitem__(0, calls[0] + 1))
+    return calls
+
+
+def legacy_embed(conn):
+    conn.row_factory = sqlite3.Row
+    prots = conn.execute("""
+        SELECT c.id, c.name_ko, c.name_en, c.image_url, c.partner_id,
+               c.gender, c.role,
+               a.orientation, a.title_ko, a.title_en, a.tier, a.genre, a.genre_en
+        FROM characters c
+        JOIN animes a ON c.anime_id = a.id
+        WHERE c.role = 'protagonist'
+        AND c.image_url IS NOT NULL
+        ORDER BY a.orientation, a.tier, a.id
+    """).fetchall()
+    heroines = {}
+    for prot in prots:
+        heroine = conn.execute("""
+            SELECT c.id, c.name_ko, c.name_en, c.image_url,
+                   c.personality, c.personality_en, c.charm_points, c.charm_points_en,
+                   c.iconic_quote, c.iconic_quote_en,
+                   c.tags, c.tags_en, c.color_primary, c.emoji
+            FROM characters c
+            WHERE c.id = ?
+        """, (prot['partner_id'],)).fetchone()
+        heroines[prot['id']] = heroine['id'] if heroine else None
+    return heroines
+
+
+def legacy_enrich(conn, protagonist_ids):
+    conn.row_factory = sqlite3.Row
+    genres = {}
+    for pid in protagonist_ids:
+        row = conn.execute("""
+            SELECT a.genre FROM animes a
+            JOIN characters c ON c.anime_id = a.id
+            WHERE c.id = ?
+        """, (pid,)).fetchone()
+        genres[pid] = row['genre'] if row else None
+    return genres
+
+
+def legacy_dual(conn):
+    conn.row_factory = None
+    rows = conn.execute('SELECT id, name_en, image_url FROM characters WHERE role="protagonist"').fetchall()
+    return {row[0]: (row[1], row[2]) for row in rows}
+
+
+def timed(conn, fn, *args):
+    calls = counting(conn)
+    t0 = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - t0
+    conn.set_trace_callback(None)
+    return result, calls[0], elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AniMatch — catalog query benchmark')
+    parser.add_argument('--rows', type=int, default=DEFAULT_ROWS, help='Character rows to generate')
+    args = parser.parse_args()
+
+    print("🎌 AniMatch — Catalog Query Benchmark")
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        conn = build_db(os.path.join(tmp, 'animatch.db'), args.rows)
+        print(f"  {args.rows} character rows built in {time.perf_counter() - t0:.1f}s\n")
+
+        heroines, embed_q, embed_s = timed(conn, legacy_embed, conn)
+        genres, enrich_q, enrich_s = timed(conn, legacy_enrich, conn, list(heroines))
+        _, dual_q, dual_s = timed(conn, legacy_dual, conn)
+        catalog, cat_q, cat_s = timed(conn, load_catalog, conn)
+        conn.close()
+
+    ok = (heroines == {pid: (p['heroine'] or {}).get('id') for pid, p in catalog.by_protagonist.items()}
+          and genres == {pid: p['anime']['genre'] for pid, p in catalog.by_protagonist.items()})
+
+    print(f"{'Pattern':<12} {'Queries':>8} {'Secs':>8}")
+    print(f"{'embed N+1':<12} {embed_q:>8} {embed_s:>8.3f}")
+    print(f"{'enrich N+1':<12} {enrich_q:>8} {enrich_s:>8.3f}")
+    print(f"{'dual':<12} {dual_q:>8} {dual_s:>8.3f}")
+    legacy_q, legacy_s = embed_q + enrich_q + dual_q, embed_s + enrich_s + dual_s
+    print(f"{'legacy total':<12} {legacy_q:>8} {legacy_s:>8.3f}")
+    print(f"{'catalog':<12} {cat_q:>8} {cat_s:>8.3f}")
+    print(f"\n  {legacy_q // cat_q}x fewer queries, {legacy_s / cat_s:.1f}x faster; "
+          f"same results: {'✅' if ok else '❌'}")
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+AniMatch — CLI Startup Check
+Measures what each `main.py` subcommand pays before doing any work: a
+fresh interpreter runs `python -X importtime`, resolves the subcommand and
+imports its script (without running it). Reports wall time, total import
+time and the heaviest top-level imports, and fails if a metadata-only
+command takes longer than the budget or any command errors for a reason
+other than a missing model dependency (torch, open_clip, onnx, ...).
+
+Usage (from ml/):
+  python -m bench.cli_startup
+  python -m bench.cli_startup --budget-ms 500 --top 5
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+ML_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ML_DIR)
+
+from main import COMMANDS  # noqa: E402
+
+# Commands that never touch a model; these must start within the budget
+METADATA_COMMANDS = {'refresh', 'translate', 'sync-seed', 'd1-diff', 'og data', 'og default', 'analyze', 'add'}
+DEFAULT_BUDGET_MS = 1000
+# Model-side dependencies a heavy command may be probed without; any other error fails the check
+OPTIONAL_DEPS = ('torch', 'torchvision', 'open_clip', 'onnx', 'onnxruntime', 'transformers')
+
+PROBE = """
+import runpy, sys
+from main import resolve
+module, _, _ = resolve(sys.argv[1:])
+runpy.run_module(module, run_name='__startup_probe__')
+"""
+
+
+def subcommands():
+    for name, entry in COMMANDS.items():
+        if isinstance(entry, dict):
+            for target in entry:
+                yield [name, target]
+        else:
+            yield [name]
+
+
+def parse_importtime(stderr):
+    """(total self µs, [(cumulative µs, top-level module)]) from -X importtime output."""
+    total, top = 0, []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative, name = line[len('import time:'):].split('|', 2)
+        total += int(self_us)
+        if not name.startswith('  '):  # depth 0: imported directly by the probe
+            top.append((int(cumulative), name.strip()))
+    return total, sorted(top, reverse=True)
+
+
+def missing_optional_dep(error):
+    """Whether a probe error is only an optional model dependency that isn't installed."""
+    m = re.match(r"ModuleNotFoundError: No module named '([\w.]+)'", error)
+    return bool(m) and m.group(1).split('.')[0] in OPTIONAL_DEPS
+
+
+def probe(argv):
+    t0 = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', PROBE, *argv],
+                          cwd=ML_DIR, capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - t0) * 1000
+    total_us, top = parse_importtime(proc.stderr)
+    error = None
+    if proc.returncode:
+        error = proc.stderr.strip().splitlines()[-1]
+    return wall_ms, total_us / 1000, top, error
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AniMatch — CLI startup check')
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help='Max wall time for metadata-only commands')
+    parser.add_argument('--top', type=int, default=3, help='Heaviest imports to list')
+    args = parser.parse_args()
+
+    print("🎌 AniMatch — CLI Startup Check")
+    print(f"  {sys.executable}\n")
+    print(f"{'Command':<18} {'Wall ms':>8} {'Import ms':>10}  Heaviest imports")
+
+    ok = True
+    for argv in subcommands():
+        name = ' '.join(argv)
+        wall_ms, import_ms, top, error = probe(argv)
+        if error:
+            tolerated = name not in METADATA_COMMANDS and missing_optional_dep(error)
+            ok &= tolerated
+            print(f"{name:<18} {'-':>8} {'-':>10}  {'⚠️' if tolerated else '❌'} {error}")
+            continue
+        heaviest = ', '.join(f"{mod} {us / 1000:.0f}" for us, mod in top[:args.top])
+        flag = ''
+        if name in METADATA_COMMANDS:
+            within = wall_ms <= args.budget_ms
+            ok &= within
+            flag = '✅ ' if within else '❌ '
+        print(f"{name:<18} {wall_ms:>8.0f} {import_ms:>10.0f}  {flag}{heaviest}")
+
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""
+AniMatch — Bulk DB Writer Benchmark
+Imports synthetic characters into a fresh on-disk copy of db/schema.sql
+two ways and reports characters/s:
+
+  legacy   3 INSERTs + 1 UPDATE + commit per character (old add_character.py)
+  bulk     BulkCharacterWriter: WAL, one transaction, executemany
+
+With --bad N, N characters violate a CHECK constraint, forcing the bulk
+writer onto its per-character savepoint path; the report shows how many
+rows survived and confirms no partial anime/character rows remain.
+
+Usage (from ml/):
+  python -m bench.db_writer
+  python -m bench.db_writer --count 5000 --bad 3
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import tempfile
+import time
+
+from db_writer import BulkCharacterWriter
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'db', 'schema.sql')
+DEFAULT_COUNT = 1000
+
+
+def synthetic_characters(count, bad=0):
+    chars = []
+    for i in range(count):
+        chars.append({
+            'title_ko': f"작품 {i}", 'title_en': f"Anime {i}",
+            'genre': ['순정', '학원'], 'orientation': 'male' if i % 2 else 'female', 'tier': 1 + i % 3,
+            'protagonist_ko': f"주인공 {i}", 'protagonist_en': f"Protagonist {i}",
+            'protagonist_image': f"https://example.invalid/p/{i}.jpg",
+            'heroine_ko': f"히로인 {i}", 'heroine_en': f"Heroine {i}",
+            'heroine_image': f"https://example.invalid/h/{i}.jpg",
+            'heroine_tags': ['츤데레'], 'heroine_personality': ['활발'],
+            'heroine_charm': '매력', 'heroine_quote': '대사',
+        })
+    # Spread constraint violations (gender CHECK) across the batch
+    for j in range(bad):
+        chars[(j + 1) * count // (bad + 1)]['heroine_gender'] = 'unknown'
+    return chars
+
+
+def fresh_db(path):
+    conn = sqlite3.connect(path)
+    with open(SCHEMA_PATH, encoding='utf-8') as f:
+        conn.executescript(f.read())
+    conn.commit()
+    return conn
+
+
+def legacy_insert(conn, c):
+    """The pre-bulk add_character.py insert path."""
+    cur = conn.cursor()
+    cur.execute("INSERT INTO animes (title_ko, title_en, genre, orientation, tier) VALUES (?, ?, ?, ?, ?)",
+                (c['title_ko'], c['title_en'], json.dumps(c['genre'], ensure_ascii=False),
+                 c['orientation'], c['tier']))
+    anime_id = cur.lastrowid
+    cur.execute("INSERT INTO characters (anime_id, name_ko, name_en, role, gender, image_url) "
+                "VALUES (?, ?, ?, 'protagonist', ?, ?)",
+                (anime_id, c['protagonist_ko'], c['protagonist_en'], 'male', c['protagonist_image']))
+    protagonist_id = cur.lastrowid
+    cur.execute("INSERT INTO characters (anime_id, name_ko, name_en, role, gender, image_url, "
+                "tags, personality, charm_points, iconic_quote, partner_id) "
+                "VALUES (?, ?, ?, 'heroine', ?, ?, ?, ?, ?, ?, ?)",
+                (anime_id, c['heroine_ko'], c['heroine_en'], c.get('heroine_gender', 'female'),
+                 c['heroine_image'], json.dumps(c['heroine_tags'], ensure_ascii=False),
+                 json.dumps(c['heroine_personality'], ensure_ascii=False),
+                 c['heroine_charm'], c['heroine_quote'], protagonist_id))
+    heroine_id = cur.lastrowid
+    cur.execute("UPDATE characters SET partner_id = ? WHERE id = ?", (heroine_id, protagonist_id))
+    conn.commit()
+
+
+def run_legacy(path, chars):
+    conn = fresh_db(path)
+    ok = 0
+    t0 = time.perf_counter()
+    for c in chars:
+        try:
+            legacy_insert(conn, c)
+            ok += 1
+        except sqlite3.IntegrityError:
+            conn.commit()  # what the old code effectively left behind
+    elapsed = time.perf_counter() - t0
+    return conn, ok, elapsed
+
+
+def run_bulk(path, chars):
+    conn = fresh_db(path)
+    writer = BulkCharacterWriter(conn)
+    t0 = time.perf_counter()
+    with writer.transaction():
+        results = writer.insert_batch(chars)
+    elapsed = time.perf_counter() - t0
+    return conn, sum(1 for r in results if 'ids' in r), elapsed
+
+
+def integrity(conn):
+    """(animes, characters, orphan animes, unlinked protagonists)."""
+    q = lambda sql: conn.execute(sql).fetchone()[0]
+    return (
+        q("SELECT COUNT(*) FROM animes"),
+        q("SELECT COUNT(*) FROM characters"),
+        q("SELECT COUNT(*) FROM animes a WHERE (SELECT COUNT(*) FROM characters c WHERE c.anime_id = a.id) != 2"),
+        q("SELECT COUNT(*) FROM characters WHERE role = 'protagonist' AND partner_id IS NULL"),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AniMatch — bulk DB writer benchmark')
+    parser.add_argument('--count', type=int, default=DEFAULT_COUNT)
+    parser.add_argument('--bad', type=int, default=0, help='Characters that violate a constraint')
+    args = parser.parse_args()
+
+    chars = synthetic_characters(args.count, args.bad)
+    print("🎌 AniMatch — Bulk DB Writer Benchmark")
+    print(f"  {args.count} characters ({args.bad} invalid)\n")
+
+    print(f"{'Mode':<8} {'OK':>6} {'Secs':>8} {'chars/s':>9} {'Animes':>7} {'Chars':>7} {'Partial':>8} {'Unlinked':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, fn in (('legacy', run_legacy), ('bulk', run_bulk)):
+            conn, ok, elapsed = fn(os.path.join(tmp, f"{name}.db"), chars)
+            animes, characters, partial, unlinked = integrity(conn)
+            conn.close()
+            print(f"{name:<8} {ok:>6} {elapsed:>8.3f} {ok / elapsed:>9.0f} {animes:>7} {characters:>7} "
+                  f"{partial:>8} {unlinked:>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+AniMatch — Fetcher Load Test
+Starts a local stand-in for the image CDN (threaded HTTP/1.1 server with
+keep-alive, fixed payload size and artificial latency) and downloads the
+same set of URLs three ways:
+
+  legacy       one `requests.get` per URL, sequential (the old code path)
+  pooled x1    shared Fetcher session, one worker (connection reuse only)
+  pooled xN    shared Fetcher session, N workers (reuse + concurrency)
+
+A fraction of requests can be made to fail with 503 to exercise the
+retry/backoff path.
+
+Usage (from ml/):
+  python -m bench.fetcher_load
+  python -m bench.fetcher_load --requests 400 --workers 16 --latency-ms 30 --fail-rate 0.05
+"""
+
+import argparse
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from fetcher import Fetcher
+
+DEFAULT_REQUESTS = 200
+DEFAULT_PAYLOAD_KB = 60   # typical AniList "large" character image
+DEFAULT_LATENCY_MS = 40
+DEFAULT_WORKERS = 8
+
+
+def make_handler(payload, latency_s, fail_rate):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+        def do_GET(self):
+            time.sleep(latency_s)
+            if fail_rate and random.random() < fail_rate:
+                self.send_response(503)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'image/jpeg')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def start_server(payload_kb, latency_ms, fail_rate):
+    payload = random.randbytes(payload_kb * 1024)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(payload, latency_ms / 1000, fail_rate))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_legacy(urls):
+    import requests
+    ok = 0
+    for url in urls:
+        try:
+            resp = requests.get(url, timeout=10)
+            resp.raise_for_status()
+            ok += 1
+        except Exception:
+            pass
+    return ok, None
+
+
+def run_pooled(urls, workers):
+    # No rate limit for the local host: measure the transport itself
+    fetcher = Fetcher(max_workers=workers, host_rates={}, default_rate=None, backoff=0.05)
+    ok = sum(1 for _, body, err in fetcher.fetch_many(urls) if err is None)
+    return ok, fetcher.summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AniMatch — fetcher load test')
+    parser.add_argument('--requests', type=int, default=DEFAULT_REQUESTS)
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--payload-kb', type=int, default=DEFAULT_PAYLOAD_KB)
+    parser.add_argument('--latency-ms', type=int, default=DEFAULT_LATENCY_MS)
+    parser.add_argument('--fail-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = start_server(args.payload_kb, args.latency_ms, args.fail_rate)
+    host, port = server.server_address
+    urls = [f"http://{host}:{port}/img/{i}.jpg" for i in range(args.requests)]
+
+    print("🎌 AniMatch — Fetcher Load Test")
+    print(f"  {args.requests} × {args.payload_kb} KB, {args.latency_ms} ms server latency, "
+          f"fail rate {args.fail_rate:.0%}\n")
+
+    runs = [
+        ('legacy', lambda: run_legacy(urls)),
+        ('pooled x1', lambda: run_pooled(urls, 1)),
+        (f"pooled x{args.workers}", lambda: run_pooled(urls, args.workers)),
+    ]
+    rows = []
+    for name, fn in runs:
+        t0 = time.perf_counter()
+        ok, stats = fn()
+        elapsed = time.perf_counter() - t0
+        rows.append((name, ok, elapsed, stats))
+
+    base_rps = rows[0][1] / rows[0][2] if rows[0][2] else 0
+    print(f"{'Mode':<12} {'OK':>5} {'Secs':>7} {'req/s':>8} {'Speedup':>8} {'Retries':>8} {'p95 ms':>7}")
+    for name, ok, elapsed, stats in rows:
+        rps = ok / elapsed if elapsed else 0
+        speedup = rps / base_rps if base_rps else 0
+        retries = stats['retries'] if stats else '-'
+        p95 = f"{stats['p95_ms']:.0f}" if stats else '-'
+        print(f"{name:<12} {ok:>5} {elapsed:>7.2f} {rps:>8.1f} {speedup:>7.1f}x {retries:>8} {p95:>7}")
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+"""
+AniMatch — Image Hash Lookup Benchmark
+Hashes a synthetic catalog of images (default 10k: smooth random 64×64
+pictures) with image_hashes.phash_batch, then looks up a query set against
+it four ways:
+
+  linear       Python loop over every hash (what a naive check would do)
+  numpy        image_hashes.ImageHashIndex: one XOR + popcount over a
+               uint64 array per query (what ingestion uses)
+  bk-tree      Burkhard-Keller tree, visiting only subtrees that can match
+  multi-index  radius + 1 exact-match tables over bit ranges (pigeonhole),
+               candidates checked with popcount
+
+The two index structures are here as the reference for that choice: at
+64 bits and radius 6 the BK-tree's triangle-inequality pruning still
+visits most of the tree, and the multi-index table's Python-level
+candidate checks cost more than NumPy scanning every hash at 10k–50k.
+
+Half of the queries are re-encoded copies of catalog images (JPEG q70,
+resized, brightened — what a re-upload or CDN variant looks like), the
+other half are new images. All four must return the same matches; the
+benchmark also reports how many copies were found and how many new images
+were wrongly matched at DUPLICATE_DISTANCE.
+
+Usage (from ml/):
+  python -m bench.image_hashes
+  python -m bench.image_hashes --images 50000 --queries 2000
+"""
+
+import argparse
+import time
+from io import BytesIO
+
+import numpy as np
+from PIL import Image, ImageEnhance
+
+from image_hashes import DUPLICATE_DISTANCE, ImageHashIndex, dhash_batch, hamming, phash_batch
+
+DEFAULT_IMAGES = 10_000
+DEFAULT_QUERIES = 1_000
+SIDE = 64
+HASH_BATCH = 512
+
+
+class BKTree:
+    """Burkhard-Keller tree over Hamming distance (children keyed by distance to their parent)."""
+
+    def __init__(self):
+        self.root = None   # [hash, items, {distance: child}]
+
+    def add(self, h, item):
+        if self.root is None:
+            self.root = [h, [item], {}]
+            return
+        node = self.root
+        while True:
+            d = hamming(h, node[0])
+            if d == 0:
+                node[1].append(item)
+                return
+            if d not in node[2]:
+                node[2][d] = [h, [item], {}]
+                return
+            node = node[2][d]
+
+    def search(self, h, radius):
+        found, stack = [], [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            d = hamming(h, node[0])
+            if d <= radius:
+                found.extend((d, item) for item in node[1])
+            stack.extend(child for key, child in node[2].items() if d - radius <= key <= d + radius)
+        return found
+
+
+class MultiIndexHash:
+    """radius + 1 exact-match tables over disjoint bit ranges: two hashes within
+    `radius` bits agree exactly on at least one range (pigeonhole)."""
+
+    def __init__(self, radius, bits=64):
+        parts = radius + 1
+        edges = [round(bits * i / parts) for i in range(parts + 1)]
+        self.ranges = [(lo, (1 << (hi - lo)) - 1) for lo, hi in zip(edges, edges[1:])]  # (shift, mask)
+        self.tables = [{} for _ in self.ranges]
+        self.hashes = []
+
+    def add(self, h, item):
+        slot = len(self.hashes)
+        self.hashes.append((h, item))
+        for table, (shift, mask) in zip(self.tables, self.ranges):
+            table.setdefault((h >> shift) & mask, []).append(slot)
+
+    def search(self, h, radius):
+        candidates = set()
+        for table, (shift, mask) in zip(self.tables, self.ranges):
+            candidates.update(table.get((h >> shift) & mask, ()))
+        found = []
+        for slot in candidates:
+            other, item = self.hashes[slot]
+            d = hamming(h, other)
+            if d <= radius:
+                found.append((d, item))
+        return found
+
+
+def synthetic_images(rng, n):
+    """Smooth random pictures: an 8×8 color grid upsampled, so hashes have structure."""
+    for _ in range(n):
+        grid = rng.integers(0, 256, (8, 8, 3), dtype=np.uint8)
+        yield Image.fromarray(grid).resize((SIDE, SIDE), Image.Resampling.BICUBIC)
+
+
+def variant(img):
+    """A re-encoded copy: JPEG q70, downscaled, slightly brighter."""
+    buf = BytesIO()
+    img.resize((SIDE * 3 // 4, SIDE * 3 // 4), Image.Resampling.BILINEAR).save(buf, 'JPEG', quality=70)
+    return ImageEnhance.Brightness(Image.open(buf).convert('RGB')).enhance(1.1)
+
+
+def hash_all(imgs, fn):
+    hashes = []
+    for start in range(0, len(imgs), HASH_BATCH):
+        hashes.extend(fn(imgs[start:start + HASH_BATCH]))
+    return hashes
+
+
+def linear_lookup(hashes, queries, radius):
+    return [sorted(i for i, h in enumerate(hashes) if hamming(q, h) <= radius) for q in queries]
+
+
+def numpy_lookup(index, queries, radius):
+    return [sorted(int(url) for _, url, _ in index.matches(q, radius=radius)) for q in queries]
+
+
+def tree_lookup(tree, queries, radius):
+    return [sorted(i for _, i in tree.search(q, radius)) for q in queries]
+
+
+def build(index, hashes):
+    for i, h in enumerate(hashes):
+        index.add(h, i)
+    return index
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AniMatch — perceptual hash lookup benchmark')
+    parser.add_argument('--images', type=int, default=DEFAULT_IMAGES, help='Catalog images to index')
+    parser.add_argument('--queries', type=int, default=DEFAULT_QUERIES, help='Lookups (half are copies)')
+    parser.add_argument('--radius', type=int, default=DUPLICATE_DISTANCE, help='Max differing bits')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print("🎌 AniMatch — Image Hash Lookup Benchmark")
+    rng = np.random.default_rng(args.seed)
+    catalog = list(synthetic_images(rng, args.images))
+    copies = [variant(catalog[i]) for i in rng.choice(args.images, args.queries // 2, replace=False)]
+    fresh = list(synthetic_images(rng, args.queries - len(copies)))
+
+    hashes, phash_s = timed(hash_all, catalog, phash_batch)
+    _, dhash_s = timed(hash_all, catalog, dhash_batch)
+    queries = hash_all(copies + fresh, phash_batch)
+    print(f"  Hashing {args.images} images: pHash {phash_s:.2f}s ({args.images / phash_s:,.0f}/s), "
+          f"dHash {dhash_s:.2f}s ({args.images / dhash_s:,.0f}/s)\n")
+
+    index = ImageHashIndex()
+    for i, h in enumerate(hashes):
+        index.add(str(i), h, '')
+    index.matches(0)  # materialize the array outside the timed loop
+    tree, tree_build_s = timed(build, BKTree(), hashes)
+    mih, mih_build_s = timed(build, MultiIndexHash(args.radius), hashes)
+
+    linear, linear_s = timed(linear_lookup, hashes, queries, args.radius)
+    vectorized, numpy_s = timed(numpy_lookup, index, queries, args.radius)
+    bk, tree_s = timed(tree_lookup, tree, queries, args.radius)
+    multi, mih_s = timed(tree_lookup, mih, queries, args.radius)
+
+    n = len(queries)
+    print(f"{'Lookup':<12} {'Total s':>8} {'µs/query':>10}")
+    print(f"{'linear':<12} {linear_s:>8.3f} {linear_s / n * 1e6:>10.1f}")
+    print(f"{'numpy':<12} {numpy_s:>8.3f} {numpy_s / n * 1e6:>10.1f}")
+    print(f"{'bk-tree':<12} {tree_s:>8.3f} {tree_s / n * 1e6:>10.1f}   (built in {tree_build_s:.2f}s)")
+    print(f"{'multi-index':<12} {mih_s:>8.3f} {mih_s / n * 1e6:>10.1f}   (built in {mih_build_s:.2f}s)")
+
+    ok = linear == vectorized == bk == multi
+    found = sum(1 for m in vectorized[:len(copies)] if m)
+    false_hits = sum(1 for m in vectorized[len(copies):] if m)
+    print(f"\n  radius {args.radius}: {found}/{len(copies)} re-encoded copies found, "
+          f"{false_hits}/{len(fresh)} new images matched something")
+    print(f"  numpy {linear_s / numpy_s:.0f}x faster than linear, {tree_s / numpy_s:.0f}x vs bk-tree, "
+          f"{mih_s / numpy_s:.1f}x vs multi-index; same results: {'✅' if ok else '❌'}")
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
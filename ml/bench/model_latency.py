@@ -0,0 +1,225 @@
+"""
+AniMatch — Model Latency Benchmark
+Loads every CLIP and ArcFace ONNX artifact (fp32, q8, q4, optimized
+variants, ...) and sweeps ONNX Runtime thread count, execution mode and
+batch size. Each configuration runs in a fresh process so session-create
+time and peak RSS are not polluted by earlier runs.
+
+Records per configuration: session-create time, p50/p95 latency,
+throughput (images/s) and peak RSS. Results are written as JSON and a
+Markdown table; --compare flags regressions against a stored baseline.
+
+Usage (from ml/):
+  python -m bench.model_latency
+  python -m bench.model_latency --threads 1 4 --batch 1 --runs 30
+  python -m bench.model_latency --save-baseline
+  python -m bench.model_latency --compare bench/results/baseline.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+ML_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+PUBLIC_MODEL_DIR = os.path.join(ML_DIR, '..', 'public', 'models')
+LOCAL_MODEL_DIR = os.path.join(ML_DIR, 'models')
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+BASELINE_PATH = os.path.join(RESULTS_DIR, 'baseline.json')
+
+DEFAULT_THREADS = [1, 2, 4]
+DEFAULT_MODES = ['sequential', 'parallel']
+DEFAULT_BATCHES = [1, 4]
+DEFAULT_RUNS = 20
+WARMUP_RUNS = 3
+REGRESSION_THRESH = 0.10  # flag when p50 is >10% slower than baseline
+
+
+def discover_artifacts():
+    """All .onnx/.ort model files shipped or kept locally."""
+    found = []
+    for d in (PUBLIC_MODEL_DIR, LOCAL_MODEL_DIR):
+        if not os.path.isdir(d):
+            continue
+        for f in sorted(os.listdir(d)):
+            if f.endswith(('.onnx', '.ort')) and not f.startswith('_'):
+                found.append(os.path.normpath(os.path.join(d, f)))
+    return found
+
+
+def peak_rss_mb():
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return rss / (1024 * 1024) if platform.system() == 'Darwin' else rss / 1024
+
+
+def run_config(model_path, threads, mode, batch, runs):
+    """Benchmark one configuration. Runs inside a fresh worker process."""
+    import onnxruntime as ort
+
+    opts = ort.SessionOptions()
+    opts.intra_op_num_threads = threads
+    opts.execution_mode = (
+        ort.ExecutionMode.ORT_PARALLEL if mode == 'parallel' else ort.ExecutionMode.ORT_SEQUENTIAL
+    )
+
+    t0 = time.perf_counter()
+    session = ort.InferenceSession(model_path, opts, providers=['CPUExecutionProvider'])
+    create_ms = (time.perf_counter() - t0) * 1000
+
+    inp = session.get_inputs()[0]
+    dims = list(inp.shape)
+    if isinstance(dims[0], int) and dims[0] > 0 and dims[0] != batch:
+        return {'skipped': f"fixed batch dim {dims[0]}"}
+    shape = [batch] + [1 if isinstance(d, str) or not d else d for d in dims[1:]]
+    feed = {inp.name: np.random.randn(*shape).astype(np.float32)}
+
+    for _ in range(WARMUP_RUNS):
+        session.run(None, feed)
+
+    latencies = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        session.run(None, feed)
+        latencies.append((time.perf_counter() - t0) * 1000)
+
+    lat = np.array(latencies)
+    p50 = float(np.percentile(lat, 50))
+    return {
+        'create_ms': round(create_ms, 2),
+        'p50_ms': round(p50, 2),
+        'p95_ms': round(float(np.percentile(lat, 95)), 2),
+        'throughput': round(batch * 1000 / p50, 2) if p50 > 0 else 0.0,
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+    }
+
+
+def run_isolated(ctx, *args):
+    with ctx.Pool(1) as pool:
+        return pool.apply(run_config, args)
+
+
+def config_key(r):
+    return f"{r['model']}|t{r['threads']}|{r['mode']}|b{r['batch']}"
+
+
+def run_suite(models, threads_list, modes, batches, runs):
+    ctx = multiprocessing.get_context('spawn')
+    results = []
+    for model_path in models:
+        name = os.path.basename(model_path)
+        print(f"📦 {name} ({os.path.getsize(model_path) / (1024 * 1024):.1f} MB)")
+        for threads in threads_list:
+            for mode in modes:
+                for batch in batches:
+                    try:
+                        stats = run_isolated(ctx, model_path, threads, mode, batch, runs)
+                    except Exception as e:
+                        stats = {'error': str(e)}
+                    row = {'model': name, 'threads': threads, 'mode': mode, 'batch': batch, **stats}
+                    results.append(row)
+                    if 'p50_ms' in stats:
+                        print(f"  t={threads} {mode:<10} b={batch}: p50 {stats['p50_ms']:.1f} ms, "
+                              f"p95 {stats['p95_ms']:.1f} ms, {stats['throughput']:.1f} img/s")
+                    else:
+                        print(f"  t={threads} {mode:<10} b={batch}: ⏭️ {stats.get('skipped') or stats.get('error')}")
+    return results
+
+
+def to_markdown(results, regressions=None):
+    regressions = regressions or {}
+    lines = [
+        '| Model | Threads | Mode | Batch | Create ms | p50 ms | p95 ms | img/s | Peak RSS MB | Δ p50 |',
+        '|---|---:|---|---:|---:|---:|---:|---:|---:|---|',
+    ]
+    for r in results:
+        if 'p50_ms' not in r:
+            continue
+        delta = regressions.get(config_key(r), '')
+        lines.append(
+            f"| {r['model']} | {r['threads']} | {r['mode']} | {r['batch']} | {r['create_ms']} "
+            f"| {r['p50_ms']} | {r['p95_ms']} | {r['throughput']} | {r['peak_rss_mb']} | {delta} |"
+        )
+    return '\n'.join(lines) + '\n'
+
+
+def compare(results, baseline, threshold=REGRESSION_THRESH):
+    """Return ({key: delta label}, [regressed keys]) against a baseline run."""
+    base = {config_key(r): r for r in baseline['results'] if 'p50_ms' in r}
+    deltas, regressed = {}, []
+    for r in results:
+        key = config_key(r)
+        if 'p50_ms' not in r or key not in base:
+            continue
+        old = base[key]['p50_ms']
+        change = (r['p50_ms'] - old) / old if old else 0.0
+        label = f"{change * 100:+.0f}%"
+        if change > threshold:
+            label += ' ⚠️'
+            regressed.append(key)
+        deltas[key] = label
+    return deltas, regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AniMatch — model latency benchmark')
+    parser.add_argument('--models', nargs='*', help='Model paths (default: all discovered artifacts)')
+    parser.add_argument('--threads', nargs='*', type=int, default=DEFAULT_THREADS)
+    parser.add_argument('--modes', nargs='*', choices=DEFAULT_MODES, default=DEFAULT_MODES)
+    parser.add_argument('--batch', nargs='*', type=int, default=DEFAULT_BATCHES)
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS)
+    parser.add_argument('--out', default=os.path.join(RESULTS_DIR, 'latest'),
+                        help='Output path prefix (.json and .md are appended)')
+    parser.add_argument('--compare', metavar='BASELINE', help='Baseline JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESH)
+    parser.add_argument('--save-baseline', action='store_true', help=f'Also write {BASELINE_PATH}')
+    args = parser.parse_args()
+
+    print("🎌 AniMatch — Model Latency Benchmark\n")
+    models = args.models or discover_artifacts()
+    if not models:
+        print("❌ No model artifacts found. Run export/quantize scripts first.")
+        sys.exit(1)
+
+    results = run_suite(models, args.threads, args.modes, args.batch, args.runs)
+    report = {
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'host': {'platform': platform.platform(), 'cpus': os.cpu_count()},
+        'runs': args.runs,
+        'results': results,
+    }
+
+    deltas, regressed = {}, []
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            deltas, regressed = compare(results, json.load(f), args.threshold)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out + '.json', 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    with open(args.out + '.md', 'w', encoding='utf-8') as f:
+        f.write(to_markdown(results, deltas))
+    if args.save_baseline:
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    print(f"\n{'='*50}")
+    print(to_markdown(results, deltas))
+    print(f"📁 {args.out}.json / .md")
+
+    if regressed:
+        print(f"⚠️ {len(regressed)} regression(s) over {args.threshold * 100:.0f}%:")
+        for key in regressed:
+            print(f"   - {key} ({deltas[key]})")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Catalog query layer: protagonist/heroine pairs with their anime, in one query.
+
+Every generator used to walk the protagonists and then issue a query per
+row for the heroine (or the anime genre). `load_catalog` runs a single
+self-join instead and builds the lookup dicts the generators need:
+
+    catalog = load_catalog(conn)
+    for pair in catalog.pairs:                 # one per protagonist
+        pair['protagonist'], pair['heroine'], pair['anime']
+    catalog.by_protagonist[pid]                # → pair
+    catalog.by_heroine[hid]                    # → pair
+    catalog.characters[cid]                    # → character row (either role)
+
+Column lists come from the live schema (PRAGMA table_info), so translation
+columns added by later migrations show up without touching this module.
+Rows are plain dicts; JSON array columns are left as stored (text).
+"""
+
+import sqlite3
+
+TABLE_ALIASES = (('p', 'characters'), ('h', 'characters'), ('a', 'animes'))
+
+
+def table_columns(conn, table):
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def catalog_sql(conn):
+    """The self-join, with every column aliased as <alias>__<column>."""
+    select = []
+    for alias, table in TABLE_ALIASES:
+        select += [f"{alias}.{col} AS {alias}__{col}" for col in table_columns(conn, table)]
+    return f"""
+        SELECT {', '.join(select)}
+        FROM characters p
+        JOIN animes a ON a.id = p.anime_id
+        LEFT JOIN characters h ON h.id = p.partner_id
+        WHERE p.role = 'protagonist'
+        ORDER BY p.id
+    """
+
+
+def row_layout(names):
+    """[(pair key, columns, start, stop)] for slicing rows of `catalog_sql`."""
+    keys = {'p': 'protagonist', 'h': 'heroine', 'a': 'anime'}
+    layout, start = [], 0
+    for i in range(1, len(names) + 1):
+        if i == len(names) or names[i].split('__', 1)[0] != names[start].split('__', 1)[0]:
+            alias = names[start].split('__', 1)[0]
+            cols = tuple(n.split('__', 1)[1] for n in names[start:i])
+            layout.append((keys[alias], cols, start, i))
+            start = i
+    return layout
+
+
+def split_row(row, layout):
+    pair = {key: dict(zip(cols, row[start:stop])) for key, cols, start, stop in layout}
+    if pair['heroine'].get('id') is None:
+        pair['heroine'] = None
+    return pair
+
+
+class Catalog:
+    def __init__(self, pairs):
+        self.pairs = pairs
+        self.by_protagonist = {p['protagonist']['id']: p for p in pairs}
+        self.by_heroine = {p['heroine']['id']: p for p in pairs if p['heroine']}
+        self.characters = {}
+        for p in pairs:
+            self.characters[p['protagonist']['id']] = p['protagonist']
+            if p['heroine']:
+                self.characters[p['heroine']['id']] = p['heroine']
+        self.animes = {p['anime']['id']: p['anime'] for p in pairs}
+
+    def __len__(self):
+        return len(self.pairs)
+
+
+def load_catalog(conn_or_path):
+    """Load every protagonist with its heroine and anime in one query."""
+    conn = sqlite3.connect(conn_or_path) if isinstance(conn_or_path, str) else conn_or_path
+    try:
+        cur = conn.execute(catalog_sql(conn))
+        layout = row_layout([d[0] for d in cur.description])
+        return Catalog([split_row(row, layout) for row in cur])
+    finally:
+        if conn is not conn_or_path:
+            conn.close()
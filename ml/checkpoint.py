@@ -0,0 +1,113 @@
+"""
+Append-only checkpoint journal for long-running embedding jobs.
+
+Each completed record is appended as one JSON line; the file is flushed and
+fsync'd every `fsync_every` records (and on close), so a crash loses at most
+that many records. A torn final line from a crash mid-write is ignored on
+replay.
+
+    journal = CheckpointJournal(path, resume=args.resume)
+    done = journal.replay()          # {key: value} from the previous run
+    for item in items:
+        if item.id in done: ...      # reuse
+        journal.record(item.id, value)
+    journal.complete()               # job finished: drop the journal
+"""
+
+import json
+import os
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CHECKPOINT_DIR = os.path.join(SCRIPT_DIR, 'checkpoints')
+DEFAULT_FSYNC_EVERY = 25
+
+
+def journal_path(job_name):
+    return os.path.join(CHECKPOINT_DIR, f"{job_name}.jsonl")
+
+
+class CheckpointJournal:
+    def __init__(self, path, resume=False, fsync_every=DEFAULT_FSYNC_EVERY, meta=None):
+        """Open the journal. Without `resume` any previous journal is discarded.
+
+        `meta` (e.g. model name) is written as the first line; a journal whose
+        meta differs from the current run is not replayed, since its records
+        would not match what this run produces.
+        """
+        self.path = path
+        self.fsync_every = max(1, fsync_every)
+        self.meta = meta or {}
+        self._pending = 0
+        self._replayed = {}
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        replayed = self._read() if resume and os.path.exists(path) else None
+        if replayed is not None:
+            self._replayed = replayed
+            self._f = open(path, 'a', encoding='utf-8')
+        else:
+            self._f = open(path, 'w', encoding='utf-8')
+            self._write({'meta': self.meta})
+            self.sync()
+
+    def _read(self):
+        records = {}
+        valid_bytes = 0
+        with open(self.path, 'rb') as f:
+            lines = f.readlines()
+        for i, line in enumerate(lines):
+            if not line.endswith(b'\n'):
+                break  # torn final write
+            try:
+                obj = json.loads(line)
+            except json.JSONDecodeError:
+                # Only the last line can be torn by a crash; anything else is corruption
+                if i == len(lines) - 1:
+                    break
+                raise
+            valid_bytes += len(line)
+            if 'meta' in obj:
+                if obj['meta'] != self.meta:
+                    print(f"  ⚠️ Checkpoint {self.path} was written with {obj['meta']}, not resuming")
+                    return None
+                continue
+            records[obj['key']] = obj['value']
+        # Drop a torn tail so new records start on a clean line
+        if valid_bytes < os.path.getsize(self.path):
+            os.truncate(self.path, valid_bytes)
+        return records
+
+    def _write(self, obj):
+        self._f.write(json.dumps(obj, ensure_ascii=False, separators=(',', ':')) + '\n')
+
+    def replay(self):
+        """Records from the previous run (empty unless resuming)."""
+        return dict(self._replayed)
+
+    def record(self, key, value):
+        self._write({'key': key, 'value': value})
+        self._pending += 1
+        if self._pending >= self.fsync_every:
+            self.sync()
+
+    def sync(self):
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        self._pending = 0
+
+    def close(self):
+        if not self._f.closed:
+            self.sync()
+            self._f.close()
+
+    def complete(self):
+        """The job's output has been written; the journal is no longer needed."""
+        self.close()
+        os.remove(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
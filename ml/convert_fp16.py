@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+AniMatch — FP16 Model Conversion
+Produces fp16 variants of the CLIP and ArcFace ONNX models: half the
+download of fp32 while staying more accurate than q4.
+
+Numerically sensitive ops stay in fp32 via a block list: LayerNorm,
+Softmax, and the final L2 normalization (every node between the last
+MatMul/Gemm and the graph output). Inputs/outputs stay float32 so the
+browser preprocessing code does not change.
+
+Reports size, CPU latency and retrieval agreement (top-1/top-3 against the
+catalog in embeddings.json) relative to fp32.
+
+Usage:
+  python ml/convert_fp16.py
+  python ml/convert_fp16.py --models clip
+  python ml/convert_fp16.py --probes 50
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+from model_eval import (
+    arcface_preprocess, clip_preprocess, cpu_latency_ms, embed,
+    load_catalog_matrix, load_probe_images, retrieval_agreement,
+)
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_DIR = os.path.join(SCRIPT_DIR, '..', 'public', 'models')
+
+MODELS = {
+    'clip': {
+        'input': os.path.join(MODEL_DIR, 'clip-image-encoder.onnx'),
+        'output': os.path.join(MODEL_DIR, 'clip-image-encoder-fp16.onnx'),
+        'preprocess': clip_preprocess,
+        'catalog_field': 'embedding',
+    },
+    'arcface': {
+        'input': os.path.join(SCRIPT_DIR, 'models', 'mobilefacenet.onnx'),
+        'output': os.path.join(MODEL_DIR, 'mobilefacenet-fp16.onnx'),
+        'preprocess': arcface_preprocess,
+        'catalog_field': 'arcface_embedding',
+    },
+}
+
+# Ops kept in fp32 wherever they appear
+FP32_OP_BLOCK_LIST = [
+    'LayerNormalization',
+    'SimplifiedLayerNormalization',
+    'SkipLayerNormalization',
+    'Softmax',
+    'ReduceMean',  # decomposed LayerNorm in older exports
+    'ReduceL2',
+    'Resize',
+]
+PROJECTION_OPS = ('MatMul', 'Gemm')
+
+
+def final_normalization_nodes(model):
+    """Names of nodes after the last projection on the way to the outputs.
+
+    In the CLIP export that is the `features / features.norm()` tail; in
+    ArcFace it is the trailing BatchNorm/Flatten. Keeping these in fp32
+    avoids precision loss right where embeddings get compared.
+    """
+    producers = {out: node for node in model.graph.node for out in node.output}
+    blocked = []
+    stack = [o.name for o in model.graph.output]
+    seen = set()
+    while stack:
+        tensor = stack.pop()
+        node = producers.get(tensor)
+        if node is None or tensor in seen or node.op_type in PROJECTION_OPS:
+            continue
+        seen.update(node.output)
+        if node.name:
+            blocked.append(node.name)
+        stack.extend(node.input)
+    return blocked
+
+
+def convert(input_path, output_path):
+    """Convert to fp16 (float32 I/O, sensitive ops blocked)."""
+    import onnx
+    from onnxruntime.transformers.float16 import convert_float_to_float16
+
+    model = onnx.load(input_path)
+    node_block_list = final_normalization_nodes(model)
+    fp16_model = convert_float_to_float16(
+        model,
+        keep_io_types=True,
+        op_block_list=FP32_OP_BLOCK_LIST,
+        node_block_list=node_block_list,
+    )
+    onnx.save(fp16_model, output_path)
+    return len(node_block_list)
+
+
+def report(name, spec, probes, catalog):
+    import onnxruntime as ort
+
+    providers = ['CPUExecutionProvider']
+    fp32 = ort.InferenceSession(spec['input'], providers=providers)
+    fp16 = ort.InferenceSession(spec['output'], providers=providers)
+
+    inputs = [spec['preprocess'](img) for img in probes]
+    if not inputs:
+        # No cached images: fall back to random inputs (latency/cosine only)
+        shape = [1 if isinstance(d, str) or not d else d for d in fp32.get_inputs()[0].shape]
+        inputs = [np.random.randn(*shape).astype(np.float32) for _ in range(8)]
+
+    in_mb = os.path.getsize(spec['input']) / (1024 * 1024)
+    out_mb = os.path.getsize(spec['output']) / (1024 * 1024)
+    lat32 = cpu_latency_ms(fp32, inputs[0])
+    lat16 = cpu_latency_ms(fp16, inputs[0])
+
+    ref = embed(fp32, inputs)
+    test = embed(fp16, inputs)
+    agree = retrieval_agreement(ref, test, catalog) if len(catalog) and probes else None
+
+    print(f"  📊 Size: {in_mb:.1f} MB → {out_mb:.1f} MB ({(1 - out_mb / in_mb) * 100:.0f}% reduction)")
+    print(f"  📊 CPU latency: {lat32:.1f} ms → {lat16:.1f} ms")
+    print(f"  📊 Cosine (fp32 vs fp16): {np.mean(np.sum(ref * test, axis=1)):.6f}")
+    if agree:
+        print(f"  📊 Retrieval agreement over {len(inputs)} probes: "
+              f"top-1 {agree['top1'] * 100:.1f}%, top-3 {agree['top3'] * 100:.1f}%")
+    else:
+        print("  ⚠️ No probe images/catalog vectors — retrieval agreement skipped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AniMatch — FP16 model conversion')
+    parser.add_argument('--models', nargs='*', choices=list(MODELS), default=list(MODELS))
+    parser.add_argument('--probes', type=int, default=100, help='Max probe images for agreement check')
+    args = parser.parse_args()
+
+    print("🎌 AniMatch — FP16 Model Conversion")
+    print(f"  fp32 ops: {', '.join(FP32_OP_BLOCK_LIST)} + final normalization\n")
+
+    probes = load_probe_images(args.probes)
+    print(f"📋 Probe images: {len(probes)}\n")
+
+    converted = 0
+    for name in args.models:
+        spec = MODELS[name]
+        print(f"📦 {name}: {os.path.basename(spec['input'])}")
+        if not os.path.exists(spec['input']):
+            print("  ❌ Source model not found — run the export script first")
+            continue
+
+        n_tail = convert(spec['input'], spec['output'])
+        print(f"  ✅ Saved {os.path.basename(spec['output'])} ({n_tail} tail nodes kept fp32)")
+        report(name, spec, probes, load_catalog_matrix(spec['catalog_field']))
+        converted += 1
+        print()
+
+    if not converted:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+AniMatch — D1 Diff Migration
+Compares db/animatch.db with what is deployed to D1 and writes only the
+statements needed to bring D1 up to date, instead of re-applying the
+whole seed.
+
+What is deployed is tracked as per-row content hashes in
+db/d1_snapshot.json (committed with the repo). A row whose hash is new or
+different is upserted, and a row missing from the local DB is deleted:
+
+  INSERT INTO t (...) VALUES (...), (...) ON CONFLICT(id) DO UPDATE SET ...
+  DELETE FROM t WHERE id IN (...)
+
+Statements are chunked like the seed (sync_seed.py): row and byte limits
+per statement, and characters linked by partner_id share a statement.
+The order is anime upserts, character upserts, character deletes, anime
+deletes, so foreign keys hold after every statement. Adding 5 characters
+costs 5 row writes.
+
+A changed column list (after a migration) changes every hash, so the
+next diff rewrites every row once.
+
+Usage:
+  python d1_diff.py                         # → db/d1_diff.sql
+  wrangler d1 execute animatch-db --remote --file db/d1_diff.sql
+  python d1_diff.py --mark-deployed         # record the local DB as deployed
+
+  # Bootstrap/verify against the real thing instead of the manifest:
+  wrangler d1 export animatch-db --remote --output /tmp/d1.sql
+  python d1_diff.py --snapshot /tmp/d1.sql
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime, timezone
+
+from sync_seed import (DEFAULT_MAX_ROWS, D1_MAX_STATEMENT_BYTES, InsertWriter, add_characters,
+                       render, seed_columns, write_partner_updates)
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(SCRIPT_DIR, '..', 'db', 'animatch.db')
+SNAPSHOT_PATH = os.path.join(SCRIPT_DIR, '..', 'db', 'd1_snapshot.json')
+DIFF_PATH = os.path.join(SCRIPT_DIR, '..', 'db', 'd1_diff.sql')
+TABLES = ('animes', 'characters')  # parents first
+MAX_DELETE_IDS = 500
+
+
+def row_hash(rendered):
+    return hashlib.sha256(rendered.encode()).hexdigest()[:16]
+
+
+def local_rows(conn, table, columns):
+    """{id: (row, rendered VALUES tuple)} for a table, over `columns`."""
+    rows = {}
+    for row in conn.execute(f"SELECT {', '.join(columns)} FROM {table} ORDER BY id"):
+        rows[row[0]] = (row, render(row))
+    return rows
+
+
+def load_manifest(path=SNAPSHOT_PATH):
+    """{table: {id: hash}} from the committed manifest (empty when none yet)."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return {table: {} for table in TABLES}
+    return {table: {int(k): v for k, v in manifest['tables'].get(table, {}).get('rows', {}).items()}
+            for table in TABLES}
+
+
+def export_hashes(path, columns):
+    """{table: {id: hash}} from a `wrangler d1 export` SQL dump, hashed over the local columns."""
+    conn = sqlite3.connect(':memory:')
+    with open(path, encoding='utf-8') as f:
+        conn.executescript(f.read())
+    try:
+        hashes = {}
+        for table in TABLES:
+            deployed = {r[1] for r in conn.execute(f"PRAGMA table_info({table})")}
+            select = ', '.join(c if c in deployed else 'NULL' for c in columns[table])
+            hashes[table] = {row[0]: row_hash(render(row))
+                             for row in conn.execute(f"SELECT {select} FROM {table}")}
+        return hashes
+    finally:
+        conn.close()
+
+
+def save_manifest(columns, rows, path=SNAPSHOT_PATH):
+    manifest = {
+        'deployed_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'tables': {
+            table: {'columns': columns[table],
+                    'rows': {str(i): row_hash(rendered) for i, (_, rendered) in rows[table].items()}}
+            for table in TABLES
+        },
+    }
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+        f.write('\n')
+    os.replace(tmp, path)
+
+
+def diff(rows, deployed):
+    """{table: (upsert ids, delete ids)}"""
+    result = {}
+    for table in TABLES:
+        local, remote = rows[table], deployed[table]
+        upserts = [i for i, (_, rendered) in local.items() if remote.get(i) != row_hash(rendered)]
+        deletes = sorted(set(remote) - set(local))
+        result[table] = (upserts, deletes)
+    return result
+
+
+def upsert_tail(columns):
+    sets = ', '.join(f"{c} = excluded.{c}" for c in columns if c != 'id')
+    return f"\nON CONFLICT(id) DO UPDATE SET {sets}"
+
+
+def write_diff(path, columns, rows, changes, max_rows=DEFAULT_MAX_ROWS, max_bytes=D1_MAX_STATEMENT_BYTES):
+    """Write the migration; returns the number of statements."""
+    statements = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("-- AniMatch D1 diff (generated by ml/d1_diff.py; apply once, then --mark-deployed)\n")
+        for table in TABLES:
+            upserts, deletes = changes[table]
+            f.write(f"-- {table}: {len(upserts)} upserts, {len(deletes)} deletes\n")
+
+        for table in TABLES:
+            upserts, _ = changes[table]
+            if not upserts:
+                continue
+            f.write(f"\n-- === UPSERT {table.upper()} ===\n")
+            writer = InsertWriter(f, table, columns[table], max_rows, max_bytes, tail=upsert_tail(columns[table]))
+            selected = [rows[table][i][0] for i in upserts]
+            if table == 'characters':
+                partner_idx = columns[table].index('partner_id')
+                links = [(r[0], r[partner_idx]) for r in selected]
+                deferred = add_characters(writer, selected, partner_idx, links, set(rows[table]))
+                write_partner_updates(f, deferred)
+                statements += len(deferred)
+            else:
+                for row in selected:
+                    writer.add([render(row)])
+                writer.flush()
+            statements += writer.statements
+
+        for table in reversed(TABLES):
+            _, deletes = changes[table]
+            if not deletes:
+                continue
+            f.write(f"\n-- === DELETE {table.upper()} ===\n")
+            for start in range(0, len(deletes), MAX_DELETE_IDS):
+                ids = ', '.join(map(str, deletes[start:start + MAX_DELETE_IDS]))
+                f.write(f"DELETE FROM {table} WHERE id IN ({ids});\n")
+                statements += 1
+    return statements
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AniMatch — minimal D1 migration from row hashes')
+    parser.add_argument('--snapshot', type=str, default=None,
+                        help='Diff against a `wrangler d1 export` SQL dump instead of db/d1_snapshot.json')
+    parser.add_argument('--output', type=str, default=DIFF_PATH, help='Migration SQL path')
+    parser.add_argument('--mark-deployed', action='store_true',
+                        help='Record the local DB as deployed (run after applying the diff)')
+    parser.add_argument('--max-rows', type=int, default=DEFAULT_MAX_ROWS, help='Rows per statement')
+    parser.add_argument('--max-bytes', type=int, default=D1_MAX_STATEMENT_BYTES, help='Bytes per statement')
+    args = parser.parse_args()
+
+    print("🎌 AniMatch — D1 Diff")
+    if not os.path.exists(DB_PATH):
+        print(f"❌ Database not found at {DB_PATH}")
+        return
+
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        columns = {table: seed_columns(conn, table) for table in TABLES}
+        rows = {table: local_rows(conn, table, columns[table]) for table in TABLES}
+    finally:
+        conn.close()
+
+    if args.mark_deployed:
+        save_manifest(columns, rows)
+        print(f"  ✅ Recorded {', '.join(f'{len(rows[t])} {t}' for t in TABLES)} as deployed → {SNAPSHOT_PATH}")
+        return
+
+    if args.snapshot:
+        deployed = export_hashes(args.snapshot, columns)
+    else:
+        deployed = load_manifest()
+        if not any(deployed.values()):
+            print(f"  ⚠️ No {SNAPSHOT_PATH} yet — diffing against an empty D1 "
+                  f"(use --snapshot with a D1 export, or --mark-deployed if D1 already matches)")
+
+    changes = diff(rows, deployed)
+    writes = sum(len(u) + len(d) for u, d in changes.values())
+    for table in TABLES:
+        upserts, deletes = changes[table]
+        print(f"  {table:<11} {len(upserts):>5} upserts  {len(deletes):>5} deletes  "
+              f"({len(rows[table])} local, {len(deployed[table])} deployed)")
+    if not writes:
+        print("  ✅ D1 is up to date — nothing to apply")
+        return
+
+    statements = write_diff(args.output, columns, rows, changes, args.max_rows, args.max_bytes)
+    print(f"  📁 {writes} row writes in {statements} statements → {args.output}")
+    print("  Next: wrangler d1 execute animatch-db --remote --file <that file>, then --mark-deployed")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+"""
+Transactional bulk writer for anime/protagonist/heroine rows.
+
+The old path ran three INSERTs and an UPDATE, then committed, per
+character: one fsync each, and a failure halfway left partial rows behind.
+This writer:
+
+- switches the DB to WAL (synchronous=NORMAL) so a commit is one WAL append
+- allocates IDs up front inside `BEGIN IMMEDIATE`, so every row (and both
+  directions of the partner link) is known before anything is written
+- inserts each table with a single `executemany` and resolves protagonist
+  `partner_id`s with one bulk UPDATE
+- if the bulk path hits a constraint error, falls back to one SAVEPOINT per
+  character so only the offending characters are dropped
+- rolls the whole batch back if anything else goes wrong
+
+    writer = BulkCharacterWriter(conn)
+    with writer.transaction():
+        results = writer.insert_batch(characters)
+        ...                      # raise here to roll everything back
+"""
+
+import json
+import sqlite3
+from contextlib import contextmanager
+
+DEFAULT_HEROINE_COLOR = 'linear-gradient(135deg, #667eea, #764ba2)'
+DEFAULT_HEROINE_EMOJI = '💫'
+REQUIRED_FIELDS = ('title_ko', 'orientation', 'protagonist_ko', 'heroine_ko')
+
+ANIME_SQL = """
+    INSERT INTO animes (id, title_ko, title_en, genre, orientation, tier)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+PROTAGONIST_SQL = """
+    INSERT INTO characters (id, anime_id, name_ko, name_en, role, gender, image_url)
+    VALUES (?, ?, ?, ?, 'protagonist', ?, ?)
+"""
+HEROINE_SQL = """
+    INSERT INTO characters (id, anime_id, name_ko, name_en, role, gender, image_url,
+                            emoji, color_primary, tags, personality,
+                            charm_points, iconic_quote, partner_id)
+    VALUES (?, ?, ?, ?, 'heroine', ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+PARTNER_SQL = "UPDATE characters SET partner_id = ? WHERE id = ?"
+
+
+def anime_row(anime_id, c):
+    return (
+        anime_id,
+        c['title_ko'],
+        c.get('title_en'),
+        json.dumps(c.get('genre', []), ensure_ascii=False),
+        c['orientation'],
+        c.get('tier', 2),
+    )
+
+
+def protagonist_row(protagonist_id, anime_id, c):
+    return (
+        protagonist_id,
+        anime_id,
+        c['protagonist_ko'],
+        c.get('protagonist_en'),
+        c.get('protagonist_gender', 'male'),
+        c.get('protagonist_image'),
+    )
+
+
+def heroine_row(heroine_id, anime_id, protagonist_id, c):
+    return (
+        heroine_id,
+        anime_id,
+        c['heroine_ko'],
+        c.get('heroine_en'),
+        c.get('heroine_gender', 'female'),
+        c.get('heroine_image'),
+        c.get('heroine_emoji', DEFAULT_HEROINE_EMOJI),
+        c.get('heroine_color', DEFAULT_HEROINE_COLOR),
+        json.dumps(c.get('heroine_tags', []), ensure_ascii=False),
+        json.dumps(c.get('heroine_personality', []), ensure_ascii=False),
+        c.get('heroine_charm', ''),
+        c.get('heroine_quote', ''),
+        protagonist_id,
+    )
+
+
+def validate(c):
+    """Error string for a character dict, or None when it can be inserted."""
+    missing = [f for f in REQUIRED_FIELDS if not c.get(f)]
+    if missing:
+        return f"missing {', '.join(missing)}"
+    if c['orientation'] not in ('male', 'female'):
+        return f"invalid orientation {c['orientation']!r}"
+    if c.get('tier', 2) not in (1, 2, 3):
+        return f"invalid tier {c.get('tier')!r}"
+    return None
+
+
+class BulkCharacterWriter:
+    def __init__(self, conn, wal=True):
+        self.conn = conn
+        if wal:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+
+    def next_ids(self, count):
+        """[(anime_id, protagonist_id, heroine_id), ...] for the next `count` characters."""
+        max_anime = self.conn.execute("SELECT MAX(id) FROM animes").fetchone()[0] or 0
+        max_char = self.conn.execute("SELECT MAX(id) FROM characters").fetchone()[0] or 0
+        return [(max_anime + i + 1, max_char + 2 * i + 1, max_char + 2 * i + 2) for i in range(count)]
+
+    @contextmanager
+    def transaction(self):
+        """BEGIN IMMEDIATE … COMMIT, or ROLLBACK if the block raises."""
+        saved = self.conn.isolation_level
+        self.conn.isolation_level = None  # manual transaction control
+        try:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+        finally:
+            self.conn.isolation_level = saved
+
+    def insert_batch(self, characters):
+        """Insert characters inside the current transaction.
+
+        Returns one dict per input: {'ids': (anime_id, protagonist_id,
+        heroine_id)} on success or {'error': str} when that character was
+        rejected (the rest of the batch is still inserted).
+        """
+        results = [{'error': validate(c)} for c in characters]
+        valid = [i for i, r in enumerate(results) if not r['error']]
+        for i, ids in zip(valid, self.next_ids(len(valid))):
+            results[i] = {'ids': ids}
+
+        batch = [(characters[i], results[i]['ids']) for i in valid]
+        self.conn.execute("SAVEPOINT bulk")
+        try:
+            self._insert_rows(batch)
+            self.conn.execute("RELEASE bulk")
+        except sqlite3.IntegrityError:
+            self.conn.execute("ROLLBACK TO bulk")
+            self.conn.execute("RELEASE bulk")
+            self._insert_each(batch, [results[i] for i in valid])
+        return results
+
+    def _insert_rows(self, batch):
+        cur = self.conn.cursor()
+        cur.executemany(ANIME_SQL, [anime_row(a, c) for c, (a, _, _) in batch])
+        cur.executemany(PROTAGONIST_SQL, [protagonist_row(p, a, c) for c, (a, p, _) in batch])
+        cur.executemany(HEROINE_SQL, [heroine_row(h, a, p, c) for c, (a, p, h) in batch])
+        cur.executemany(PARTNER_SQL, [(h, p) for _, (_, p, h) in batch])
+
+    def _insert_each(self, batch, results):
+        """Slow path: one savepoint per character to isolate failures."""
+        for (c, ids), result in zip(batch, results):
+            self.conn.execute("SAVEPOINT one")
+            try:
+                self._insert_rows([(c, ids)])
+                self.conn.execute("RELEASE one")
+            except sqlite3.IntegrityError as e:
+                self.conn.execute("ROLLBACK TO one")
+                self.conn.execute("RELEASE one")
+                result.pop('ids', None)
+                result['error'] = str(e)
@@ -9,9 +9,12 @@ Usage:
     python ml/export_arcface_onnx.py
 """
 
+import argparse
 import os
 import numpy as np
 
+from instrument import add_instrument_args, instrumented, timer
+
 
 def download_mobilefacenet():
     """Download MobileFaceNet from insightface buffalo_sc release."""
@@ -92,6 +95,12 @@ def verify_model(model_path: str):
 
 
 if __name__ == '__main__':
-    model_path = download_mobilefacenet()
-    verify_model(model_path)
-    print("\n✅ MobileFaceNet ONNX export complete!")
+    parser = argparse.ArgumentParser(description='Export MobileFaceNet (ArcFace) to ONNX')
+    add_instrument_args(parser)
+    args = parser.parse_args()
+    with instrumented('export_arcface_onnx', args):
+        with timer('download'):
+            model_path = download_mobilefacenet()
+        with timer('verify'):
+            verify_model(model_path)
+        print("\n✅ MobileFaceNet ONNX export complete!")
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+AniMatch — Reduced-Resolution CLIP ("lite" tier) Export & Evaluation
+ViT-B-32 at 224×224 processes 7×7 = 49 patches. Exporting the same weights
+at 160 (5×5 = 25 patches) or 192 (6×6 = 36 patches) with bicubically
+interpolated positional embeddings roughly halves the transformer work,
+which dominates time-to-result on low-end phones.
+
+For each resolution this script:
+  1. Exports public/models/clip-image-encoder-<res>.onnx
+  2. Re-embeds the catalog at that resolution from the cached protagonist
+     images (ml/images/protagonists/, see generate_dual_embeddings.py) and
+     writes public/embeddings-lite-<res>.json
+  3. Reports top-1/top-3 agreement with the 224 pipeline and CPU latency
+
+Queries for the agreement check are augmented (flipped, cropped) copies of
+the catalog images, so they are close to, but not identical with, the
+catalog entries — like a user photo would be.
+
+Usage:
+  python ml/export_clip_lite.py
+  python ml/export_clip_lite.py --resolutions 160
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+
+from instrument import add_instrument_args, instrumented, timer
+from model_eval import (
+    EMBEDDINGS_PATH, PROBE_IMAGE_DIR, clip_preprocess, cpu_latency_ms, embed,
+    l2_normalize, retrieval_agreement,
+)
+
+MODEL_NAME = 'ViT-B-32'
+PRETRAINED = 'openai'
+PATCH_SIZE = 32
+BASE_RESOLUTION = 224
+DEFAULT_RESOLUTIONS = [160, 192]
+EMBEDDING_PRECISION = 6
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_DIR = os.path.join(SCRIPT_DIR, '..', 'public', 'models')
+REFERENCE_ONNX = os.path.join(OUTPUT_DIR, 'clip-image-encoder.onnx')
+
+
+def resize_positional_embedding(pos_embed, new_grid):
+    """Interpolate [1 + g*g, D] positional embeddings to a new grid size."""
+    import torch
+    import torch.nn.functional as F
+
+    cls_tok, grid = pos_embed[:1], pos_embed[1:]
+    old_grid = int(round(grid.shape[0] ** 0.5))
+    dim = grid.shape[1]
+    grid = grid.reshape(1, old_grid, old_grid, dim).permute(0, 3, 1, 2)
+    grid = F.interpolate(grid, size=(new_grid, new_grid), mode='bicubic', align_corners=False)
+    grid = grid.permute(0, 2, 3, 1).reshape(new_grid * new_grid, dim)
+    return torch.cat([cls_tok, grid], dim=0)
+
+
+def export_lite(resolution, out_path):
+    """Export the CLIP image encoder at `resolution` to ONNX."""
+    import torch
+    import open_clip
+    from export_clip_onnx import CLIPImageEncoder
+
+    if resolution % PATCH_SIZE:
+        raise ValueError(f"Resolution must be a multiple of {PATCH_SIZE}: {resolution}")
+
+    model, _, _ = open_clip.create_model_and_transforms(MODEL_NAME, pretrained=PRETRAINED, device='cpu')
+    model.eval()
+    encoder = CLIPImageEncoder(model)
+    visual = encoder.visual
+
+    new_grid = resolution // PATCH_SIZE
+    with torch.no_grad():
+        visual.positional_embedding = torch.nn.Parameter(
+            resize_positional_embedding(visual.positional_embedding.data, new_grid)
+        )
+    visual.image_size = (resolution, resolution)
+    visual.grid_size = (new_grid, new_grid)
+    encoder.eval()
+
+    dummy = torch.randn(1, 3, resolution, resolution)
+    torch.onnx.export(
+        encoder,
+        dummy,
+        out_path,
+        export_params=True,
+        opset_version=18,
+        do_constant_folding=True,
+        input_names=['image'],
+        output_names=['embedding'],
+        dynamo=False,
+    )
+    return out_path
+
+
+def cached_catalog_images():
+    """(characters, images) for catalog entries with a cached protagonist image."""
+    from PIL import Image
+
+    with open(EMBEDDINGS_PATH, encoding='utf-8') as f:
+        data = json.load(f)
+
+    chars, images = [], []
+    for char in data['characters']:
+        matches = glob.glob(os.path.join(PROBE_IMAGE_DIR, f"{char['protagonist_id']}.*"))
+        if not matches:
+            continue
+        try:
+            images.append(Image.open(matches[0]).convert('RGB'))
+            chars.append(char)
+        except Exception as e:
+            print(f"  ⚠️ Skipping ID:{char['protagonist_id']}: {e}")
+    return data, chars, images
+
+
+def augment(img):
+    """Flip + 90% center crop: a near-duplicate query for the same character."""
+    from PIL import ImageOps
+    w, h = img.size
+    dx, dy = int(w * 0.05), int(h * 0.05)
+    return ImageOps.mirror(img).crop((dx, dy, w - dx, h - dy))
+
+
+def write_lite_catalog(data, chars, vectors, resolution):
+    out = dict(data)
+    out['input_size'] = resolution
+    out['characters'] = [
+        {**c, 'embedding': [round(float(x), EMBEDDING_PRECISION) for x in v]}
+        for c, v in zip(chars, vectors)
+    ]
+    out['count'] = len(out['characters'])
+    path = os.path.join(os.path.dirname(EMBEDDINGS_PATH), f"embeddings-lite-{resolution}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(out, ensure_ascii=False, separators=(',', ':')))
+    return path
+
+
+def run(args):
+    import onnxruntime as ort
+
+    print("🎌 AniMatch — CLIP Lite Export")
+    print(f"  Model: {MODEL_NAME} ({PRETRAINED}), resolutions: {args.resolutions}\n")
+
+    if not os.path.exists(REFERENCE_ONNX):
+        print("❌ Reference model not found. Run export_clip_onnx.py first.")
+        sys.exit(1)
+
+    with timer('load_images'):
+        data, chars, images = cached_catalog_images()
+    if not chars:
+        print(f"❌ No cached catalog images in {PROBE_IMAGE_DIR}. Run generate_dual_embeddings.py first.")
+        sys.exit(1)
+    print(f"📋 Catalog entries with cached images: {len(chars)}/{data['count']}\n")
+
+    providers = ['CPUExecutionProvider']
+    ref_session = ort.InferenceSession(REFERENCE_ONNX, providers=providers)
+    queries = [augment(img) for img in images]
+    ref_catalog = l2_normalize([c['embedding'] for c in chars])
+    with timer('inference'):
+        ref_queries = embed(ref_session, [clip_preprocess(q, BASE_RESOLUTION) for q in queries])
+    ref_latency = cpu_latency_ms(ref_session, clip_preprocess(images[0], BASE_RESOLUTION))
+
+    rows = [(BASE_RESOLUTION, (BASE_RESOLUTION // PATCH_SIZE) ** 2, ref_latency, 1.0, 1.0,
+             os.path.getsize(REFERENCE_ONNX))]
+
+    for res in args.resolutions:
+        out_path = os.path.join(OUTPUT_DIR, f"clip-image-encoder-{res}.onnx")
+        print(f"📤 Exporting {res}×{res} → {os.path.basename(out_path)}")
+        with timer('export'):
+            export_lite(res, out_path)
+
+        session = ort.InferenceSession(out_path, providers=providers)
+        with timer('inference'):
+            lite_catalog = embed(session, [clip_preprocess(img, res) for img in images])
+            lite_queries = embed(session, [clip_preprocess(q, res) for q in queries])
+        with timer('write'):
+            catalog_path = write_lite_catalog(data, chars, lite_catalog, res)
+        print(f"  ✅ Catalog re-embedded: {os.path.basename(catalog_path)}")
+
+        agree = retrieval_agreement(ref_queries, lite_queries, ref_catalog, test_catalog=lite_catalog)
+        latency = cpu_latency_ms(session, clip_preprocess(images[0], res))
+        rows.append((res, (res // PATCH_SIZE) ** 2, latency, agree['top1'], agree['top3'],
+                     os.path.getsize(out_path)))
+
+    print(f"\n{'='*50}")
+    print(f"{'Input':>7} {'Patches':>8} {'CPU ms':>8} {'Top-1':>7} {'Top-3':>7} {'Size MB':>8}")
+    for res, patches, lat, top1, top3, size in rows:
+        print(f"{res:>7} {patches:>8} {lat:>8.1f} {top1 * 100:>6.1f}% {top3 * 100:>6.1f}% "
+              f"{size / (1024 * 1024):>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AniMatch — reduced-resolution CLIP export')
+    parser.add_argument('--resolutions', nargs='*', type=int, default=DEFAULT_RESOLUTIONS)
+    add_instrument_args(parser)
+    args = parser.parse_args()
+    with instrumented('export_clip_lite', args):
+        run(args)
+
+
+if __name__ == '__main__':
+    main()
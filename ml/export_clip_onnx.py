@@ -8,11 +8,14 @@ Usage:
   python export_clip_onnx.py
 """
 
+import argparse
 import os
 import torch
 import numpy as np
 import open_clip
 
+from instrument import add_instrument_args, instrumented, timer
+
 MODEL_NAME = 'ViT-B-32'
 PRETRAINED = 'openai'
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), '..', 'public', 'models')
@@ -30,17 +33,18 @@ class CLIPImageEncoder(torch.nn.Module):
         features = features / features.norm(dim=-1, keepdim=True)
         return features
 
-def main():
+def export():
     print("🎌 AniMatch — CLIP ONNX Export")
     print(f"  Model: {MODEL_NAME} ({PRETRAINED})")
     print()
 
     # Load model
     print("📦 Loading CLIP model...")
-    model, _, preprocess = open_clip.create_model_and_transforms(
-        MODEL_NAME, pretrained=PRETRAINED, device='cpu'
-    )
-    model.eval()
+    with timer('load_model'):
+        model, _, preprocess = open_clip.create_model_and_transforms(
+            MODEL_NAME, pretrained=PRETRAINED, device='cpu'
+        )
+        model.eval()
     print("  ✅ Model loaded")
 
     # Wrap image encoder
@@ -54,39 +58,43 @@ def main():
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     print(f"\n📤 Exporting to ONNX: {ONNX_PATH}")
     
-    torch.onnx.export(
-        encoder,
-        dummy_input,
-        ONNX_PATH,
-        export_params=True,
-        opset_version=18,
-        do_constant_folding=True,
-        input_names=['image'],
-        output_names=['embedding'],
-        dynamo=False,
-    )
+    with timer('export'):
+        torch.onnx.export(
+            encoder,
+            dummy_input,
+            ONNX_PATH,
+            export_params=True,
+            opset_version=18,
+            do_constant_folding=True,
+            input_names=['image'],
+            output_names=['embedding'],
+            dynamo=False,
+        )
 
     # Verify
     import onnx
-    onnx_model = onnx.load(ONNX_PATH)
-    onnx.checker.check_model(onnx_model)
+    with timer('check'):
+        onnx_model = onnx.load(ONNX_PATH)
+        onnx.checker.check_model(onnx_model)
     
     file_size = os.path.getsize(ONNX_PATH) / (1024 * 1024)
     print(f"  ✅ ONNX model exported ({file_size:.1f} MB)")
 
     # Verify with ONNX Runtime
     import onnxruntime as ort
-    session = ort.InferenceSession(ONNX_PATH)
-    input_name = session.get_inputs()[0].name
-    result = session.run(None, {input_name: dummy_input.numpy()})
+    with timer('verify'):
+        session = ort.InferenceSession(ONNX_PATH)
+        input_name = session.get_inputs()[0].name
+        result = session.run(None, {input_name: dummy_input.numpy()})
     
     print(f"  ✅ ONNX Runtime verification passed")
     print(f"  📊 Output shape: {result[0].shape}")
     print(f"  📊 Embedding dim: {result[0].shape[1]}")
 
     # Compare with PyTorch output
-    with torch.no_grad():
-        torch_output = encoder(dummy_input).numpy()
+    with timer('compare'):
+        with torch.no_grad():
+            torch_output = encoder(dummy_input).numpy()
     
     diff = np.abs(torch_output - result[0]).max()
     print(f"  📊 Max diff (PyTorch vs ONNX): {diff:.6f}")
@@ -109,5 +117,12 @@ def main():
     print(f"📁 Model: {ONNX_PATH} ({file_size:.1f} MB)")
     print(f"📁 Config: {config_path}")
 
+def main():
+    parser = argparse.ArgumentParser(description='AniMatch — CLIP ONNX export')
+    add_instrument_args(parser)
+    args = parser.parse_args()
+    with instrumented('export_clip_onnx', args):
+        export()
+
 if __name__ == '__main__':
     main()
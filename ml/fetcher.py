@@ -0,0 +1,233 @@
+"""
+Shared HTTP fetcher for the ml/ pipeline scripts.
+
+- One pooled `requests.Session` (keep-alive, connection reuse)
+- Bounded concurrency via a thread pool with a sliding in-flight window
+- Per-host token-bucket rate limiting (AniList CDN / API limits)
+- Retries on connection errors, 429 and 5xx with jittered exponential
+  backoff (Retry-After is honoured)
+- Per-request metrics (status, bytes, attempts, latency)
+
+    fetcher = get_fetcher()
+    img = fetcher.get_image(url)                       # single PIL image or None
+    for url, body, err in fetcher.fetch_many(urls):    # ordered, pipelined
+        ...
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from urllib.parse import urlsplit
+
+from instrument import count, timer
+
+USER_AGENT = 'AniMatch/1.0 (Character Embedding Generator)'
+DEFAULT_TIMEOUT = 10
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5     # seconds; attempt n sleeps up to BACKOFF * 2**n
+MAX_BACKOFF = 30.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# host → (requests per second, burst). Hosts not listed use DEFAULT_HOST_RATE.
+HOST_RATE_LIMITS = {
+    's4.anilist.co': (10.0, 10),
+    'img.anili.st': (10.0, 10),
+    'graphql.anilist.co': (1.5, 1),   # 90 req/min
+}
+DEFAULT_HOST_RATE = (5.0, 5)
+
+
+class FetchError(Exception):
+    pass
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens/s, up to `burst` banked."""
+
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.capacity = float(max(1, burst))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class Fetcher:
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, retries=DEFAULT_RETRIES,
+                 backoff=DEFAULT_BACKOFF, timeout=DEFAULT_TIMEOUT,
+                 host_rates=None, default_rate=DEFAULT_HOST_RATE, user_agent=USER_AGENT):
+        """`default_rate=None` disables rate limiting for unlisted hosts."""
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.host_rates = dict(HOST_RATE_LIMITS if host_rates is None else host_rates)
+        self.default_rate = default_rate
+
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = user_agent
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=max_workers, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._buckets = {}
+        self._buckets_lock = threading.Lock()
+        self.metrics = []
+        self._metrics_lock = threading.Lock()
+
+    def _bucket(self, host):
+        with self._buckets_lock:
+            if host not in self._buckets:
+                rate = self.host_rates.get(host, self.default_rate)
+                self._buckets[host] = TokenBucket(*rate) if rate else None
+            return self._buckets[host]
+
+    def _sleep_backoff(self, attempt, retry_after=None):
+        if retry_after is not None:
+            delay = retry_after
+        else:
+            # Full jitter: spreads retries from concurrent workers apart
+            delay = random.uniform(0, min(MAX_BACKOFF, self.backoff * (2 ** attempt)))
+        time.sleep(delay)
+
+    def request(self, method, url, allow_status=(), **kwargs):
+        """Issue a request with rate limiting and retries. Returns a Response.
+
+        Error statuses listed in `allow_status` are returned instead of raised
+        (e.g. GraphQL APIs that answer partial results with 404).
+        """
+        import requests
+
+        host = urlsplit(url).hostname or ''
+        bucket = self._bucket(host)
+        kwargs.setdefault('timeout', self.timeout)
+        start = time.perf_counter()
+        metric = {'url': url, 'host': host, 'status': None, 'bytes': 0, 'attempts': 0, 'error': None}
+
+        try:
+            for attempt in range(self.retries + 1):
+                metric['attempts'] = attempt + 1
+                if bucket:
+                    bucket.acquire()
+                try:
+                    resp = self.session.request(method, url, **kwargs)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    metric['error'] = str(e)
+                    if attempt == self.retries:
+                        raise FetchError(f"{url}: {e}") from e
+                    self._sleep_backoff(attempt)
+                    continue
+
+                metric['status'] = resp.status_code
+                if resp.status_code in RETRY_STATUSES and attempt < self.retries:
+                    retry_after = resp.headers.get('Retry-After')
+                    retry_after = float(retry_after) if retry_after and retry_after.isdigit() else None
+                    self._sleep_backoff(attempt, retry_after)
+                    continue
+                if resp.status_code >= 400 and resp.status_code not in allow_status:
+                    metric['error'] = f"HTTP {resp.status_code}"
+                    raise FetchError(f"{url}: HTTP {resp.status_code}")
+
+                metric['bytes'] = len(resp.content)
+                metric['error'] = None
+                return resp
+        finally:
+            metric['ms'] = round((time.perf_counter() - start) * 1000, 1)
+            with self._metrics_lock:
+                self.metrics.append(metric)
+
+    def get(self, url, **kwargs):
+        """GET `url` and return the body bytes (raises FetchError)."""
+        with timer('download'):
+            body = self.request('GET', url, **kwargs).content
+        count('downloaded_bytes', len(body))
+        return body
+
+    def get_image(self, url, **kwargs):
+        """Download an image as RGB PIL Image, or None on failure."""
+        from PIL import Image
+        try:
+            body = self.get(url, **kwargs)
+            with timer('decode'):
+                return Image.open(BytesIO(body)).convert('RGB')
+        except Exception as e:
+            print(f"  ⚠️ Failed to load image: {e}")
+            return None
+
+    def fetch_many(self, urls, fn=None):
+        """Fetch `urls` concurrently, yielding (url, result, error) in input order.
+
+        `fn(url)` defaults to `self.get`. At most 2 × max_workers requests are
+        in flight or buffered, so consumers that process results slowly (e.g.
+        model inference) overlap with downloads without unbounded memory.
+        """
+        fn = fn or self.get
+        urls = iter(urls)
+        window = self.max_workers * 2
+
+        def call(url):
+            try:
+                return url, fn(url), None
+            except Exception as e:
+                return url, None, e
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = deque()
+            for url in urls:
+                pending.append(pool.submit(call, url))
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def summary(self):
+        """Aggregate metrics: requests, failures, retries, bytes, latency percentiles."""
+        with self._metrics_lock:
+            ms = sorted(m['ms'] for m in self.metrics)
+            failed = sum(1 for m in self.metrics if m['error'])
+            retries = sum(m['attempts'] - 1 for m in self.metrics)
+            total_bytes = sum(m['bytes'] for m in self.metrics)
+
+        def pct(p):
+            return ms[min(len(ms) - 1, int(p * len(ms)))] if ms else 0.0
+
+        return {
+            'requests': len(ms),
+            'failed': failed,
+            'retries': retries,
+            'bytes': total_bytes,
+            'p50_ms': pct(0.50),
+            'p95_ms': pct(0.95),
+        }
+
+
+_default_fetcher = None
+_default_lock = threading.Lock()
+
+
+def get_fetcher():
+    """Process-wide shared Fetcher (one connection pool per process)."""
+    global _default_fetcher
+    with _default_lock:
+        if _default_fetcher is None:
+            _default_fetcher = Fetcher()
+        return _default_fetcher
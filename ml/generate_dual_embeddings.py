@@ -6,27 +6,39 @@ and extends embeddings.json with `arcface_embedding` field.
 
 Usage:
     python ml/generate_dual_embeddings.py
+    python ml/generate_dual_embeddings.py --resume   # continue an interrupted run
 """
 
+import argparse
 import json
 import os
 import gzip
-import sqlite3
-import time
 import numpy as np
 
+from catalog import load_catalog
+from checkpoint import CheckpointJournal, journal_path, DEFAULT_FSYNC_EVERY
+from fetcher import get_fetcher
+from instrument import add_instrument_args, count, instrumented, timer
 
-def generate_arcface_embeddings():
+
+SCRIPT_DIR = os.path.dirname(__file__)
+MODEL_PATH = os.path.join(SCRIPT_DIR, 'models', 'mobilefacenet.onnx')
+DB_PATH = os.path.join(SCRIPT_DIR, '..', 'db', 'animatch.db')
+EMBEDDINGS_PATH = os.path.join(SCRIPT_DIR, '..', 'public', 'embeddings.json')
+CACHE_DIR = os.path.join(SCRIPT_DIR, 'images', 'protagonists')
+
+
+def add_arcface_embeddings(data, resume=False, fsync_every=DEFAULT_FSYNC_EVERY):
+    """Set `arcface_embedding` on every character in `data` (in place).
+
+    Returns (success count, fail count, journal); call `journal.complete()`
+    once the document has been saved.
+    """
     import onnxruntime as ort
     from PIL import Image
-    import urllib.request
 
-    script_dir = os.path.dirname(__file__)
-    model_path = os.path.join(script_dir, 'models', 'mobilefacenet.onnx')
-    db_path = os.path.join(script_dir, '..', 'db', 'animatch.db')
-    embeddings_path = os.path.join(script_dir, '..', 'public', 'embeddings.json')
-    gz_path = embeddings_path + '.gz'
-    cache_dir = os.path.join(script_dir, 'images', 'protagonists')
+    model_path = MODEL_PATH
+    cache_dir = CACHE_DIR
     os.makedirs(cache_dir, exist_ok=True)
 
     if not os.path.exists(model_path):
@@ -35,30 +47,66 @@ def generate_arcface_embeddings():
             "Run export_arcface_onnx.py first."
         )
 
-    # Load existing embeddings
-    with open(embeddings_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    print(f"Loaded {data['count']} characters")
-
     # Load protagonist image URLs from DB
-    conn = sqlite3.connect(db_path)
-    cur = conn.cursor()
-    cur.execute('SELECT id, name_en, image_url FROM characters WHERE role="protagonist"')
-    db_images = {row[0]: (row[1], row[2]) for row in cur.fetchall()}
-    conn.close()
+    catalog = load_catalog(DB_PATH)
+    db_images = {pid: (pair['protagonist']['name_en'], pair['protagonist']['image_url'])
+                 for pid, pair in catalog.by_protagonist.items()}
     print(f"DB protagonists with images: {sum(1 for v in db_images.values() if v[1])}")
 
     # Load ArcFace model
-    session = ort.InferenceSession(model_path, providers=['CPUExecutionProvider'])
+    with timer('load_model'):
+        session = ort.InferenceSession(model_path, providers=['CPUExecutionProvider'])
     input_name = session.get_inputs()[0].name
     print(f"ArcFace model loaded")
 
+    # Finished embeddings are journaled so an interrupted run can resume
+    journal = CheckpointJournal(
+        journal_path('generate_dual_embeddings'), resume=resume,
+        fsync_every=fsync_every, meta={'model': os.path.basename(model_path)},
+    )
+    done = journal.replay()
+    if done:
+        print(f"Resuming: {len(done)} embeddings already generated")
+
+    # Download uncached images concurrently (pooled, per-host rate-limited)
+    fetcher = get_fetcher()
+    downloads = []
+    for char in data['characters']:
+        pid = char['protagonist_id']
+        _, image_url = db_images.get(pid, (None, None))
+        if pid in done or not image_url:
+            continue
+        ext = os.path.splitext(image_url)[1] or '.jpg'
+        cache_path = os.path.join(cache_dir, f"{pid}{ext}")
+        if not os.path.exists(cache_path):
+            downloads.append((cache_path, image_url))
+
+    def download(item):
+        cache_path, image_url = item
+        body = fetcher.get(image_url, timeout=15)
+        with open(cache_path, 'wb') as f:
+            f.write(body)
+
+    download_errors = {}
+    if downloads:
+        print(f"Downloading {len(downloads)} images...")
+        for (cache_path, _), _, err in fetcher.fetch_many(downloads, fn=download):
+            if err:
+                download_errors[cache_path] = err
+        net = fetcher.summary()
+        print(f"Fetched {net['requests']} images ({net['bytes'] / 1024:.0f} KB, "
+              f"{net['retries']} retries, p95 {net['p95_ms']:.0f} ms)")
+
     success_count = 0
     fail_count = 0
 
     for char in data['characters']:
         pid = char['protagonist_id']
+        if pid in done:
+            char['arcface_embedding'] = done[pid]
+            success_count += 1
+            count('resumed')
+            continue
         name_en = char.get('protagonist_name_en', '') or db_images.get(pid, ('unknown', ''))[0]
 
         # Get image URL from DB
@@ -66,83 +114,108 @@ def generate_arcface_embeddings():
         if not image_url:
             print(f"  ⚠️  No image URL for ID:{pid} ({name_en})")
             fail_count += 1
+            count('failed')
             continue
 
-        # Download image (with cache)
+        # Cached image (downloaded above)
         ext = os.path.splitext(image_url)[1] or '.jpg'
         cache_path = os.path.join(cache_dir, f"{pid}{ext}")
 
-        if not os.path.exists(cache_path):
-            try:
-                req = urllib.request.Request(image_url, headers={
-                    'User-Agent': 'Mozilla/5.0 (compatible; AniMatch/1.0)'
-                })
-                with urllib.request.urlopen(req, timeout=15) as resp:
-                    with open(cache_path, 'wb') as f:
-                        f.write(resp.read())
-                time.sleep(0.3)  # Rate limiting
-            except Exception as e:
-                print(f"  ❌ Download failed for ID:{pid} ({name_en}): {e}")
-                fail_count += 1
-                continue
+        if cache_path in download_errors or not os.path.exists(cache_path):
+            print(f"  ❌ Download failed for ID:{pid} ({name_en}): {download_errors.get(cache_path)}")
+            fail_count += 1
+            count('failed')
+            continue
 
         # Load and preprocess image for ArcFace
         try:
-            img = Image.open(cache_path).convert('RGB')
+            with timer('decode'):
+                img = Image.open(cache_path).convert('RGB')
 
-            # Center crop to square
-            w, h = img.size
-            min_dim = min(w, h)
-            left = (w - min_dim) // 2
-            top = (h - min_dim) // 2
-            img = img.crop((left, top, left + min_dim, top + min_dim))
+            with timer('preprocess'):
+                # Center crop to square
+                w, h = img.size
+                min_dim = min(w, h)
+                left = (w - min_dim) // 2
+                top = (h - min_dim) // 2
+                img = img.crop((left, top, left + min_dim, top + min_dim))
 
-            # Resize to 112x112
-            img = img.resize((112, 112), Image.LANCZOS)
+                # Resize to 112x112
+                img = img.resize((112, 112), Image.LANCZOS)
 
-            # Normalize: (pixel / 255 - 0.5) / 0.5
-            img_array = np.array(img).astype(np.float32)
-            img_array = (img_array / 255.0 - 0.5) / 0.5
+                # Normalize: (pixel / 255 - 0.5) / 0.5
+                img_array = np.array(img).astype(np.float32)
+                img_array = (img_array / 255.0 - 0.5) / 0.5
 
-            # NCHW format
-            img_array = img_array.transpose(2, 0, 1)
-            img_array = np.expand_dims(img_array, axis=0)
+                # NCHW format
+                img_array = img_array.transpose(2, 0, 1)
+                img_array = np.expand_dims(img_array, axis=0)
 
             # Run inference
-            result = session.run(None, {input_name: img_array})
-            embedding = result[0].flatten()
+            with timer('inference'):
+                result = session.run(None, {input_name: img_array})
+                embedding = result[0].flatten()
 
-            # L2 normalize
-            norm = np.linalg.norm(embedding)
-            if norm > 0:
-                embedding = embedding / norm
+                # L2 normalize
+                norm = np.linalg.norm(embedding)
+                if norm > 0:
+                    embedding = embedding / norm
 
             char['arcface_embedding'] = [round(float(x), 6) for x in embedding]
+            journal.record(pid, char['arcface_embedding'])
             success_count += 1
+            count('embedded')
             print(f"  ✅ ID:{pid} {name_en}: embedding generated ({len(embedding)}d)")
 
         except Exception as e:
             print(f"  ❌ Processing failed for ID:{pid} ({name_en}): {e}")
             fail_count += 1
+            count('failed')
             continue
 
     print(f"\nResults: {success_count} success, {fail_count} failed")
+    return success_count, fail_count, journal
 
-    # Save updated embeddings
-    with open(embeddings_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False)
-    print(f"Saved to: {embeddings_path}")
 
-    # Generate gzip version
-    with open(embeddings_path, 'rb') as f_in:
-        with gzip.open(gz_path, 'wb', compresslevel=9) as f_out:
-            f_out.write(f_in.read())
+def generate_arcface_embeddings(resume=False, fsync_every=DEFAULT_FSYNC_EVERY):
+    embeddings_path = EMBEDDINGS_PATH
+    gz_path = embeddings_path + '.gz'
+
+    # Load existing embeddings
+    with timer('load_json'):
+        with open(embeddings_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+    print(f"Loaded {data['count']} characters")
+    success_count, _, journal = add_arcface_embeddings(data, resume=resume, fsync_every=fsync_every)
+
+    # Save updated embeddings
+    with timer('serialize'):
+        json_str = json.dumps(data, ensure_ascii=False)
+    with timer('write'):
+        with open(embeddings_path, 'w', encoding='utf-8') as f:
+            f.write(json_str)
+        print(f"Saved to: {embeddings_path}")
+
+        # Generate gzip version
+        with open(embeddings_path, 'rb') as f_in:
+            with gzip.open(gz_path, 'wb', compresslevel=9) as f_out:
+                f_out.write(f_in.read())
 
     json_size = os.path.getsize(embeddings_path) / 1024
     gz_size = os.path.getsize(gz_path) / 1024
     print(f"JSON: {json_size:.0f} KB, gzip: {gz_size:.0f} KB ({(1 - gz_size/json_size)*100:.0f}% compression)")
+    journal.complete()
     print(f"\n✅ Dual embeddings generated for {success_count}/{data['count']} characters!")
 
 
 if __name__ == '__main__':
-    generate_arcface_embeddings()
+    parser = argparse.ArgumentParser(description='Generate ArcFace embeddings for all protagonists')
+    parser.add_argument('--resume', action='store_true',
+                        help='Replay the checkpoint journal and continue an interrupted run')
+    parser.add_argument('--fsync-every', type=int, default=DEFAULT_FSYNC_EVERY,
+                        help='Checkpoint fsync interval (records)')
+    add_instrument_args(parser)
+    args = parser.parse_args()
+    with instrumented('generate_dual_embeddings', args):
+        generate_arcface_embeddings(resume=args.resume, fsync_every=args.fsync_every)
@@ -6,20 +6,20 @@ and exports them as a JSON file for browser-side matching.
 
 Usage:
   python generate_embeddings.py
+  python generate_embeddings.py --resume   # continue an interrupted run
 """
 
+import argparse
 import json
 import gzip
-import sqlite3
 import sys
 import os
 import numpy as np
-from io import BytesIO
 
-import requests
-from PIL import Image
-import torch
-import open_clip
+from catalog import load_catalog
+from checkpoint import CheckpointJournal, journal_path, DEFAULT_FSYNC_EVERY
+from fetcher import get_fetcher
+from instrument import add_instrument_args, count, instrumented, timer
 
 # Config
 DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'db', 'animatch.db')
@@ -31,16 +31,7 @@ EMBEDDING_PRECISION = 6  # decimal places for truncation (~30% file size reducti
 
 def load_image_from_url(url, timeout=10):
     """Download and preprocess an image from URL."""
-    try:
-        resp = requests.get(url, timeout=timeout, headers={
-            'User-Agent': 'AniMatch/1.0 (Character Embedding Generator)'
-        })
-        resp.raise_for_status()
-        img = Image.open(BytesIO(resp.content)).convert('RGB')
-        return img
-    except Exception as e:
-        print(f"  ⚠️ Failed to load image: {e}")
-        return None
+    return get_fetcher().get_image(url, timeout=timeout)
 
 def is_audience_pov(name_ko):
     """Check if protagonist is an audience viewpoint character (no real character)."""
@@ -50,7 +41,14 @@ def truncate_embedding(embedding_list, precision=EMBEDDING_PRECISION):
     """Truncate embedding values to reduce JSON file size."""
     return [round(x, precision) for x in embedding_list]
 
-def main():
+def build_embeddings(resume=False, fsync_every=DEFAULT_FSYNC_EVERY):
+    """Embed every protagonist; returns (embeddings document, journal).
+
+    Call `journal.complete()` once the document has been saved.
+    """
+    import torch
+    import open_clip
+
     print("🎌 AniMatch — Character Embedding Generator")
     print(f"  Model: {MODEL_NAME} ({PRETRAINED})")
     print(f"  Precision: {EMBEDDING_PRECISION} decimal places")
@@ -61,91 +59,100 @@ def main():
     device = 'cuda' if torch.cuda.is_available() else 'mps' if torch.backends.mps.is_available() else 'cpu'
     print(f"  Device: {device}")
 
-    model, _, preprocess = open_clip.create_model_and_transforms(
-        MODEL_NAME, pretrained=PRETRAINED, device=device
-    )
-    model.eval()
+    with timer('load_model'):
+        model, _, preprocess = open_clip.create_model_and_transforms(
+            MODEL_NAME, pretrained=PRETRAINED, device=device
+        )
+        model.eval()
     print("  ✅ Model loaded\n")
 
-    # Connect to DB
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    # Protagonists with their heroine and anime, in one query
+    with timer('db'):
+        catalog = load_catalog(DB_PATH)
 
-    # Get all protagonist characters with their anime info
     # Excludes: audience POV (no image_url) and characters without images
-    cursor.execute("""
-        SELECT c.id, c.name_ko, c.name_en, c.image_url, c.partner_id,
-               c.gender, c.role,
-               a.orientation, a.title_ko, a.title_en, a.tier, a.genre, a.genre_en
-        FROM characters c
-        JOIN animes a ON c.anime_id = a.id
-        WHERE c.role = 'protagonist'
-        AND c.image_url IS NOT NULL
-        ORDER BY a.orientation, a.tier, a.id
-    """)
-    protagonists = cursor.fetchall()
+    pairs = sorted(
+        (p for p in catalog.pairs if p['protagonist']['image_url'] is not None),
+        key=lambda p: (p['anime']['orientation'], p['anime']['tier'], p['anime']['id']),
+    )
 
     # Filter out audience POV explicitly
     skipped_pov = 0
-    valid_protagonists = []
-    for prot in protagonists:
-        if is_audience_pov(prot['name_ko']):
+    valid_pairs = []
+    for pair in pairs:
+        if is_audience_pov(pair['protagonist']['name_ko']):
             skipped_pov += 1
             continue
-        valid_protagonists.append(prot)
+        valid_pairs.append(pair)
+
+    print(f"📋 Found {len(valid_pairs)} protagonists to embed (skipped {skipped_pov} audience POV)\n")
+
+    # Completed entries are journaled so an interrupted run can resume.
+    # A None value records "embedded but no heroine" so it isn't retried.
+    journal = CheckpointJournal(
+        journal_path('generate_embeddings'), resume=resume,
+        fsync_every=fsync_every,
+        meta={'model': MODEL_NAME, 'pretrained': PRETRAINED, 'precision': EMBEDDING_PRECISION},
+    )
+    done = journal.replay()
+    if done:
+        print(f"♻️ Resuming: {len(done)} protagonists already processed\n")
 
-    print(f"📋 Found {len(valid_protagonists)} protagonists to embed (skipped {skipped_pov} audience POV)\n")
+    # Images download concurrently (pooled, rate-limited) ahead of inference
+    fetcher = get_fetcher()
+    todo = [p['protagonist'] for p in valid_pairs if p['protagonist']['id'] not in done]
+    prefetched = fetcher.fetch_many((p['image_url'] for p in todo), fn=load_image_from_url)
 
     embeddings_data = []
-    success_count = 0
 
-    for prot in valid_protagonists:
-        print(f"  🔎 [{prot['id']}] {prot['name_ko']} ({prot['orientation']}, T{prot['tier']})")
+    for pair in valid_pairs:
+        prot, anime, heroine = pair['protagonist'], pair['anime'], pair['heroine']
+        if prot['id'] in done:
+            if done[prot['id']] is not None:
+                embeddings_data.append(done[prot['id']])
+            count('resumed')
+            continue
+
+        print(f"  🔎 [{prot['id']}] {prot['name_ko']} ({anime['orientation']}, T{anime['tier']})")
 
         # Load image
-        img = load_image_from_url(prot['image_url'])
+        with timer('image_wait'):
+            _, img, _ = next(prefetched)
         if img is None:
             print(f"     ❌ Skipped (image load failed)")
+            count('image_failed')
             continue
 
         # Preprocess and embed
         with torch.no_grad():
-            image_tensor = preprocess(img).unsqueeze(0).to(device)
-            embedding = model.encode_image(image_tensor)
-            # Normalize
-            embedding = embedding / embedding.norm(dim=-1, keepdim=True)
-            embedding_list = embedding.cpu().numpy()[0].tolist()
+            with timer('preprocess'):
+                image_tensor = preprocess(img).unsqueeze(0).to(device)
+            with timer('inference'):
+                embedding = model.encode_image(image_tensor)
+                # Normalize
+                embedding = embedding / embedding.norm(dim=-1, keepdim=True)
+                embedding_list = embedding.cpu().numpy()[0].tolist()
 
         # Truncate for file size reduction
         embedding_list = truncate_embedding(embedding_list)
 
-        # Get heroine info
-        cursor.execute("""
-            SELECT c.id, c.name_ko, c.name_en, c.image_url,
-                   c.personality, c.personality_en, c.charm_points, c.charm_points_en, 
-                   c.iconic_quote, c.iconic_quote_en,
-                   c.tags, c.tags_en, c.color_primary, c.emoji
-            FROM characters c
-            WHERE c.id = ?
-        """, (prot['partner_id'],))
-        heroine = cursor.fetchone()
-
         if not heroine:
             print(f"     ⚠️ No heroine found for partner_id={prot['partner_id']}")
+            journal.record(prot['id'], None)
+            count('no_heroine')
             continue
 
-        embeddings_data.append({
+        entry = {
             'protagonist_id': prot['id'],
             'protagonist_name': prot['name_ko'],
             'protagonist_name_en': prot['name_en'],
             'protagonist_en': prot['name_en'], # Added for frontend compat
-            'orientation': prot['orientation'],
-            'tier': prot['tier'],
-            'anime': prot['title_ko'],
-            'anime_en': prot['title_en'],
-            'genre': json.loads(prot['genre']) if prot['genre'] else [],
-            'genre_en': json.loads(prot['genre_en']) if prot['genre_en'] else [],
+            'orientation': anime['orientation'],
+            'tier': anime['tier'],
+            'anime': anime['title_ko'],
+            'anime_en': anime['title_en'],
+            'genre': json.loads(anime['genre']) if anime['genre'] else [],
+            'genre_en': json.loads(anime['genre_en']) if anime['genre_en'] else [],
             'heroine_id': heroine['id'],
             'heroine_name': heroine['name_ko'],
             'heroine_name_en': heroine['name_en'],
@@ -161,15 +168,12 @@ def main():
             'heroine_color': heroine['color_primary'],
             'heroine_emoji': heroine['emoji'],
             'embedding': embedding_list
-        })
-        success_count += 1
+        }
+        embeddings_data.append(entry)
+        journal.record(prot['id'], entry)
+        count('embedded')
         print(f"     ✅ Embedded ({len(embedding_list)}d)")
 
-    conn.close()
-
-    # Save embeddings
-    os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
-
     output = {
         'model': MODEL_NAME,
         'pretrained': PRETRAINED,
@@ -177,25 +181,44 @@ def main():
         'count': len(embeddings_data),
         'characters': embeddings_data
     }
+    return output, journal
 
-    # Write uncompressed JSON
-    json_str = json.dumps(output, ensure_ascii=False, separators=(',', ':'))
-    with open(OUTPUT_PATH, 'w', encoding='utf-8') as f:
-        f.write(json_str)
-
-    file_size = os.path.getsize(OUTPUT_PATH) / 1024
 
-    # Write gzipped version
-    with gzip.open(OUTPUT_GZ_PATH, 'wt', encoding='utf-8', compresslevel=9) as f:
-        f.write(json_str)
+def save_embeddings(output, path=OUTPUT_PATH):
+    """Write compact JSON plus a .gz twin; returns (json KB, gzip KB)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with timer('serialize'):
+        json_str = json.dumps(output, ensure_ascii=False, separators=(',', ':'))
+    with timer('write'):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(json_str)
+        with gzip.open(path + '.gz', 'wt', encoding='utf-8', compresslevel=9) as f:
+            f.write(json_str)
+    return os.path.getsize(path) / 1024, os.path.getsize(path + '.gz') / 1024
 
-    gz_size = os.path.getsize(OUTPUT_GZ_PATH) / 1024
 
-    print(f"\n{'='*50}")
-    print(f"✅ Generated {success_count} embeddings")
-    print(f"📁 JSON: {OUTPUT_PATH} ({file_size:.1f} KB)")
-    print(f"📁 Gzip: {OUTPUT_GZ_PATH} ({gz_size:.1f} KB, {gz_size/file_size*100:.0f}% of original)")
-    print(f"📊 Embedding dimension: {output['embedding_dim']}")
+def main():
+    parser = argparse.ArgumentParser(description='AniMatch — Character Embedding Generator')
+    parser.add_argument('--resume', action='store_true',
+                        help='Replay the checkpoint journal and continue an interrupted run')
+    parser.add_argument('--fsync-every', type=int, default=DEFAULT_FSYNC_EVERY,
+                        help='Checkpoint fsync interval (records)')
+    add_instrument_args(parser)
+    args = parser.parse_args()
+
+    with instrumented('generate_embeddings', args):
+        output, journal = build_embeddings(resume=args.resume, fsync_every=args.fsync_every)
+        file_size, gz_size = save_embeddings(output)
+        journal.complete()
+
+        print(f"\n{'='*50}")
+        print(f"✅ Generated {output['count']} embeddings")
+        print(f"📁 JSON: {OUTPUT_PATH} ({file_size:.1f} KB)")
+        print(f"📁 Gzip: {OUTPUT_GZ_PATH} ({gz_size:.1f} KB, {gz_size/file_size*100:.0f}% of original)")
+        print(f"📊 Embedding dimension: {output['embedding_dim']}")
+        net = get_fetcher().summary()
+        print(f"🌐 Fetch: {net['requests']} requests, {net['failed']} failed, {net['retries']} retries, "
+              f"p50 {net['p50_ms']:.0f} ms, p95 {net['p95_ms']:.0f} ms")
 
 if __name__ == '__main__':
     main()
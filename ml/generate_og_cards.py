@@ -0,0 +1,275 @@
+"""Pre-render a 1200x630 WebP OG card for every heroine in the catalog.
+
+Writes public/og/<heroine_id>.webp, which GET /api/og/:id serves before
+falling back to a redirect to the character image.
+
+The background, static decorations and portrait mask are built once
+(NumPy gradient). Each worker process decodes them and loads its fonts
+a single time, so a card costs one paste, a few text draws and a WebP
+encode. Cards render across a process pool, and portraits download
+concurrently through the shared fetcher.
+
+A card is skipped when the hash of its inputs (text fields, color, image
+URL, plus this script, og_theme.py and the fonts in use) matches the last
+render, which is stored in ml/cache/og_cards.json. A card whose portrait
+failed to download or decode gets a placeholder and is retried on the next run.
+
+Usage:
+    python ml/generate_og_cards.py
+    python ml/generate_og_cards.py --force --workers 8
+    python ml/generate_og_cards.py --ids 2 4 6
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from pathlib import Path
+
+from catalog import load_catalog
+from instrument import add_instrument_args, count, instrumented, timer
+
+ROOT = Path(__file__).parent.parent
+DB_PATH = ROOT / "db" / "animatch.db"
+OUT_DIR = ROOT / "public" / "og"
+STATE_PATH = Path(__file__).parent / "cache" / "og_cards.json"
+THEME_FILES = [Path(__file__), Path(__file__).parent / "og_theme.py"]
+
+WEBP_QUALITY = 82
+PORTRAIT_BOX = (70, 65, 450, 565)   # x0, y0, x1, y1
+TEXT_X = 510
+MAX_TAGS = 4
+
+_template = None    # per worker: background with static decorations
+_mask = None        # per worker: rounded portrait mask
+
+
+def build_template():
+    """Background + everything that is the same on every card."""
+    from PIL import ImageDraw
+    from og_theme import BG_BOTTOM, BG_TOP, H, PRIMARY, SECONDARY, TEXT_DIM, W, font, vertical_gradient
+
+    img = vertical_gradient(W, H, BG_TOP, BG_BOTTOM)
+    draw = ImageDraw.Draw(img, "RGBA")
+    x0, y0, x1, y1 = PORTRAIT_BOX
+    draw.rounded_rectangle([x0 - 6, y0 - 6, x1 + 6, y1 + 6], radius=28, outline=(*SECONDARY, 90), width=2)
+    draw.text((W - 60, H - 52), "AniMatch", fill=PRIMARY, font=font(34, bold=True), anchor="rm")
+    draw.text((W - 60, H - 22), "animatch.midori-lab.com", fill=TEXT_DIM, font=font(18), anchor="rm")
+    accent = 36
+    for x, y in [(24, 24), (W - 24 - accent, 24)]:
+        draw.rounded_rectangle([x, y, x + accent, y + accent], radius=8, outline=(*PRIMARY, 120), width=2)
+    return img
+
+
+def portrait_mask():
+    from PIL import Image, ImageDraw
+    x0, y0, x1, y1 = PORTRAIT_BOX
+    mask = Image.new("L", (x1 - x0, y1 - y0), 0)
+    ImageDraw.Draw(mask).rounded_rectangle([0, 0, x1 - x0 - 1, y1 - y0 - 1], radius=24, fill=255)
+    return mask
+
+
+def init_worker(template_bytes: bytes, size: tuple):
+    global _template, _mask
+    from PIL import Image
+    from og_theme import font
+    _template = Image.frombytes("RGB", size, template_bytes)
+    _mask = portrait_mask()
+    for size_, bold in ((64, True), (32, False), (28, False), (22, False)):
+        font(size_, bold)  # warm the per-process font cache
+
+
+def fit_text(draw, text: str, size: int, bold: bool, max_width: int):
+    """Largest font (down to 60% of `size`) that fits `text` in `max_width`."""
+    from og_theme import font
+    for s in range(size, int(size * 0.6) - 1, -4):
+        f = font(s, bold)
+        if draw.textlength(text, font=f) <= max_width:
+            return f
+    return font(int(size * 0.6), bold)
+
+
+def render_card(job: dict) -> tuple:
+    """Render one card to its WebP path; returns (heroine_id, bytes written, used placeholder).
+
+    Runs in a worker process, so whether the portrait fell back to the
+    placeholder has to come back in the return value.
+    """
+    from PIL import Image, ImageDraw, ImageOps
+    from og_theme import PRIMARY, SECONDARY, TEXT, TEXT_DIM, W, font, horizontal_gradient
+
+    img = _template.copy()
+    draw = ImageDraw.Draw(img, "RGBA")
+    left, right = job["colors"]
+    x0, y0, x1, y1 = PORTRAIT_BOX
+
+    placeholder = True
+    if job["image"]:
+        try:
+            portrait = Image.open(BytesIO(job["image"])).convert("RGB")
+            portrait = ImageOps.fit(portrait, (x1 - x0, y1 - y0), Image.Resampling.LANCZOS, centering=(0.5, 0.25))
+            img.paste(portrait, (x0, y0), _mask)
+            placeholder = False
+        except Exception:
+            pass  # undecodable bytes (e.g. an HTML error page): placeholder, retried next run
+    if placeholder:
+        img.paste(horizontal_gradient(x1 - x0, y1 - y0, left, right), (x0, y0), _mask)
+
+    text_w = W - TEXT_X - 70
+    img.paste(horizontal_gradient(220, 8, left, right), (TEXT_X, 120))
+    draw.text((TEXT_X, 150), job["name"], fill=TEXT, font=fit_text(draw, job["name"], 64, True, text_w))
+    y = 240
+    if job["name_en"] and job["name_en"] != job["name"]:
+        draw.text((TEXT_X, y), job["name_en"], fill=PRIMARY, font=fit_text(draw, job["name_en"], 32, False, text_w))
+        y += 56
+    draw.text((TEXT_X, y), job["anime"], fill=TEXT_DIM, font=fit_text(draw, job["anime"], 28, False, text_w))
+    y += 80
+
+    tag_font = font(22)
+    x = TEXT_X
+    for tag in job["tags"][:MAX_TAGS]:
+        label = f"#{tag}"
+        w = draw.textlength(label, font=tag_font) + 32
+        if x + w > W - 70:
+            break
+        draw.rounded_rectangle([x, y, x + w, y + 42], radius=21, fill=(*SECONDARY, 40), outline=(*SECONDARY, 140))
+        draw.text((x + w / 2, y + 21), label, fill=TEXT, font=tag_font, anchor="mm")
+        x += w + 12
+
+    out = Path(job["path"])
+    tmp = out.with_suffix(".webp.tmp")
+    img.save(tmp, "WEBP", quality=WEBP_QUALITY, method=4)
+    os.replace(tmp, out)
+    return job["id"], out.stat().st_size, placeholder
+
+
+def theme_digest() -> str:
+    from og_theme import font_path
+    h = hashlib.sha256()
+    for path in THEME_FILES:
+        h.update(path.read_bytes())
+    h.update(f"{font_path()}|{font_path(bold=True)}|{WEBP_QUALITY}".encode())
+    return h.hexdigest()
+
+
+def card_fields(pair: dict) -> dict:
+    from og_theme import css_gradient_colors
+    h, a = pair["heroine"], pair["anime"]
+    try:
+        tags = json.loads(h["tags"]) if h["tags"] else []
+    except json.JSONDecodeError:
+        tags = []
+    return {
+        "id": h["id"],
+        "name": h["name_ko"],
+        "name_en": h["name_en"] or "",
+        "anime": a["title_ko"],
+        "tags": [t for t in tags if isinstance(t, str)],
+        "colors": css_gradient_colors(h["color_primary"]),
+        "image_url": h["image_url"],
+    }
+
+
+def card_hash(fields: dict, theme: str) -> str:
+    return hashlib.sha256((json.dumps(fields, ensure_ascii=False, sort_keys=True) + theme).encode()).hexdigest()[:16]
+
+
+def load_state() -> dict:
+    try:
+        return json.loads(STATE_PATH.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_state(state: dict):
+    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = STATE_PATH.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, STATE_PATH)
+
+
+def download_portraits(jobs: list):
+    """Fill job["image"] with portrait bytes (None on failure), concurrently."""
+    from fetcher import get_fetcher
+    by_url = {}
+    for job in jobs:
+        if job["image_url"]:
+            by_url.setdefault(job["image_url"], []).append(job)
+    for url, body, err in get_fetcher().fetch_many(list(by_url)):
+        if err:
+            print(f"  ⚠️ portrait {url}: {err}")
+            count("portrait_failed")
+        for job in by_url[url]:
+            job["image"] = body
+
+
+def render_cards(force: bool = False, workers: int | None = None, ids=None) -> dict:
+    """Render stale cards; returns a summary dict."""
+    from og_theme import has_cjk_font
+
+    if not has_cjk_font():
+        print("  ⚠️ No CJK font found — Korean names will not render (set ANIMATCH_OG_FONT)")
+    with timer("catalog"):
+        catalog = load_catalog(str(DB_PATH))
+    theme = theme_digest()
+    state = {} if force else load_state()
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
+
+    jobs, skipped = [], 0
+    for hid, pair in sorted(catalog.by_heroine.items()):
+        if ids and hid not in ids:
+            continue
+        fields = card_fields(pair)
+        digest = card_hash(fields, theme)
+        path = OUT_DIR / f"{hid}.webp"
+        if state.get(str(hid)) == digest and path.exists():
+            skipped += 1
+            continue
+        jobs.append({**fields, "hash": digest, "path": str(path), "image": None})
+
+    with timer("portraits"):
+        download_portraits(jobs)
+
+    total_bytes = placeholders = 0
+    if not jobs:
+        return {"rendered": 0, "skipped": skipped, "kb": 0.0, "placeholders": 0}
+
+    template = build_template()
+    with timer("render"):
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                 initargs=(template.tobytes(), template.size)) as pool:
+            results = pool.map(render_card, jobs, chunksize=max(1, len(jobs) // (4 * (workers or os.cpu_count() or 1))))
+            for job, (hid, size, placeholder) in zip(jobs, results):
+                total_bytes += size
+                count("cards_rendered")
+                placeholders += placeholder
+                if not placeholder or not job["image_url"]:
+                    state[str(hid)] = job["hash"]
+                else:
+                    state.pop(str(hid), None)  # placeholder portrait: try again next run
+    save_state(state)
+    return {"rendered": len(jobs), "skipped": skipped, "kb": total_bytes / 1024,
+            "placeholders": placeholders}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AniMatch — per-character OG cards")
+    parser.add_argument("--force", action="store_true", help="Re-render every card")
+    parser.add_argument("--workers", type=int, default=None, help="Render processes (default: CPU count)")
+    parser.add_argument("--ids", type=int, nargs="*", help="Only these heroine ids")
+    add_instrument_args(parser)
+    args = parser.parse_args()
+
+    print("🎌 AniMatch — OG Cards")
+    start = time.perf_counter()
+    with instrumented("og_cards", args):
+        summary = render_cards(force=args.force, workers=args.workers, ids=set(args.ids or []))
+        print(f"  ✅ {summary['rendered']} rendered ({summary['kb']:.0f} KB), {summary['skipped']} unchanged, "
+              f"{summary['placeholders']} placeholder portraits — {time.perf_counter() - start:.1f}s → {OUT_DIR}")
+
+
+if __name__ == "__main__":
+    main()
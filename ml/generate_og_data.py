@@ -11,23 +11,26 @@ import json
 import sys
 from pathlib import Path
 
+def render_character_data(data):
+    """TypeScript source for the CHARACTER_DATA constant."""
+    lines = ["const CHARACTER_DATA: Record<number, { name: string; name_en: string; anime: string; anime_en: string }> = {"]
+    for c in data["characters"]:
+        hid = c["heroine_id"]
+        name = c["heroine_name"].replace("'", "\\'")
+        name_en = c["heroine_name_en"].replace("'", "\\'")
+        anime = c["anime"].replace("'", "\\'")
+        anime_en = c["anime_en"].replace("'", "\\'")
+        lines.append(f"  {hid}: {{ name: '{name}', name_en: '{name_en}', anime: '{anime}', anime_en: '{anime_en}' }},")
+    lines.append("};")
+    return "\n".join(lines)
+
 def main():
     embeddings_path = Path(__file__).parent.parent / "public" / "embeddings.json"
 
     with open(embeddings_path, encoding="utf-8") as f:
         data = json.load(f)
 
-    characters = data["characters"]
-
-    print("const CHARACTER_DATA: Record<number, { name: string; name_en: string; anime: string; anime_en: string }> = {")
-    for c in characters:
-        hid = c["heroine_id"]
-        name = c["heroine_name"].replace("'", "\\'")
-        name_en = c["heroine_name_en"].replace("'", "\\'")
-        anime = c["anime"].replace("'", "\\'")
-        anime_en = c["anime_en"].replace("'", "\\'")
-        print(f"  {hid}: {{ name: '{name}', name_en: '{name_en}', anime: '{anime}', anime_en: '{anime_en}' }},")
-    print("};")
+    print(render_character_data(data))
 
 if __name__ == "__main__":
     main()
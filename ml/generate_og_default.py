@@ -9,7 +9,8 @@ Usage:
 from pathlib import Path
 
 try:
-    from PIL import Image, ImageDraw, ImageFont
+    from PIL import ImageDraw
+    from og_theme import BG_BOTTOM, BG_TOP, H, PRIMARY, SECONDARY, TEXT_DIM, W, font, vertical_gradient
 except ImportError:
     print("ERROR: Pillow is required. Install with: pip install Pillow")
     exit(1)
@@ -17,30 +18,11 @@ except ImportError:
 ROOT = Path(__file__).parent.parent
 OUT_PATH = ROOT / "public" / "images" / "og-default.webp"
 
-W, H = 1200, 630
-
-# Colors matching the app theme
-BG_TOP = (26, 16, 64)       # #1a1040
-BG_BOTTOM = (15, 23, 42)    # #0F172A
-PRIMARY = (255, 107, 157)   # #FF6B9D
-SECONDARY = (192, 132, 252) # #C084FC
-TEXT_DIM = (148, 163, 184)  # #94A3B8
-
-
-def lerp_color(c1: tuple, c2: tuple, t: float) -> tuple:
-    return tuple(int(a + (b - a) * t) for a, b in zip(c1, c2))
-
 
 def main():
-    img = Image.new("RGB", (W, H))
+    img = vertical_gradient(W, H, BG_TOP, BG_BOTTOM)
     draw = ImageDraw.Draw(img)
 
-    # Vertical gradient background
-    for y in range(H):
-        t = y / H
-        color = lerp_color(BG_TOP, BG_BOTTOM, t)
-        draw.line([(0, y), (W, y)], fill=color)
-
     # Decorative card outlines (tarot motif)
     card_w, card_h = 120, 170
     positions = [(180, 200), (340, 160), (740, 160), (900, 200)]
@@ -52,15 +34,9 @@ def main():
             width=2,
         )
 
-    # Try to use a nice font, fall back to default
-    try:
-        title_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 72)
-        sub_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 28)
-        small_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 22)
-    except (OSError, IOError):
-        title_font = ImageFont.load_default()
-        sub_font = ImageFont.load_default()
-        small_font = ImageFont.load_default()
+    title_font = font(72)
+    sub_font = font(28)
+    small_font = font(22)
 
     # Main title
     draw.text((W // 2, 240), "AniMatch", fill=PRIMARY, font=title_font, anchor="mm")
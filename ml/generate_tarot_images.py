@@ -5,12 +5,25 @@ Parses docs/tarot-prompts.md, validates generated images, and converts formats.
 Usage:
     python ml/generate_tarot_images.py --dry-run     # Print parsed prompts
     python ml/generate_tarot_images.py --validate    # Check public/images/tarot/ for missing/invalid files
-    python ml/generate_tarot_images.py --convert DIR  # Convert PNG files in DIR to WebP (quality 85)
+    python ml/generate_tarot_images.py --convert DIR  # Convert PNG files in DIR to WebP
+    python ml/generate_tarot_images.py --convert DIR --force --workers 4
+
+--convert runs on a process pool. For each PNG it binary-searches the
+WebP quality so the card lands in the MIN_SIZE_KB–MAX_SIZE_KB window that
+--validate checks (the highest quality that fits), and writes smaller
+variants for mobile as <id>-<width>w.webp. A PNG whose hash (and the
+encoder settings) matches its last conversion is skipped; hashes live in
+ml/cache/tarot_convert.json.
 """
 
 import argparse
+import hashlib
+import json
+import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
 from pathlib import Path
 
 ROOT = Path(__file__).parent.parent
@@ -26,6 +39,12 @@ VALID_IDS = [
 MIN_SIZE_KB = 50
 MAX_SIZE_KB = 300
 
+STATE_PATH = Path(__file__).parent / "cache" / "tarot_convert.json"
+QUALITY_RANGE = (40, 95)        # binary search bounds for the full-size card
+VARIANT_WIDTHS = (480, 720)     # responsive variants, px wide
+VARIANT_QUALITY = 80
+DOWNSCALE_STEP = 0.85           # per step, when the lowest quality is still too large
+
 
 def parse_prompts() -> dict[int, dict]:
     """Parse tarot-prompts.md and extract character prompts."""
@@ -91,9 +110,101 @@ def cmd_validate():
     return len(missing) == 0 and len(invalid) == 0
 
 
-def cmd_convert(src_dir: str):
+def encode_webp(img, quality: int) -> bytes:
+    buf = BytesIO()
+    img.save(buf, "WEBP", quality=quality, method=6)
+    return buf.getvalue()
+
+
+def search_quality(img) -> tuple:
+    """Highest quality in QUALITY_RANGE whose output is at most MAX_SIZE_KB.
+
+    Returns (quality, WebP bytes, the image that was encoded).
+
+    Tries the top of the range first, so images that already fit cost one
+    encode; otherwise ~log2(range) encodes. When even the lowest quality is
+    too large, the image is scaled down (never below the largest variant)
+    until it fits.
+    """
+    from PIL import Image
+
+    lo, hi = QUALITY_RANGE
+    best = encode_webp(img, hi)
+    if len(best) <= MAX_SIZE_KB * 1024:
+        return hi, best, img
+    best_q, best = lo, encode_webp(img, lo)
+    while len(best) > MAX_SIZE_KB * 1024 and img.width * DOWNSCALE_STEP >= max(VARIANT_WIDTHS):
+        size = (round(img.width * DOWNSCALE_STEP), round(img.height * DOWNSCALE_STEP))
+        img = img.resize(size, Image.Resampling.LANCZOS)
+        best = encode_webp(img, lo)
+    if len(best) > MAX_SIZE_KB * 1024:
+        return best_q, best, img
+    lo += 1
+    hi -= 1
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        data = encode_webp(img, mid)
+        if len(data) <= MAX_SIZE_KB * 1024:
+            best_q, best = mid, data
+            lo = mid + 1
+        else:
+            hi = mid - 1
+    return best_q, best, img
+
+
+def write_atomic(path: Path, data: bytes):
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def convert_one(png: str) -> dict:
+    """Convert one PNG to the full card plus variants; runs in a worker process."""
+    from PIL import Image
+
+    png = Path(png)
+    hid = int(png.stem)
+    img = Image.open(png)
+    img = img.convert("RGBA" if img.mode in ("RGBA", "LA", "P") else "RGB")
+
+    quality, data, full = search_quality(img)
+    write_atomic(TAROT_DIR / f"{hid}.webp", data)
+    result = {"id": hid, "quality": quality, "source": png.stat().st_size, "full": len(data), "variants": 0}
+
+    for width in VARIANT_WIDTHS:
+        if width >= full.width:
+            continue
+        height = round(img.height * width / img.width)
+        small = img.resize((width, height), Image.Resampling.LANCZOS)
+        variant = encode_webp(small, min(quality, VARIANT_QUALITY))
+        write_atomic(TAROT_DIR / f"{hid}-{width}w.webp", variant)
+        result["variants"] += len(variant)
+    return result
+
+
+def source_hash(png: Path) -> str:
+    h = hashlib.sha256(png.read_bytes())
+    h.update(f"{QUALITY_RANGE}|{MAX_SIZE_KB}|{VARIANT_WIDTHS}|{VARIANT_QUALITY}|{DOWNSCALE_STEP}".encode())
+    return h.hexdigest()[:16]
+
+
+def load_state() -> dict:
     try:
-        from PIL import Image
+        return json.loads(STATE_PATH.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_state(state: dict):
+    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = STATE_PATH.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, STATE_PATH)
+
+
+def cmd_convert(src_dir: str, force: bool = False, workers: int | None = None):
+    try:
+        from PIL import Image  # noqa: F401
     except ImportError:
         print("ERROR: Pillow is required. Install with: pip install Pillow")
         sys.exit(1)
@@ -101,28 +212,46 @@ def cmd_convert(src_dir: str):
     src = Path(src_dir)
     TAROT_DIR.mkdir(parents=True, exist_ok=True)
 
-    pngs = list(src.glob("*.png"))
+    pngs = sorted(src.glob("*.png"))
     if not pngs:
         print(f"No PNG files found in {src}")
         return
 
-    converted = 0
+    state = {} if force else load_state()
+    todo, hashes, skipped = [], {}, 0
     for png in pngs:
-        stem = png.stem
-        try:
-            hid = int(stem)
-        except ValueError:
+        if not png.stem.isdigit():
             print(f"  Skip: {png.name} (filename is not a number)")
             continue
+        digest = source_hash(png)
+        hid = int(png.stem)
+        if state.get(str(hid)) == digest and (TAROT_DIR / f"{hid}.webp").exists():
+            skipped += 1
+            continue
+        todo.append(str(png))
+        hashes[hid] = digest
 
-        out = TAROT_DIR / f"{hid}.webp"
-        img = Image.open(png)
-        img.save(out, "WEBP", quality=85)
-        size_kb = out.stat().st_size / 1024
-        print(f"  [{hid}] {png.name} → {out.name} ({size_kb:.0f}KB)")
-        converted += 1
+    totals = {"source": 0, "full": 0, "variants": 0}
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for r in pool.map(convert_one, todo):
+                for key in totals:
+                    totals[key] += r[key]
+                size_kb = r["full"] / 1024
+                flag = "" if MIN_SIZE_KB <= size_kb <= MAX_SIZE_KB else f"  (outside {MIN_SIZE_KB}-{MAX_SIZE_KB}KB)"
+                print(f"  [{r['id']}] q{r['quality']} → {r['id']}.webp ({size_kb:.0f}KB), "
+                      f"variants {r['variants'] / 1024:.0f}KB{flag}")
+                state[str(r["id"])] = hashes[r["id"]]
+        save_state(state)
 
-    print(f"\nConverted {converted} images.")
+    print(f"\nConverted {len(todo)} images, {skipped} unchanged.")
+    if todo:
+        saved = totals["source"] - totals["full"]
+        print(f"  PNG {totals['source'] / 1024:.0f}KB → WebP {totals['full'] / 1024:.0f}KB "
+              f"(saved {saved / 1024:.0f}KB, {100 * saved / totals['source']:.0f}%)")
+        if totals["variants"]:
+            print(f"  Mobile variants ({', '.join(f'{w}w' for w in VARIANT_WIDTHS)}): "
+                  f"{totals['variants'] / 1024:.0f}KB total")
 
 
 def main():
@@ -131,6 +260,8 @@ def main():
     group.add_argument("--dry-run", action="store_true", help="Print parsed prompts")
     group.add_argument("--validate", action="store_true", help="Validate images in public/images/tarot/")
     group.add_argument("--convert", metavar="DIR", help="Convert PNG images in DIR to WebP")
+    parser.add_argument("--force", action="store_true", help="--convert: reconvert unchanged PNGs")
+    parser.add_argument("--workers", type=int, default=None, help="--convert: processes (default: CPU count)")
     args = parser.parse_args()
 
     if args.dry_run:
@@ -139,7 +270,7 @@ def main():
         ok = cmd_validate()
         sys.exit(0 if ok else 1)
     elif args.convert:
-        cmd_convert(args.convert)
+        cmd_convert(args.convert, force=args.force, workers=args.workers)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+AniMatch — Heroine Image Derivatives
+Turns each heroine's AniList image into small, cacheable files so the
+result and browse screens stop downloading the full-size original:
+
+  public/images/heroines/<heroine_id>-<width>.<hash>.avif   (WIDTHS)
+  public/images/heroines/<heroine_id>-<width>.<hash>.webp
+
+plus a ~16px LQIP (a blurred WebP data URI, a few hundred bytes) shown
+while the real image loads. Names carry a hash of the file content, so
+the files can be cached as immutable and a changed image gets a new URL.
+
+Originals are downloaded once through the shared fetcher into
+ml/cache/heroine_images/ (keyed by URL), and encoding runs on a process
+pool. The manifest (ml/build/heroine_images.json) maps heroine_id to the
+srcset strings and placeholder; refresh_metadata.py copies them into
+embeddings.json as heroine_image_avif / heroine_image_webp /
+heroine_image_lqip. A heroine whose URL and encoder settings are
+unchanged is skipped, and files no longer in the manifest are deleted.
+
+Usage:
+  python heroine_images.py
+  python heroine_images.py --force --workers 4
+  python main.py refresh             # then copy the fields into embeddings.json
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from catalog import load_catalog
+from instrument import add_instrument_args, count, instrumented, timer
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(SCRIPT_DIR, '..', 'db', 'animatch.db')
+OUT_DIR = os.path.join(SCRIPT_DIR, '..', 'public', 'images', 'heroines')
+URL_PREFIX = '/images/heroines'
+CACHE_DIR = os.path.join(SCRIPT_DIR, 'cache', 'heroine_images')
+MANIFEST_PATH = os.path.join(SCRIPT_DIR, 'build', 'heroine_images.json')
+
+WIDTHS = (160, 320, 640)            # browse grid, result card, result card @2x
+FORMATS = (('avif', 50), ('webp', 75))  # (format, quality), preferred first
+LQIP_WIDTH = 16
+LQIP_QUALITY = 30
+SETTINGS = json.dumps({'widths': WIDTHS, 'formats': FORMATS, 'lqip': [LQIP_WIDTH, LQIP_QUALITY]})
+
+
+def source_key(url):
+    return hashlib.sha256(f"{url}|{SETTINGS}".encode()).hexdigest()[:16]
+
+
+def cache_path(url):
+    return os.path.join(CACHE_DIR, hashlib.sha1(url.encode()).hexdigest())
+
+
+def load_manifest(path=MANIFEST_PATH):
+    """{heroine_id: record}, or None when images were never built here (ml/build/ is not
+    versioned, so a fresh clone has no manifest) or it can't be read."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return {int(k): v for k, v in json.load(f).items()}
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({str(k): v for k, v in sorted(manifest.items())}, f, indent=1, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def catalog_fields(record):
+    """embeddings.json fields for one manifest record."""
+    return {
+        'heroine_image_avif': record['avif'],
+        'heroine_image_webp': record['webp'],
+        'heroine_image_lqip': record['lqip'],
+    }
+
+
+def fetch_originals(urls):
+    """Download URLs missing from the local cache; returns {url: error} for failures."""
+    from fetcher import get_fetcher
+    missing = [u for u in urls if not os.path.exists(cache_path(u))]
+    failed = {}
+    if not missing:
+        return failed
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    for url, body, err in get_fetcher().fetch_many(missing):
+        if err:
+            failed[url] = err
+            continue
+        tmp = cache_path(url) + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(body)
+        os.replace(tmp, cache_path(url))
+        count('originals_downloaded')
+    return failed
+
+
+def write_hashed(hid, width, fmt, data):
+    """Write under a content-hashed name (no-op if it exists); returns the file name."""
+    name = f"{hid}-{width}.{hashlib.sha256(data).hexdigest()[:8]}.{fmt}"
+    path = os.path.join(OUT_DIR, name)
+    if not os.path.exists(path):
+        with open(path + '.tmp', 'wb') as f:
+            f.write(data)
+        os.replace(path + '.tmp', path)
+    return name
+
+
+def derive(job):
+    """(heroine_id, record, error) for one heroine; runs in a worker process.
+
+    An original that won't decode or encode (e.g. an HTML error page served
+    with 200) comes back as an error instead of aborting the whole pool.
+    """
+    hid, url = job
+    try:
+        return hid, encode_derivatives(hid, url), None
+    except Exception as e:
+        return hid, None, f"{type(e).__name__}: {e}"
+
+
+def encode_derivatives(hid, url):
+    from PIL import Image, ImageFilter
+
+    img = Image.open(cache_path(url))
+    img = img.convert('RGBA' if img.mode in ('RGBA', 'LA', 'P') else 'RGB')
+
+    # Never upscale: widths past the original collapse to the original width
+    widths = sorted({min(w, img.width) for w in WIDTHS})
+    srcsets = {fmt: [] for fmt, _ in FORMATS}
+    files, total = [], 0
+    for width in widths:
+        height = round(img.height * width / img.width)
+        resized = img if width == img.width else img.resize((width, height), Image.Resampling.LANCZOS)
+        for fmt, quality in FORMATS:
+            buf = BytesIO()
+            resized.save(buf, fmt.upper(), quality=quality)
+            name = write_hashed(hid, width, fmt, buf.getvalue())
+            srcsets[fmt].append(f"{URL_PREFIX}/{name} {width}w")
+            files.append(name)
+            total += buf.tell()
+
+    tiny = img.resize((LQIP_WIDTH, max(1, round(img.height * LQIP_WIDTH / img.width))), Image.Resampling.BILINEAR)
+    buf = BytesIO()
+    tiny.filter(ImageFilter.GaussianBlur(1)).save(buf, 'WEBP', quality=LQIP_QUALITY)
+    lqip = 'data:image/webp;base64,' + base64.b64encode(buf.getvalue()).decode('ascii')
+
+    return {
+        'source': source_key(url),
+        'avif': ', '.join(srcsets['avif']),
+        'webp': ', '.join(srcsets['webp']),
+        'lqip': lqip,
+        'files': files,
+        'bytes': total,
+    }
+
+
+def prune(manifest):
+    """Delete derivative files no manifest record points at; returns the count."""
+    keep = {name for record in manifest.values() for name in record['files']}
+    removed = 0
+    for name in os.listdir(OUT_DIR):
+        if name not in keep and not name.startswith('.'):
+            os.remove(os.path.join(OUT_DIR, name))
+            removed += 1
+    return removed
+
+
+def build_images(db_path=DB_PATH, force=False, workers=None):
+    """Bring the derivatives and manifest up to date; returns a summary dict."""
+    with timer('catalog'):
+        catalog = load_catalog(db_path)
+    # Loaded even on --force: a heroine that fails to download or decode keeps its last good
+    # record, so prune() leaves the files the published embeddings.json points at
+    manifest = load_manifest() or {}
+    os.makedirs(OUT_DIR, exist_ok=True)
+
+    wanted, todo = {}, []
+    for hid, pair in sorted(catalog.by_heroine.items()):
+        url = pair['heroine']['image_url']
+        if not url:
+            continue
+        wanted[hid] = url
+        record = manifest.get(hid)
+        if (not force and record and record['source'] == source_key(url)
+                and all(os.path.exists(os.path.join(OUT_DIR, n)) for n in record['files'])):
+            continue
+        todo.append((hid, url))
+
+    with timer('download'):
+        failed = fetch_originals([url for _, url in todo])
+    for url, err in failed.items():
+        print(f"  ⚠️ {url}: {err}")
+    todo = [(hid, url) for hid, url in todo if url not in failed]
+
+    total = encoded = 0
+    if todo:
+        with timer('encode'):
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for (hid, url), (_, record, err) in zip(todo, pool.map(derive, todo)):
+                    if err:
+                        # Bad bytes in the cache would fail every run: drop them so the next run re-downloads
+                        print(f"  ⚠️ {hid} {url}: {err}")
+                        failed[url] = err
+                        try:
+                            os.remove(cache_path(url))
+                        except OSError:
+                            pass
+                        continue
+                    manifest[hid] = record
+                    total += record['bytes']
+                    encoded += 1
+                    count('heroines_encoded')
+
+    # Drop heroines no longer in the DB; keep the last good record of failed downloads/decodes
+    manifest = {hid: r for hid, r in manifest.items() if hid in wanted}
+    save_manifest(manifest)
+    return {
+        'encoded': encoded, 'failed': len(failed), 'kb': total / 1024,
+        'unchanged': len(wanted) - encoded - len(failed),
+        'pruned': prune(manifest),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AniMatch — responsive heroine image derivatives')
+    parser.add_argument('--force', action='store_true', help='Re-encode every heroine (originals stay cached)')
+    parser.add_argument('--workers', type=int, default=None, help='Encoder processes (default: CPU count)')
+    add_instrument_args(parser)
+    args = parser.parse_args()
+
+    print("🎌 AniMatch — Heroine Images")
+    if not os.path.exists(DB_PATH):
+        print(f"❌ Database not found at {DB_PATH}")
+        return
+
+    with instrumented('heroine_images', args):
+        s = build_images(force=args.force, workers=args.workers)
+        print(f"  ✅ {s['encoded']} encoded ({s['kb']:.0f} KB), {s['unchanged']} unchanged, "
+              f"{s['failed']} failed, {s['pruned']} stale files removed → {OUT_DIR}")
+        if s['encoded']:
+            print("  Next: python main.py refresh (copies srcsets and placeholders into embeddings.json)")
+
+
+if __name__ == '__main__':
+    main()
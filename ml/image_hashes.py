@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+AniMatch — Perceptual Image Hashes
+Catches the same picture showing up for different characters (AniList
+serves one placeholder image for characters without art) before any model
+runs on it, instead of after CLIP in add_character's duplicate check.
+
+Each image gets a 64-bit perceptual hash:
+
+  phash   32×32 grayscale → 2-D DCT → top-left 8×8 (minus DC) vs median
+  dhash   9×8 grayscale → is each pixel brighter than its right neighbour
+
+Both are computed for a whole batch at once in NumPy (the DCT is two
+matrix products). Near-identical images land within a few bits of each
+other, so a lookup is an XOR + popcount of the query against every
+indexed hash as one uint64 array operation.
+
+The catalog's hashes live in ml/cache/image_hashes.json. Building it
+downloads only URLs not indexed yet; add_character.py checks new images
+against it (and against each other) and adds them after a commit.
+
+Usage:
+  python image_hashes.py                 # index catalog images (incremental)
+  python image_hashes.py --duplicates    # list near-identical catalog images
+  python -m bench.image_hashes           # lookup benchmark at 10k images
+"""
+
+import argparse
+import json
+import os
+from functools import lru_cache
+
+from instrument import add_instrument_args, count, instrumented, timer
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(SCRIPT_DIR, '..', 'db', 'animatch.db')
+INDEX_PATH = os.path.join(SCRIPT_DIR, 'cache', 'image_hashes.json')
+
+HASH_SIZE = 8               # 8×8 = 64-bit hashes
+PHASH_SIZE = 32             # pHash input side before the DCT
+DUPLICATE_DISTANCE = 6      # max differing bits (of 64) to call two images the same
+
+
+# --- Hashing -------------------------------------------------------------------
+
+def grayscale_batch(imgs, width, height):
+    """(n, height, width) float32 luminance array for PIL images."""
+    import numpy as np
+    from PIL import Image
+    return np.stack([
+        np.asarray(img.convert('L').resize((width, height), Image.Resampling.LANCZOS), dtype=np.float32)
+        for img in imgs
+    ])
+
+
+def pack_bits(bits):
+    """(n, 64) bool array → list of 64-bit ints (row-major, first bit most significant)."""
+    import numpy as np
+    packed = np.packbits(bits.reshape(len(bits), -1), axis=1)
+    return [int.from_bytes(row.tobytes(), 'big') for row in packed]
+
+
+@lru_cache(maxsize=None)
+def dct_matrix(n):
+    """Orthonormal DCT-II basis; X_dct = C @ X @ C.T."""
+    import numpy as np
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    c = np.sqrt(2.0 / n) * np.cos(np.pi * (2 * i + 1) * k / (2 * n))
+    c[0] /= np.sqrt(2.0)
+    return c.astype(np.float32)
+
+
+def phash_batch(imgs):
+    """64-bit DCT perceptual hashes for a list of PIL images."""
+    import numpy as np
+    if not imgs:
+        return []
+    gray = grayscale_batch(imgs, PHASH_SIZE, PHASH_SIZE)
+    c = dct_matrix(PHASH_SIZE)
+    low = (c @ gray @ c.T)[:, :HASH_SIZE, :HASH_SIZE].reshape(len(imgs), -1)
+    median = np.median(low[:, 1:], axis=1, keepdims=True)  # DC term would dominate the median
+    return pack_bits(low > median)
+
+
+def dhash_batch(imgs):
+    """64-bit difference hashes for a list of PIL images (cheaper, less robust to crops)."""
+    if not imgs:
+        return []
+    gray = grayscale_batch(imgs, HASH_SIZE + 1, HASH_SIZE)
+    return pack_bits(gray[:, :, 1:] > gray[:, :, :-1])
+
+
+def hamming(a, b):
+    return (a ^ b).bit_count()
+
+
+# --- Index ---------------------------------------------------------------------
+
+class ImageHashIndex:
+    """Catalog image hashes: {url: entry} on disk, a uint64 array in memory.
+
+    An entry is {'hash': hex, 'label': str}; the label names the character(s)
+    the image belongs to, for warnings. A lookup is one XOR + popcount over
+    the whole array; at catalog sizes (10k–50k) that beats a BK-tree and a
+    multi-index hash table in Python (see bench.image_hashes).
+    """
+
+    def __init__(self, entries=None, path=INDEX_PATH):
+        self.path = path
+        self.exists = entries is not None
+        self.entries = {}
+        self.urls = []
+        self.hashes = []
+        self.positions = {}   # url → index into urls / hashes
+        self._array = None
+        for url, entry in (entries or {}).items():
+            self.add(url, int(entry['hash'], 16), entry['label'])
+
+    @classmethod
+    def load(cls, path=INDEX_PATH):
+        """The saved index, or an empty one (check `.exists`) when none was built."""
+        try:
+            with open(path, encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            entries = None
+        return cls(entries, path)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, url):
+        return url in self.entries
+
+    def add(self, url, h, label):
+        i = self.positions.get(url)
+        if i is None:
+            self.positions[url] = len(self.urls)
+            self.urls.append(url)
+            self.hashes.append(h)
+        else:
+            self.hashes[i] = h
+        self.entries[url] = {'hash': f"{h:016x}", 'label': label}
+        self._array = None
+
+    def matches(self, h, exclude_url=None, radius=DUPLICATE_DISTANCE):
+        """[(distance, url, label)] of indexed images within `radius` of `h`, nearest first."""
+        import numpy as np
+        if not self.hashes:
+            return []
+        if self._array is None:
+            self._array = np.array(self.hashes, dtype=np.uint64)
+        distances = np.bitwise_count(self._array ^ np.uint64(h))
+        found = [(int(distances[i]), self.urls[i]) for i in np.flatnonzero(distances <= radius)]
+        return [(d, url, self.entries[url]['label']) for d, url in sorted(found) if url != exclude_url]
+
+
+# --- Catalog indexing ------------------------------------------------------------
+
+def catalog_images(db_path=DB_PATH):
+    """{url: label} for every character image in the DB."""
+    import sqlite3
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute("""
+            SELECT c.image_url, c.role, c.id, c.name_ko, a.title_ko
+            FROM characters c JOIN animes a ON c.anime_id = a.id
+            WHERE c.image_url IS NOT NULL AND c.image_url != ''
+            ORDER BY c.id
+        """).fetchall()
+    finally:
+        conn.close()
+    images = {}
+    for url, role, cid, name, title in rows:
+        label = f"{role} {cid} {name} ({title})"
+        images[url] = f"{images[url]}; {label}" if url in images else label
+    return images
+
+
+def index_catalog(index, images, batch_size=64):
+    """Download and hash catalog images missing from `index`; returns (added, failed)."""
+    from fetcher import get_fetcher
+
+    missing = [url for url in images if url not in index]
+    added = failed = 0
+    fetcher = get_fetcher()
+    for start in range(0, len(missing), batch_size):
+        chunk = missing[start:start + batch_size]
+        ok = []
+        for url, img, err in fetcher.fetch_many(chunk, fn=fetcher.get_image):
+            if img is None:
+                failed += 1
+                continue
+            ok.append((url, img))
+        with timer('hash'):
+            hashes = phash_batch([img for _, img in ok])
+        for (url, _), h in zip(ok, hashes):
+            index.add(url, h, images[url])
+            added += 1
+    count('images_hashed', added)
+    return added, failed
+
+
+def duplicate_groups(index, radius=DUPLICATE_DISTANCE):
+    """Connected groups of indexed images within `radius` of each other."""
+    seen, groups = set(), []
+    for url, entry in index.entries.items():
+        if url in seen:
+            continue
+        group, stack = [], [url]
+        seen.add(url)
+        while stack:
+            u = stack.pop()
+            group.append(u)
+            for _, other, _ in index.matches(int(index.entries[u]['hash'], 16), radius=radius):
+                if other not in seen:
+                    seen.add(other)
+                    stack.append(other)
+        # A single URL shared by several characters is a duplicate too (labels joined by ';')
+        if len(group) > 1 or ';' in index.entries[url]['label']:
+            groups.append(group)
+    return groups
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AniMatch — perceptual hashes of catalog images')
+    parser.add_argument('--duplicates', action='store_true', help='List near-identical catalog images')
+    parser.add_argument('--rebuild', action='store_true', help='Re-download and re-hash every image')
+    parser.add_argument('--radius', type=int, default=DUPLICATE_DISTANCE, help='Max differing bits')
+    add_instrument_args(parser)
+    args = parser.parse_args()
+
+    print("🎌 AniMatch — Image Hashes")
+    if not os.path.exists(DB_PATH):
+        print(f"❌ Database not found at {DB_PATH}")
+        return
+
+    with instrumented('image_hashes', args):
+        images = catalog_images()
+        index = ImageHashIndex() if args.rebuild else ImageHashIndex.load()
+        # Labels follow the DB; drop images no character uses anymore
+        index = ImageHashIndex({url: {**e, 'label': images[url]} for url, e in index.entries.items()
+                                if url in images})
+        added, failed = index_catalog(index, images)
+        index.save()
+        print(f"  ✅ {len(index)} images indexed ({added} new, {failed} failed) → {INDEX_PATH}")
+
+        if args.duplicates:
+            groups = duplicate_groups(index, args.radius)
+            if not groups:
+                print("  ✅ No near-identical images")
+            for group in groups:
+                print(f"  ⚠️ {len(group)} near-identical images:")
+                for url in group:
+                    print(f"     - {index.entries[url]['label']}  {url}")
+
+
+if __name__ == '__main__':
+    main()
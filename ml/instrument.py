@@ -0,0 +1,252 @@
+"""
+Lightweight run instrumentation for the ml/ scripts.
+
+Stage timers, counters and memory sampling that cost a few microseconds
+per call, collected into one run report:
+
+    from instrument import add_instrument_args, instrumented, timer, count
+
+    add_instrument_args(parser)
+    args = parser.parse_args()
+    with instrumented('generate_embeddings', args):
+        with timer('download'):
+            ...
+        count('images_ok')
+
+`timer`/`count` are no-ops outside an instrumented run, so library
+functions can call them unconditionally. Timers are thread-safe (the
+fetcher's download workers use them); stage time is summed over threads,
+so a concurrent stage's share of wall time can exceed 100%.
+
+At exit the run writes ml/reports/<job>.json (or --report PATH), an
+optional Prometheus textfile (--prometheus PATH, for node_exporter's
+textfile collector), and prints a per-stage table. --profile wraps the
+run in cProfile and saves ml/reports/<job>.prof; --trace-malloc adds
+Python heap peaks from tracemalloc (slower).
+"""
+
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPORT_DIR = os.path.join(SCRIPT_DIR, 'reports')
+PROFILE_TOP = 25
+
+_current = None
+
+
+def rss_bytes():
+    """Current resident set size (Linux /proc), falling back to the peak."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return peak_rss_bytes()
+
+
+def peak_rss_bytes():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024  # macOS reports bytes
+
+
+class StageStats:
+    __slots__ = ('calls', 'total', 'max', 'rss_max')
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rss_max = 0
+
+
+class Run:
+    def __init__(self, job, trace_malloc=False):
+        self.job = job
+        self.trace_malloc = trace_malloc
+        self.stages = {}
+        self.counters = {}
+        self.lock = threading.Lock()
+        self.started_at = time.time()
+        self.t0 = time.perf_counter()
+        self.status = 'running'
+
+    @contextmanager
+    def timer(self, stage):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - t0
+            rss = rss_bytes()
+            with self.lock:
+                s = self.stages.get(stage)
+                if s is None:
+                    s = self.stages[stage] = StageStats()
+                s.calls += 1
+                s.total += elapsed
+                s.max = max(s.max, elapsed)
+                s.rss_max = max(s.rss_max, rss)
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def report(self):
+        wall = time.perf_counter() - self.t0
+        memory = {'peak_rss_mb': round(peak_rss_bytes() / 2**20, 1)}
+        if self.trace_malloc:
+            import tracemalloc
+            current, peak = tracemalloc.get_traced_memory()
+            memory['tracemalloc_current_mb'] = round(current / 2**20, 1)
+            memory['tracemalloc_peak_mb'] = round(peak / 2**20, 1)
+        return {
+            'job': self.job,
+            'status': self.status,
+            'started_at': self.started_at,
+            'wall_s': round(wall, 3),
+            'stages': {
+                name: {
+                    'calls': s.calls,
+                    'total_s': round(s.total, 4),
+                    'mean_ms': round(s.total / s.calls * 1000, 2),
+                    'max_ms': round(s.max * 1000, 2),
+                    'per_s': round(s.calls / s.total, 2) if s.total else None,
+                    'share': round(s.total / wall, 3) if wall else None,
+                    'rss_max_mb': round(s.rss_max / 2**20, 1),
+                }
+                for name, s in self.stages.items()
+            },
+            'counters': dict(self.counters),
+            'throughput_per_s': {k: round(v / wall, 2) for k, v in self.counters.items()} if wall else {},
+            'memory': memory,
+        }
+
+
+def timer(stage):
+    """Time a block under `stage` in the current run (no-op without one)."""
+    run = _current
+    return run.timer(stage) if run is not None else nullcontext()
+
+
+def count(name, n=1):
+    run = _current
+    if run is not None:
+        run.count(name, n)
+
+
+def add_instrument_args(parser):
+    group = parser.add_argument_group('instrumentation')
+    group.add_argument('--report', type=str, default=None,
+                       help='Run report JSON path (default: ml/reports/<job>.json)')
+    group.add_argument('--prometheus', type=str, default=None,
+                       help='Also write metrics in Prometheus textfile format to this path')
+    group.add_argument('--profile', action='store_true',
+                       help='Run under cProfile; saves ml/reports/<job>.prof and prints the top functions')
+    group.add_argument('--trace-malloc', action='store_true',
+                       help='Track Python heap peaks with tracemalloc (slower)')
+    return group
+
+
+def prometheus_text(report):
+    job = report['job']
+    lines = []
+
+    def metric(name, kind, help_, samples):
+        lines.append(f"# HELP animatch_{name} {help_}")
+        lines.append(f"# TYPE animatch_{name} {kind}")
+        for labels, value in samples:
+            # `script`, not `job`: Prometheus reserves `job` for the scrape target
+            label_str = ','.join(f'{k}="{v}"' for k, v in {'script': job, **labels}.items())
+            lines.append(f"animatch_{name}{{{label_str}}} {value}")
+
+    metric('run_seconds', 'gauge', 'Wall time of the last run',
+           [({'status': report['status']}, report['wall_s'])])
+    metric('run_timestamp_seconds', 'gauge', 'Start time of the last run',
+           [({}, report['started_at'])])
+    metric('stage_seconds_total', 'counter', 'Time spent per stage',
+           [({'stage': k}, v['total_s']) for k, v in report['stages'].items()])
+    metric('stage_calls_total', 'counter', 'Timed calls per stage',
+           [({'stage': k}, v['calls']) for k, v in report['stages'].items()])
+    metric('items_total', 'counter', 'Run counters',
+           [({'counter': k}, v) for k, v in report['counters'].items()])
+    metric('peak_rss_bytes', 'gauge', 'Peak resident set size',
+           [({}, int(report['memory']['peak_rss_mb'] * 2**20))])
+    if 'tracemalloc_peak_mb' in report['memory']:
+        metric('tracemalloc_peak_bytes', 'gauge', 'Peak traced Python heap',
+               [({}, int(report['memory']['tracemalloc_peak_mb'] * 2**20))])
+    return '\n'.join(lines) + '\n'
+
+
+def write_atomic(path, text):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp, path)  # textfile collectors must never see a partial file
+
+
+def print_summary(report):
+    stages = sorted(report['stages'].items(), key=lambda kv: -kv[1]['total_s'])
+    print(f"\n📊 {report['job']}: {report['wall_s']:.2f}s wall, "
+          f"peak RSS {report['memory']['peak_rss_mb']:.0f} MB")
+    if stages:
+        print(f"  {'Stage':<18} {'Calls':>6} {'Total s':>8} {'Mean ms':>8} {'/s':>8} {'Share':>6}")
+        for name, s in stages:
+            per_s = f"{s['per_s']:.1f}" if s['per_s'] else '-'
+            print(f"  {name:<18} {s['calls']:>6} {s['total_s']:>8.2f} {s['mean_ms']:>8.1f} "
+                  f"{per_s:>8} {s['share'] or 0:>6.0%}")
+    if report['counters']:
+        print('  ' + ', '.join(f"{k}={v}" for k, v in report['counters'].items()))
+
+
+@contextmanager
+def instrumented(job, args=None):
+    """Make a Run current for the block and write its report afterwards."""
+    global _current
+    report_path = getattr(args, 'report', None) or os.path.join(REPORT_DIR, f"{job}.json")
+    prom_path = getattr(args, 'prometheus', None)
+    profile = getattr(args, 'profile', False)
+    trace_malloc = getattr(args, 'trace_malloc', False)
+
+    if trace_malloc:
+        import tracemalloc
+        tracemalloc.start()
+    profiler = None
+    if profile:
+        import cProfile
+        profiler = cProfile.Profile()
+
+    run = Run(job, trace_malloc=trace_malloc)
+    _current = run
+    if profiler:
+        profiler.enable()
+    try:
+        yield run
+        run.status = 'ok'
+    except BaseException:
+        run.status = 'failed'
+        raise
+    finally:
+        if profiler:
+            profiler.disable()
+        _current = None
+        report = run.report()
+        if trace_malloc:
+            import tracemalloc
+            tracemalloc.stop()
+        write_atomic(report_path, json.dumps(report, indent=2) + '\n')
+        if prom_path:
+            write_atomic(prom_path, prometheus_text(report))
+        print_summary(report)
+        print(f"  📝 Report: {report_path}")
+        if profiler:
+            import pstats
+            prof_path = os.path.join(os.path.dirname(os.path.abspath(report_path)), f"{job}.prof")
+            profiler.dump_stats(prof_path)
+            print(f"  🔬 Profile: {prof_path} (top {PROFILE_TOP} by cumulative time)")
+            pstats.Stats(profiler).sort_stats('cumulative').print_stats(PROFILE_TOP)
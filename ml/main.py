@@ -1,5 +1,105 @@
-def main():
-    print("Hello from ml!")
+#!/usr/bin/env python3
+"""
+AniMatch — ML Pipeline CLI
+One entry point for the scripts in ml/. The CLI itself imports only the
+standard library; each subcommand runs its script as `__main__`, so torch,
+open_clip, onnx and onnxruntime load only for the commands that use them.
+Everything after the subcommand is passed through to the script.
+
+Usage:
+  python main.py embed [--resume]
+  python main.py dual [--resume]
+  python main.py add --batch new_characters.json --dry-run
+  python main.py export {clip,clip-lite,arcface} [args...]
+  python main.py refresh [--dry-run]
+  python main.py images [--force]
+  python main.py hashes [--duplicates]
+  python main.py similar [--k 6]
+  python main.py text-embed [--model ...]
+  python main.py translate [--translator google]
+  python main.py sync-seed
+  python main.py d1-diff [--mark-deployed]
+  python main.py rollup --export /tmp/d1.sql
+  python main.py quantize {clip,clip-q4,arcface}
+  python main.py analyze
+  python main.py og {data,default,cards}
+  python main.py build [stages...] [--dry-run]
+
+Startup cost per subcommand: python -m bench.cli_startup
+"""
+
+import runpy
+import sys
+
+# name → (module, help) or {target: (module, help)}
+COMMANDS = {
+    'embed': ('generate_embeddings', 'CLIP embeddings for all protagonists'),
+    'dual': ('generate_dual_embeddings', 'ArcFace embeddings merged into embeddings.json'),
+    'add': ('add_character', 'Add characters to the DB and embeddings'),
+    'export': {
+        'clip': ('export_clip_onnx', 'CLIP image encoder → ONNX'),
+        'clip-lite': ('export_clip_lite', 'Lower-resolution CLIP encoder + embeddings'),
+        'arcface': ('export_arcface_onnx', 'MobileFaceNet → ONNX'),
+    },
+    'refresh': ('refresh_metadata', 'Update embeddings.json metadata from the DB (changed fields only)'),
+    'hashes': ('image_hashes', 'Perceptual hashes of catalog images (near-duplicate check)'),
+    'images': ('heroine_images', 'Responsive AVIF/WebP heroine images + LQIP placeholders'),
+    'translate': ('translate', 'Fill en/ja/zh-TW columns from the translation memory'),
+    'sync-seed': ('sync_seed', 'Regenerate db/seed.sql from animatch.db'),
+    'd1-diff': ('d1_diff', 'Minimal D1 upserts/deletes vs the deployed row hashes'),
+    'rollup': ('analytics_rollup', 'Hourly/daily analytics rollups → upsert SQL for D1'),
+    'quantize': {
+        'clip': ('quantize_model', 'CLIP encoder → INT8'),
+        'clip-q4': ('quantize_clip_q4', 'CLIP encoder → UINT4'),
+        'arcface': ('quantize_arcface', 'MobileFaceNet → INT8'),
+    },
+    'similar': ('similar_characters', 'Top-k similar characters graph (public/similar.json)'),
+    'text-embed': ('text_embeddings', 'CLIP text vectors for tag/genre/personality search'),
+    'analyze': ('analyze_embeddings', 'Similarity statistics for embeddings.json'),
+    'og': {
+        'data': ('generate_og_data', 'Character constant for OG middleware (TypeScript)'),
+        'default': ('generate_og_default', 'Default 1200x630 OG image'),
+        'cards': ('generate_og_cards', 'WebP OG card per heroine (public/og/)'),
+    },
+    'build': ('pipeline', 'Content build: embed → dual → export → og data, images, similar, text-embed, sync-seed'),
+}
+
+
+def usage():
+    lines = ["usage: python main.py <command> [target] [args...]", "", "commands:"]
+    for name, entry in COMMANDS.items():
+        if isinstance(entry, dict):
+            lines.append(f"  {name}")
+            lines += [f"    {target:<12} {help_}" for target, (_, help_) in entry.items()]
+        else:
+            lines.append(f"  {name:<14} {entry[1]}")
+    return '\n'.join(lines)
+
+
+def resolve(argv):
+    """(module, prog, remaining args) for argv, or exit with usage."""
+    if not argv or argv[0] in ('-h', '--help'):
+        print(usage())
+        raise SystemExit(0 if argv else 2)
+    name, rest = argv[0], argv[1:]
+    entry = COMMANDS.get(name)
+    if entry is None:
+        print(f"❌ Unknown command: {name}\n\n{usage()}", file=sys.stderr)
+        raise SystemExit(2)
+    if isinstance(entry, dict):
+        if not rest or rest[0] not in entry:
+            print(f"❌ {name} needs one of: {', '.join(entry)}", file=sys.stderr)
+            raise SystemExit(2)
+        name, target, rest = f"{name} {rest[0]}", entry[rest[0]], rest[1:]
+    else:
+        target = entry
+    return target[0], f"main.py {name}", rest
+
+
+def main(argv=None):
+    module, prog, rest = resolve(sys.argv[1:] if argv is None else argv)
+    sys.argv = [prog, *rest]
+    runpy.run_module(module, run_name='__main__')
 
 
 if __name__ == "__main__":
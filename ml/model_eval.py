@@ -0,0 +1,128 @@
+"""
+Shared helpers for comparing model variants (fp16, reduced resolution, ...)
+against the fp32 reference: preprocessing, probe images, CPU latency and
+retrieval agreement against the shipped catalog.
+"""
+
+import glob
+import json
+import os
+import time
+
+import numpy as np
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+EMBEDDINGS_PATH = os.path.join(SCRIPT_DIR, '..', 'public', 'embeddings.json')
+PROBE_IMAGE_DIR = os.path.join(SCRIPT_DIR, 'images', 'protagonists')
+
+CLIP_MEAN = np.array([0.48145466, 0.4578275, 0.40821073], dtype=np.float32)
+CLIP_STD = np.array([0.26862954, 0.26130258, 0.27577711], dtype=np.float32)
+CLIP_INPUT_SIZE = 224
+ARCFACE_INPUT_SIZE = 112
+LATENCY_RUNS = 10
+
+
+def clip_preprocess(img, size=CLIP_INPUT_SIZE):
+    """PIL image → [1, 3, size, size] float32 (bicubic resize + center crop)."""
+    from PIL import Image
+    w, h = img.size
+    scale = size / min(w, h)
+    img = img.resize((max(size, round(w * scale)), max(size, round(h * scale))), Image.BICUBIC)
+    w, h = img.size
+    left = (w - size) // 2
+    top = (h - size) // 2
+    img = img.crop((left, top, left + size, top + size))
+    arr = np.asarray(img, dtype=np.float32) / 255.0
+    arr = (arr - CLIP_MEAN) / CLIP_STD
+    return arr.transpose(2, 0, 1)[np.newaxis].astype(np.float32)
+
+
+def arcface_preprocess(img):
+    """PIL image → [1, 3, 112, 112] float32 (square crop, (x/255 - 0.5) / 0.5)."""
+    from PIL import Image
+    w, h = img.size
+    min_dim = min(w, h)
+    left = (w - min_dim) // 2
+    top = (h - min_dim) // 2
+    img = img.crop((left, top, left + min_dim, top + min_dim))
+    img = img.resize((ARCFACE_INPUT_SIZE, ARCFACE_INPUT_SIZE), Image.LANCZOS)
+    arr = np.asarray(img, dtype=np.float32)
+    arr = (arr / 255.0 - 0.5) / 0.5
+    return arr.transpose(2, 0, 1)[np.newaxis].astype(np.float32)
+
+
+def load_probe_images(limit=100, image_dir=PROBE_IMAGE_DIR):
+    """Cached protagonist images (see generate_dual_embeddings.py)."""
+    from PIL import Image
+    paths = sorted(
+        p for p in glob.glob(os.path.join(image_dir, '*'))
+        if p.lower().endswith(('.jpg', '.jpeg', '.png', '.webp'))
+    )[:limit]
+    images = []
+    for p in paths:
+        try:
+            images.append(Image.open(p).convert('RGB'))
+        except Exception as e:
+            print(f"  ⚠️ Skipping probe {os.path.basename(p)}: {e}")
+    return images
+
+
+def load_catalog_matrix(field='embedding', path=EMBEDDINGS_PATH):
+    """(N, D) L2-normalized matrix of catalog vectors for `field`.
+
+    Characters missing the field (e.g. no ArcFace face) are dropped.
+    """
+    with open(path, encoding='utf-8') as f:
+        chars = json.load(f)['characters']
+    rows = [c[field] for c in chars if c.get(field)]
+    mat = np.asarray(rows, dtype=np.float32)
+    if len(mat):
+        mat /= np.linalg.norm(mat, axis=1, keepdims=True)
+    return mat
+
+
+def l2_normalize(x):
+    x = np.asarray(x, dtype=np.float32).reshape(len(x), -1)
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    return x / np.where(norms > 0, norms, 1)
+
+
+def embed(session, inputs):
+    """Run a session over a list of [1, ...] inputs; returns (N, D) normalized."""
+    name = session.get_inputs()[0].name
+    out = [session.run(None, {name: x.astype(np.float32)})[0].reshape(-1) for x in inputs]
+    return l2_normalize(np.stack(out))
+
+
+def cpu_latency_ms(session, feed_input, runs=LATENCY_RUNS):
+    """Median single-image CPU latency in ms (after one warmup run)."""
+    name = session.get_inputs()[0].name
+    feed = {name: feed_input.astype(np.float32)}
+    session.run(None, feed)
+    times = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        session.run(None, feed)
+        times.append((time.perf_counter() - t0) * 1000)
+    return float(np.median(times))
+
+
+def retrieval_agreement(ref_queries, test_queries, catalog, ks=(1, 3), test_catalog=None):
+    """How often the variant's top-k catalog matches equal the reference's.
+
+    top-1: same best match. top-k (k > 1): the reference top-1 appears in
+    the variant's top-k. `test_catalog` lets the variant rank against its
+    own re-embedded catalog (same row order) instead of the reference one.
+    The mean query cosine similarity is only meaningful when both sides
+    share an embedding space, i.e. without `test_catalog`.
+    """
+    if test_catalog is None:
+        test_catalog = catalog
+    ref_rank = np.argsort(-(ref_queries @ catalog.T), axis=1)
+    test_rank = np.argsort(-(test_queries @ test_catalog.T), axis=1)
+    result = {}
+    for k in ks:
+        hits = [ref_rank[i, 0] in test_rank[i, :k] for i in range(len(ref_rank))]
+        result[f"top{k}"] = float(np.mean(hits)) if hits else 0.0
+    result['cosine'] = float(np.mean(np.sum(ref_queries * test_queries, axis=1))) if len(ref_queries) else 0.0
+    return result
@@ -0,0 +1,93 @@
+"""Shared look for the OG images (default card and per-character cards).
+
+Colors, a NumPy-built background gradient, and fonts resolved once per
+process from a cross-platform candidate list (set ANIMATCH_OG_FONT /
+ANIMATCH_OG_FONT_BOLD to override). Korean names need a CJK font; on a
+machine without one, Pillow's built-in font is used and a warning printed.
+"""
+
+import os
+import re
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image, ImageFont
+
+W, H = 1200, 630
+
+# Colors matching the app theme
+BG_TOP = (26, 16, 64)       # #1a1040
+BG_BOTTOM = (15, 23, 42)    # #0F172A
+PRIMARY = (255, 107, 157)   # #FF6B9D
+SECONDARY = (192, 132, 252) # #C084FC
+TEXT = (241, 245, 249)      # #F1F5F9
+TEXT_DIM = (148, 163, 184)  # #94A3B8
+
+FONT_CANDIDATES = [
+    "/System/Library/Fonts/AppleSDGothicNeo.ttc",
+    "/System/Library/Fonts/Helvetica.ttc",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "C:/Windows/Fonts/malgun.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+]
+BOLD_FONT_CANDIDATES = [
+    "/System/Library/Fonts/AppleSDGothicNeo.ttc",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Bold.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Bold.ttc",
+    "/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf",
+    "C:/Windows/Fonts/malgunbd.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+]
+CJK_HINTS = ("CJK", "Gothic", "malgun", "Nanum")
+
+HEX_COLOR = re.compile(r"#([0-9a-fA-F]{6})")
+
+
+def vertical_gradient(w: int, h: int, top: tuple, bottom: tuple) -> Image.Image:
+    """RGB image fading from `top` to `bottom`, built as one array."""
+    t = np.linspace(0.0, 1.0, h, endpoint=False, dtype=np.float32)[:, None]
+    rows = np.asarray(top, np.float32) + (np.asarray(bottom, np.float32) - np.asarray(top, np.float32)) * t
+    return Image.fromarray(np.repeat(rows[:, None, :], w, axis=1).astype(np.uint8), "RGB")
+
+
+def horizontal_gradient(w: int, h: int, left: tuple, right: tuple) -> Image.Image:
+    t = np.linspace(0.0, 1.0, w, dtype=np.float32)[:, None]
+    cols = np.asarray(left, np.float32) + (np.asarray(right, np.float32) - np.asarray(left, np.float32)) * t
+    return Image.fromarray(np.repeat(cols[None, :, :], h, axis=0).astype(np.uint8), "RGB")
+
+
+def css_gradient_colors(css: str | None, default=(PRIMARY, SECONDARY)) -> tuple:
+    """First and last hex colors of a CSS gradient (characters.color_primary)."""
+    found = HEX_COLOR.findall(css or "")
+    if len(found) < 2:
+        return default
+    return tuple(tuple(int(c[i:i + 2], 16) for i in (0, 2, 4)) for c in (found[0], found[-1]))
+
+
+def font_path(bold: bool = False) -> str | None:
+    override = os.environ.get("ANIMATCH_OG_FONT_BOLD" if bold else "ANIMATCH_OG_FONT")
+    if override:
+        return override
+    for path in BOLD_FONT_CANDIDATES if bold else FONT_CANDIDATES:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def has_cjk_font() -> bool:
+    path = font_path() or ""
+    return "ANIMATCH_OG_FONT" in os.environ or any(h in path for h in CJK_HINTS)
+
+
+@lru_cache(maxsize=None)
+def font(size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
+    """Font at `size`, loaded once per process."""
+    path = font_path(bold)
+    if path:
+        try:
+            return ImageFont.truetype(path, size)
+        except OSError:
+            pass
+    return ImageFont.load_default(size)
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+AniMatch — Chunked Model Packaging
+Splits each ONNX model into a small graph file plus fixed-size,
+content-hashed weight chunks so the worker can download them in parallel,
+cache each chunk separately in the service worker and resume after a
+dropped connection instead of restarting an ~85 MB download.
+
+Weights are moved to ONNX external data first, so the graph stays a
+separate (tiny) file and the weight blob is a plain byte stream that can be
+cut anywhere.
+
+Output per model (e.g. clip-image-encoder-q8.onnx):
+  public/models/chunks/clip-image-encoder-q8/graph.<hash>.onnx
+  public/models/chunks/clip-image-encoder-q8/<hash>.bin ...
+  public/models/clip-image-encoder-q8.manifest.json
+
+Chunk names are content hashes, so unchanged chunks keep their URL (and
+their immutable cache entry) across releases. The manifest's name is
+fixed, so it is served with `Cache-Control: no-cache` (public/_headers,
+functions/models/[[path]].ts) and clients always see the current one.
+
+Packaging never deletes chunks: a client that loaded the previous
+manifest just before a deploy still finds the chunks it names. Run
+--prune in a later release to remove chunks no current manifest uses.
+
+Usage:
+  python ml/package_models.py                          # package all models
+  python ml/package_models.py --chunk-mb 4 --models clip-image-encoder-q8.onnx
+  python ml/package_models.py --verify                 # reassemble + check manifests
+  python ml/package_models.py --prune                  # delete chunks no manifest references
+  pnpm deploy:models                                   # verify, then upload chunks + manifests to R2
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), '..', 'public', 'models')
+CHUNKS_DIRNAME = 'chunks'
+MANIFEST_SUFFIX = '.manifest.json'
+DEFAULT_CHUNK_MB = 8
+HASH_LEN = 16  # hex chars kept in file names
+MANIFEST_VERSION = 1
+
+
+def sha256_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_file(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def list_models(model_dir, names=None):
+    if names:
+        return [os.path.join(model_dir, n) for n in names]
+    return sorted(
+        os.path.join(model_dir, f) for f in os.listdir(model_dir)
+        if f.endswith('.onnx') and not f.startswith('_')
+    )
+
+
+def split_external_data(model_path, workdir):
+    """Re-save the model with all weights in one external data file.
+
+    Returns (graph_path, data_path). The external data location recorded in
+    the graph is the bare file name `weights.bin`, which the verifier and the
+    browser loader both resolve against the reassembled blob.
+    """
+    import onnx
+
+    model = onnx.load(model_path)
+    graph_path = os.path.join(workdir, 'graph.onnx')
+    onnx.save_model(
+        model,
+        graph_path,
+        save_as_external_data=True,
+        all_tensors_to_one_file=True,
+        location='weights.bin',
+        size_threshold=0,
+    )
+    return graph_path, os.path.join(workdir, 'weights.bin')
+
+
+def write_chunks(data_path, out_dir, chunk_size):
+    """Cut the weight blob into chunks named by content hash."""
+    chunks = []
+    offset = 0
+    with open(data_path, 'rb') as f:
+        while True:
+            block = f.read(chunk_size)
+            if not block:
+                break
+            digest = sha256_bytes(block)
+            name = f"{digest[:HASH_LEN]}.bin"
+            with open(os.path.join(out_dir, name), 'wb') as out:
+                out.write(block)
+            chunks.append({'file': name, 'offset': offset, 'size': len(block), 'sha256': digest})
+            offset += len(block)
+    return chunks
+
+
+def package_model(model_path, model_dir, chunk_size):
+    """Package one model and write its manifest. Returns the manifest dict."""
+    stem = os.path.splitext(os.path.basename(model_path))[0]
+    out_dir = os.path.join(model_dir, CHUNKS_DIRNAME, stem)
+
+    # Previous releases' chunks stay until --prune (clients may still hold the old manifest)
+    os.makedirs(out_dir, exist_ok=True)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        graph_tmp, data_tmp = split_external_data(model_path, workdir)
+
+        graph_hash = sha256_file(graph_tmp)
+        graph_name = f"graph.{graph_hash[:HASH_LEN]}.onnx"
+        shutil.copyfile(graph_tmp, os.path.join(out_dir, graph_name))
+
+        chunks = write_chunks(data_tmp, out_dir, chunk_size)
+        data_size = os.path.getsize(data_tmp)
+        data_hash = sha256_file(data_tmp)
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'model': os.path.basename(model_path),
+        'base': f"{CHUNKS_DIRNAME}/{stem}/",
+        'graph': {
+            'file': graph_name,
+            'size': os.path.getsize(os.path.join(out_dir, graph_name)),
+            'sha256': graph_hash,
+        },
+        'external_data': {
+            'location': 'weights.bin',
+            'size': data_size,
+            'sha256': data_hash,
+            'chunk_size': chunk_size,
+            'chunks': chunks,
+        },
+    }
+    manifest_path = os.path.join(model_dir, stem + MANIFEST_SUFFIX)
+    tmp = manifest_path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, manifest_path)
+    return manifest
+
+
+def list_manifests(model_dir):
+    return sorted(
+        os.path.join(model_dir, f) for f in os.listdir(model_dir)
+        if f.endswith(MANIFEST_SUFFIX)
+    )
+
+
+def prune_chunks(model_dir):
+    """Delete files under chunks/ that no current manifest references; returns (files, bytes)."""
+    keep = set()
+    for path in list_manifests(model_dir):
+        with open(path, encoding='utf-8') as f:
+            manifest = json.load(f)
+        base = os.path.normpath(os.path.join(model_dir, manifest['base']))
+        keep.add(os.path.join(base, manifest['graph']['file']))
+        keep.update(os.path.join(base, c['file']) for c in manifest['external_data']['chunks'])
+
+    removed = freed = 0
+    root = os.path.join(model_dir, CHUNKS_DIRNAME)
+    for dirpath, _, files in os.walk(root):
+        for name in files:
+            path = os.path.normpath(os.path.join(dirpath, name))
+            if path not in keep:
+                freed += os.path.getsize(path)
+                os.remove(path)
+                removed += 1
+    return removed, freed
+
+
+def verify_manifest(manifest_path, run_inference=True):
+    """Reassemble a packaged model from its chunks and check every hash.
+
+    Returns a list of error strings (empty when the package is sound).
+    """
+    model_dir = os.path.dirname(manifest_path)
+    with open(manifest_path, encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    base = os.path.join(model_dir, manifest['base'])
+    errors = []
+
+    graph_path = os.path.join(base, manifest['graph']['file'])
+    if not os.path.exists(graph_path):
+        return [f"missing graph {manifest['graph']['file']}"]
+    if sha256_file(graph_path) != manifest['graph']['sha256']:
+        errors.append('graph hash mismatch')
+
+    ext = manifest['external_data']
+    with tempfile.TemporaryDirectory() as workdir:
+        data_path = os.path.join(workdir, ext['location'])
+        whole = hashlib.sha256()
+        expected_offset = 0
+        with open(data_path, 'wb') as out:
+            for chunk in ext['chunks']:
+                if chunk['offset'] != expected_offset:
+                    errors.append(f"chunk {chunk['file']} offset gap at {expected_offset}")
+                chunk_path = os.path.join(base, chunk['file'])
+                if not os.path.exists(chunk_path):
+                    errors.append(f"missing chunk {chunk['file']}")
+                    continue
+                with open(chunk_path, 'rb') as f:
+                    block = f.read()
+                if len(block) != chunk['size'] or sha256_bytes(block) != chunk['sha256']:
+                    errors.append(f"chunk {chunk['file']} corrupt")
+                out.write(block)
+                whole.update(block)
+                expected_offset += len(block)
+
+        if expected_offset != ext['size']:
+            errors.append(f"reassembled size {expected_offset} != {ext['size']}")
+        if whole.hexdigest() != ext['sha256']:
+            errors.append('reassembled weights hash mismatch')
+
+        if not errors and run_inference:
+            shutil.copyfile(graph_path, os.path.join(workdir, 'graph.onnx'))
+            errors.extend(check_against_source(
+                os.path.join(workdir, 'graph.onnx'),
+                os.path.join(model_dir, manifest['model']),
+            ))
+    return errors
+
+
+def check_against_source(graph_path, source_path):
+    """Run the reassembled model and the source model on the same input."""
+    import numpy as np
+    import onnxruntime as ort
+
+    if not os.path.exists(source_path):
+        return []  # source not kept locally; hash checks already passed
+
+    opts = ['CPUExecutionProvider']
+    rebuilt = ort.InferenceSession(graph_path, providers=opts)
+    source = ort.InferenceSession(source_path, providers=opts)
+    inp = source.get_inputs()[0]
+    shape = [1 if isinstance(d, str) or not d else d for d in inp.shape]
+    dummy = np.random.randn(*shape).astype(np.float32)
+    a = rebuilt.run(None, {inp.name: dummy})[0]
+    b = source.run(None, {inp.name: dummy})[0]
+    if not np.array_equal(a, b):
+        return [f"output differs from source (max diff {np.abs(a - b).max():.6f})"]
+    return []
+
+
+def cmd_package(args):
+    chunk_size = int(args.chunk_mb * 1024 * 1024)
+    models = list_models(args.model_dir, args.models)
+    if not models:
+        print("❌ No models found. Run export/quantize scripts first.")
+        sys.exit(1)
+
+    for model_path in models:
+        print(f"📦 {os.path.basename(model_path)}")
+        manifest = package_model(model_path, args.model_dir, chunk_size)
+        ext = manifest['external_data']
+        print(f"  ✅ graph {manifest['graph']['size'] / 1024:.1f} KB + "
+              f"{len(ext['chunks'])} chunks ({ext['size'] / (1024 * 1024):.1f} MB)")
+
+
+def cmd_prune(args):
+    removed, freed = prune_chunks(args.model_dir)
+    print(f"  ✅ Removed {removed} unreferenced chunk files ({freed / (1024 * 1024):.1f} MB)")
+
+
+def cmd_verify(args):
+    manifests = list_manifests(args.model_dir)
+    if not manifests:
+        print("❌ No manifests found. Run without --verify first.")
+        sys.exit(1)
+
+    failed = 0
+    for path in manifests:
+        errors = verify_manifest(path, run_inference=not args.skip_inference)
+        name = os.path.basename(path)
+        if errors:
+            failed += 1
+            print(f"  ❌ {name}")
+            for err in errors:
+                print(f"     - {err}")
+        else:
+            print(f"  ✅ {name}")
+    sys.exit(1 if failed else 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AniMatch — chunked model packaging')
+    parser.add_argument('--model-dir', default=MODEL_DIR)
+    parser.add_argument('--models', nargs='*', help='Model file names (default: all in model dir)')
+    parser.add_argument('--chunk-mb', type=float, default=DEFAULT_CHUNK_MB)
+    parser.add_argument('--verify', action='store_true', help='Reassemble and verify existing manifests')
+    parser.add_argument('--skip-inference', action='store_true', help='Verify hashes only')
+    parser.add_argument('--prune', action='store_true',
+                        help='Delete chunks no current manifest references (run a release after packaging)')
+    args = parser.parse_args()
+
+    print("🎌 AniMatch — Chunked Model Packaging\n")
+    if args.verify:
+        cmd_verify(args)
+    elif args.prune:
+        cmd_prune(args)
+    else:
+        cmd_package(args)
+
+
+if __name__ == '__main__':
+    main()
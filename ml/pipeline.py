@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+AniMatch — Content Build Pipeline
+Runs the release content build as a dependency graph instead of five
+scripts in a remembered order:
+
+  embed ──► dual ──► export ──► og-data
+                      ▲    ├──► similar
+                   images  └──► text-embed
+  sync-seed
+
+Each stage declares what it reads (files, or the DB rows it depends on)
+and which stages it runs after. A stage's fingerprint hashes those inputs
+plus its upstream fingerprints; when it matches the last successful build
+and the outputs exist, the stage is skipped. Independent stages run in
+parallel threads, and the embeddings document is parsed once and handed
+from stage to stage in memory, then written once at the end.
+
+Usage:
+  python pipeline.py                 # build everything that is out of date
+  python pipeline.py og-data         # just og-data (and whatever it needs)
+  python pipeline.py --dry-run       # show what would run
+  python pipeline.py --force dual    # rebuild dual (and its dependencies)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from checkpoint import DEFAULT_FSYNC_EVERY
+from instrument import add_instrument_args, instrumented, timer
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.join(SCRIPT_DIR, '..')
+DB_PATH = os.path.join(ROOT_DIR, 'db', 'animatch.db')
+EMBEDDINGS_PATH = os.path.join(ROOT_DIR, 'public', 'embeddings.json')
+SEED_PATH = os.path.join(ROOT_DIR, 'db', 'seed.sql')
+OG_DATA_PATH = os.path.join(SCRIPT_DIR, 'build', 'og_character_data.ts')
+IMAGES_MANIFEST_PATH = os.path.join(SCRIPT_DIR, 'build', 'heroine_images.json')
+SIMILAR_PATH = os.path.join(ROOT_DIR, 'public', 'similar.json')
+TEXT_MATRIX_PATH = os.path.join(ROOT_DIR, 'public', 'text_embeddings.bin')
+TEXT_VOCAB_PATH = os.path.join(ROOT_DIR, 'public', 'text_vocab.json')
+STATE_PATH = os.path.join(SCRIPT_DIR, 'cache', 'pipeline_state.json')
+DEFAULT_JOBS = 4
+EMBEDDING_STAGES = ('embed', 'dual', 'export')  # share the in-memory embeddings document
+
+
+def file_digest(path):
+    if not os.path.exists(path):
+        return 'missing'
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def query_digest(sql):
+    """Hash of a query's rows, so a stage only sees the DB columns it uses."""
+    if not os.path.exists(DB_PATH):
+        return 'missing'
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        rows = conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+    return hashlib.sha256(repr(rows).encode()).hexdigest()
+
+
+class BuildContext:
+    """State shared by the stages of one build."""
+
+    def __init__(self, resume=False, fsync_every=DEFAULT_FSYNC_EVERY):
+        self.resume = resume
+        self.fsync_every = fsync_every
+        self.lock = threading.Lock()
+        self._embeddings = None
+        self.embeddings_dirty = False
+        self.journals = []
+
+    def embeddings(self):
+        """The embeddings document; read from disk on first use only."""
+        with self.lock:
+            if self._embeddings is None:
+                with open(EMBEDDINGS_PATH, encoding='utf-8') as f:
+                    self._embeddings = json.load(f)
+            return self._embeddings
+
+    def update_embeddings(self, data, journal=None):
+        with self.lock:
+            self._embeddings = data
+            self.embeddings_dirty = True
+            if journal is not None:
+                self.journals.append(journal)
+
+    def flush(self):
+        """Write the embeddings document once, then retire the stage journals."""
+        if not self.embeddings_dirty:
+            return None
+        from generate_embeddings import save_embeddings
+        sizes = save_embeddings(self._embeddings, EMBEDDINGS_PATH)
+        for journal in self.journals:
+            journal.complete()
+        self.embeddings_dirty = False
+        return sizes
+
+
+class Stage:
+    def __init__(self, name, run, after=(), inputs=(), queries=(), params=None, outputs=()):
+        self.name = name
+        self.run = run
+        self.after = tuple(after)
+        self.inputs = tuple(inputs)      # files whose content matters
+        self.queries = tuple(queries)    # SQL whose result rows matter
+        self.params = params or {}
+        self.outputs = tuple(outputs)
+
+    def fingerprint(self, upstream):
+        h = hashlib.sha256()
+        h.update(json.dumps(self.params, sort_keys=True).encode())
+        for path in self.inputs:
+            h.update(f"{os.path.relpath(path, ROOT_DIR)}={file_digest(path)}".encode())
+        for sql in self.queries:
+            h.update(query_digest(sql).encode())
+        for name in self.after:
+            h.update(f"{name}={upstream[name]}".encode())
+        return h.hexdigest()
+
+
+# --- Stages -------------------------------------------------------------------
+
+def run_embed(ctx):
+    from generate_embeddings import build_embeddings
+    data, journal = build_embeddings(resume=ctx.resume, fsync_every=ctx.fsync_every)
+    ctx.update_embeddings(data, journal)
+
+
+def run_dual(ctx):
+    from generate_dual_embeddings import add_arcface_embeddings
+    data = ctx.embeddings()
+    _, _, journal = add_arcface_embeddings(data, resume=ctx.resume, fsync_every=ctx.fsync_every)
+    ctx.update_embeddings(data, journal)
+
+
+def run_images(ctx):
+    from heroine_images import build_images
+    s = build_images(DB_PATH)
+    print(f"✅ Heroine images: {s['encoded']} encoded, {s['unchanged']} unchanged, {s['failed']} failed")
+
+
+def run_export(ctx):
+    from catalog import load_catalog
+    from heroine_images import load_manifest
+    from refresh_metadata import refresh_document
+    data = ctx.embeddings()
+    changes = refresh_document(data, load_catalog(DB_PATH), images=load_manifest(IMAGES_MANIFEST_PATH))
+    changes.print()
+    if changes:
+        ctx.update_embeddings(data)
+
+
+def run_sync_seed(ctx):
+    import sync_seed
+    stats = sync_seed.write_seed(DB_PATH, SEED_PATH)
+    print(f"✅ Seed: {stats['animes']} animes, {stats['characters']} characters in {stats['statements']} statements")
+
+
+def run_og_data(ctx):
+    from generate_og_data import render_character_data
+    os.makedirs(os.path.dirname(OG_DATA_PATH), exist_ok=True)
+    with open(OG_DATA_PATH, 'w', encoding='utf-8') as f:
+        f.write(render_character_data(ctx.embeddings()) + '\n')
+    print(f"✅ Wrote {OG_DATA_PATH}")
+
+
+def run_similar(ctx):
+    from similar_characters import write_graph
+    graph, changed = write_graph(ctx.embeddings(), SIMILAR_PATH)
+    print(f"✅ Similar characters: {len(graph)} characters" + ("" if changed else " (unchanged)"))
+
+
+def run_text_embed(ctx):
+    from text_embeddings import build_text_embeddings
+    s = build_text_embeddings(ctx.embeddings())
+    print(f"✅ Text embeddings: {s['phrases']} phrases, {s['encoded']} newly encoded"
+          + ("" if s['changed'] else " (unchanged)"))
+
+
+def build_stages():
+    import generate_embeddings as ge
+    import heroine_images as hi
+    protagonists = "SELECT id, name_ko, image_url, partner_id FROM characters WHERE role = 'protagonist' ORDER BY id"
+    stages = [
+        Stage('embed', run_embed,
+              queries=[protagonists],
+              params={'model': ge.MODEL_NAME, 'pretrained': ge.PRETRAINED,
+                      'precision': ge.EMBEDDING_PRECISION},
+              outputs=[EMBEDDINGS_PATH]),
+        Stage('dual', run_dual, after=['embed'],
+              inputs=[os.path.join(SCRIPT_DIR, 'models', 'mobilefacenet.onnx')],
+              queries=["SELECT id, image_url FROM characters WHERE role = 'protagonist' ORDER BY id"],
+              outputs=[EMBEDDINGS_PATH]),
+        Stage('images', run_images,
+              queries=["SELECT id, image_url FROM characters WHERE role = 'heroine' ORDER BY id"],
+              params={'settings': hi.SETTINGS},
+              outputs=[IMAGES_MANIFEST_PATH]),
+        Stage('export', run_export, after=['dual', 'images'],
+              inputs=[DB_PATH, os.path.join(SCRIPT_DIR, 'refresh_metadata.py')],
+              outputs=[EMBEDDINGS_PATH]),
+        Stage('sync-seed', run_sync_seed,
+              inputs=[DB_PATH, os.path.join(SCRIPT_DIR, 'sync_seed.py')],
+              outputs=[SEED_PATH]),
+        Stage('similar', run_similar, after=['export'],
+              inputs=[os.path.join(SCRIPT_DIR, 'similar_characters.py')],
+              outputs=[SIMILAR_PATH]),
+        Stage('text-embed', run_text_embed, after=['export'],
+              inputs=[os.path.join(SCRIPT_DIR, 'text_embeddings.py')],
+              params={'model': ge.MODEL_NAME, 'pretrained': ge.PRETRAINED},
+              outputs=[TEXT_MATRIX_PATH, TEXT_VOCAB_PATH]),
+        Stage('og-data', run_og_data, after=['export'],
+              inputs=[os.path.join(SCRIPT_DIR, 'generate_og_data.py')],
+              outputs=[OG_DATA_PATH]),
+    ]
+    return {s.name: s for s in stages}
+
+
+# --- Runner -------------------------------------------------------------------
+
+def load_state():
+    try:
+        with open(STATE_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_state(state):
+    os.makedirs(os.path.dirname(STATE_PATH), exist_ok=True)
+    tmp = STATE_PATH + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp, STATE_PATH)
+
+
+def select(stages, targets):
+    """Targets plus everything they depend on, in declaration order."""
+    wanted = set()
+
+    def visit(name):
+        if name not in wanted:
+            wanted.add(name)
+            for dep in stages[name].after:
+                visit(dep)
+
+    for name in targets or stages:
+        visit(name)
+    return [name for name in stages if name in wanted]
+
+
+def plan(stages, order, state, force=False):
+    """{stage: (fingerprint, up_to_date)} in dependency order."""
+    fingerprints, result = {}, {}
+    for name in order:
+        stage = stages[name]
+        upstream = {dep: fingerprints.get(dep) or state.get(dep, {}).get('fingerprint') for dep in stage.after}
+        fp = stage.fingerprint(upstream)
+        fingerprints[name] = fp
+        fresh = (not force and state.get(name, {}).get('fingerprint') == fp
+                 and all(os.path.exists(p) for p in stage.outputs)
+                 and all(result[d][1] for d in stage.after if d in result))
+        result[name] = (fp, fresh)
+    return result
+
+
+def run_pipeline(stages, order, build_plan, ctx, jobs=DEFAULT_JOBS):
+    """Run stale stages, parallel where the graph allows; returns {stage: (status, seconds)}."""
+    report = {}
+    pending = {name for name in order if not build_plan[name][1]}
+    for name in order:
+        if name not in pending:
+            report[name] = ('skipped', 0.0)
+    running = {}
+
+    def timed(stage):
+        t0 = time.perf_counter()
+        with timer(f"stage:{stage.name}"):
+            stage.run(ctx)
+        return time.perf_counter() - t0
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            for name in sorted(pending, key=order.index):
+                deps = stages[name].after
+                if any(report.get(d, ('',))[0] in ('failed', 'blocked') for d in deps):
+                    report[name] = ('blocked', 0.0)
+                    pending.discard(name)
+                elif all(d in report for d in deps):
+                    print(f"\n▶️  {name}")
+                    running[pool.submit(timed, stages[name])] = name
+                    pending.discard(name)
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    report[name] = ('ran', future.result())
+                except Exception as e:
+                    print(f"❌ {name} failed: {e}")
+                    report[name] = ('failed', 0.0)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AniMatch — content build pipeline')
+    parser.add_argument('targets', nargs='*', help='Stages to build (default: all)')
+    parser.add_argument('--force', action='store_true', help='Rebuild selected stages even if up to date')
+    parser.add_argument('--dry-run', action='store_true', help='Show the plan without running anything')
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS, help='Stages to run in parallel')
+    parser.add_argument('--resume', action='store_true',
+                        help='Resume interrupted embedding stages from their checkpoint journals')
+    parser.add_argument('--fsync-every', type=int, default=DEFAULT_FSYNC_EVERY,
+                        help='Checkpoint fsync interval (records)')
+    add_instrument_args(parser)
+    args = parser.parse_args()
+
+    stages = build_stages()
+    unknown = [t for t in args.targets if t not in stages]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)} (choose from {', '.join(stages)})")
+
+    print("🎌 AniMatch — Content Build Pipeline")
+    state = load_state()
+    order = select(stages, args.targets)
+    build_plan = plan(stages, order, state, force=args.force)
+    for name in order:
+        print(f"  {'✅ up to date' if build_plan[name][1] else '🔨 stale     '}  {name}")
+    if args.dry_run:
+        return
+
+    with instrumented('pipeline', args):
+        ctx = BuildContext(resume=args.resume, fsync_every=args.fsync_every)
+        t0 = time.perf_counter()
+        report = run_pipeline(stages, order, build_plan, ctx, jobs=args.jobs)
+
+        # The shared document is written only if every stage that touched it succeeded
+        embedding_stages = [n for n in EMBEDDING_STAGES if n in report]
+        write_t0 = time.perf_counter()
+        if all(report[n][0] in ('ran', 'skipped') for n in embedding_stages):
+            sizes = ctx.flush()
+            if sizes:
+                print(f"\n📁 {EMBEDDINGS_PATH} ({sizes[0]:.1f} KB, gzip {sizes[1]:.1f} KB)")
+        elif ctx.embeddings_dirty:
+            print("\n⚠️ Embedding stages failed; embeddings.json left untouched (use --resume)")
+        write_s = time.perf_counter() - write_t0
+        total = time.perf_counter() - t0
+
+        for name, (status, _) in report.items():
+            # Stages whose results were never written stay stale
+            if status == 'ran' and not (name in EMBEDDING_STAGES and ctx.embeddings_dirty):
+                state[name] = {'fingerprint': build_plan[name][0], 'built_at': time.time()}
+        save_state(state)
+
+        print(f"\n{'Stage':<12} {'Status':<8} {'Secs':>8}")
+        for name in order:
+            status, secs = report[name]
+            print(f"{name:<12} {status:<8} {secs:>8.2f}")
+        print(f"{'(write)':<12} {'':<8} {write_s:>8.2f}")
+        busy = sum(secs for _, secs in report.values()) + write_s
+        print(f"\n⏱️  {total:.2f}s wall, {busy:.2f}s of stage time")
+    if any(status in ('failed', 'blocked') for status, _ in report.values()):
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
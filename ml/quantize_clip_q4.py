@@ -10,7 +10,6 @@ Usage:
 
 import os
 import numpy as np
-from onnxruntime.quantization import quantize_dynamic, QuantType
 
 MODEL_DIR = os.path.join(os.path.dirname(__file__), '..', 'public', 'models')
 # Use the FULL fp32 model as input for best Q4 quality (if available),
@@ -35,6 +34,8 @@ def main():
         print("❌ No source model found.")
         return
 
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
     input_size = os.path.getsize(input_model) / (1024 * 1024)
     print(f"📦 Input model size: {input_size:.1f} MB")
 
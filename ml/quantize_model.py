@@ -10,8 +10,6 @@ Usage:
 
 import os
 import numpy as np
-import onnx
-from onnxruntime.quantization import quantize_dynamic, QuantType
 
 MODEL_DIR = os.path.join(os.path.dirname(__file__), '..', 'public', 'models')
 INPUT_MODEL = os.path.join(MODEL_DIR, 'clip-image-encoder.onnx')
@@ -29,6 +27,9 @@ def main():
         print("❌ Input model not found. Run export_clip_onnx.py first.")
         return
 
+    import onnx
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
     input_size = os.path.getsize(INPUT_MODEL) / (1024 * 1024)
     print(f"📦 Input model size: {input_size:.1f} MB")
 
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+AniMatch — Metadata Refresh
+Brings the metadata fields of public/embeddings.json (names, anime titles,
+genres, personality, charm, quotes, tags, colors — every language) up to
+date with animatch.db, keeping the embedding vectors as they are.
+Replaces enrich_embeddings.py, patch_embeddings.py and
+scripts/export_embeddings.py.
+
+Records are matched by heroine_id (falling back to the heroine's Korean
+name, which relinks the id). Each DB pair gets a row hash; the last run's
+hashes and the output file's size/mtime live in ml/cache/metadata_state.json,
+so a refresh only re-derives records whose rows changed, only assigns
+fields whose values differ, and reports each change. When nothing changed
+the JSON is not even parsed, and the file is never rewritten unless a
+field actually changed (so its bytes, and CDN caches, stay put).
+
+Image derivatives (heroine_images.py) are merged in from their manifest:
+heroine_image_avif / heroine_image_webp / heroine_image_lqip are set for
+heroines that have a record and removed from those that don't. The record
+is part of the row hash, so rebuilt images trigger a refresh too. Without
+a manifest (ml/build/ is not versioned; images never built on this
+machine) the image fields are left as they are.
+
+Row hashes rather than updated_at: nothing in the schema bumps updated_at
+on UPDATE, so it can't be trusted to move.
+
+Usage:
+  python refresh_metadata.py
+  python refresh_metadata.py --dry-run --verbose
+  python refresh_metadata.py --full      # ignore saved hashes, diff every record
+"""
+
+import argparse
+import hashlib
+import json
+import os
+
+from catalog import load_catalog
+from heroine_images import catalog_fields, load_manifest
+from instrument import add_instrument_args, count, instrumented, timer
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(SCRIPT_DIR, '..', 'db', 'animatch.db')
+EMBEDDINGS_PATH = os.path.join(SCRIPT_DIR, '..', 'public', 'embeddings.json')
+STATE_PATH = os.path.join(SCRIPT_DIR, 'cache', 'metadata_state.json')
+DEFAULT_COLOR = 'linear-gradient(135deg, #667eea, #764ba2)'
+DEFAULT_EMOJI = '💫'
+IMAGE_FIELDS = ('heroine_image_avif', 'heroine_image_webp', 'heroine_image_lqip')
+MISSING = object()
+
+
+def load_json(json_str):
+    if not json_str:
+        return []
+    try:
+        return json.loads(json_str)
+    except json.JSONDecodeError:
+        return []
+
+
+def entry_metadata(pair, image=None):
+    """Every non-vector field of an embeddings.json record, derived from a catalog pair
+    (and its heroine_images.py manifest record, if any)."""
+    p, h, a = pair['protagonist'], pair['heroine'], pair['anime']
+    fields = {
+        'protagonist_id': p['id'],
+        'protagonist_name': p['name_ko'],
+        'protagonist_name_en': p['name_en'],
+        'protagonist_en': p['name_en'],  # legacy alias
+        'orientation': a['orientation'],
+        'tier': a['tier'],
+
+        'anime': a['title_ko'],
+        'anime_en': a['title_en'] or '',
+        'anime_ja': a.get('title_jp') or '',
+        'anime_zh_tw': a.get('title_zh_tw') or '',
+
+        'genre': load_json(a['genre']),
+        'genre_en': load_json(a['genre_en']),
+        'genre_ja': load_json(a.get('genre_ja')),
+        'genre_zh_tw': load_json(a.get('genre_zh_tw')),
+
+        'heroine_id': h['id'],
+        'heroine_name': h['name_ko'],
+        'heroine_name_en': h['name_en'] or '',
+        'heroine_name_ja': h.get('name_jp') or '',
+        'heroine_name_zh_tw': h.get('name_zh_tw') or '',
+
+        'heroine_image': h['image_url'] or '',
+
+        'heroine_personality': load_json(h['personality']),
+        'heroine_personality_en': load_json(h.get('personality_en')),
+        'heroine_personality_ja': load_json(h.get('personality_ja')),
+        'heroine_personality_zh_tw': load_json(h.get('personality_zh_tw')),
+
+        'heroine_charm': h['charm_points'] or '',
+        'heroine_charm_en': h.get('charm_points_en') or '',
+        'heroine_charm_ja': h.get('charm_points_ja') or '',
+        'heroine_charm_zh_tw': h.get('charm_points_zh_tw') or '',
+
+        'heroine_quote': h['iconic_quote'] or '',
+        'heroine_quote_en': h.get('iconic_quote_en') or '',
+        'heroine_quote_ja': h.get('iconic_quote_ja') or '',
+        'heroine_quote_zh_tw': h.get('iconic_quote_zh_tw') or '',
+
+        'heroine_tags': load_json(h['tags']),
+        'heroine_tags_en': load_json(h.get('tags_en')),
+        'heroine_tags_ja': load_json(h.get('tags_ja')),
+        'heroine_tags_zh_tw': load_json(h.get('tags_zh_tw')),
+
+        'heroine_color': h['color_primary'] or DEFAULT_COLOR,
+        'heroine_emoji': h['emoji'] or DEFAULT_EMOJI,
+    }
+    if image:
+        fields.update(catalog_fields(image))
+    return fields
+
+
+def row_hash(pair, image=None):
+    """Hash of the DB rows (bookkeeping columns excluded) and image record behind one record."""
+    rows = [{k: v for k, v in row.items() if k not in ('created_at', 'updated_at')}
+            for row in (pair['protagonist'], pair['heroine'], pair['anime'])]
+    if image:
+        rows.append(catalog_fields(image))
+    return hashlib.sha256(json.dumps(rows, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def row_hashes(catalog, images=None):
+    images = images or {}
+    return {str(hid): row_hash(pair, images.get(hid)) for hid, pair in catalog.by_heroine.items()}
+
+
+def file_stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def load_state():
+    try:
+        with open(STATE_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_state(hashes, path=EMBEDDINGS_PATH):
+    os.makedirs(os.path.dirname(STATE_PATH), exist_ok=True)
+    tmp = STATE_PATH + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'output': file_stamp(path), 'rows': hashes}, f, sort_keys=True)
+    os.replace(tmp, STATE_PATH)
+
+
+class Changes:
+    """What a refresh did, record by record."""
+
+    def __init__(self):
+        self.updated = {}    # heroine_id → {field: (old, new)}
+        self.relinked = []   # (old heroine_id, new heroine_id) matched by name
+        self.removed = []    # heroine_ids no longer in the DB
+        self.unvectored = []  # DB heroines without a record (need `main.py embed`)
+
+    def __bool__(self):
+        return bool(self.updated or self.relinked or self.removed)
+
+    def fields_changed(self):
+        return sum(len(f) for f in self.updated.values())
+
+    def print(self, verbose=False):
+        if not self:
+            print("  ✅ Metadata up to date — nothing to write")
+        for hid, fields in self.updated.items():
+            print(f"  ✏️  heroine {hid}: {', '.join(fields)}")
+            if verbose:
+                for field, (old, new) in fields.items():
+                    print(f"       {field}: {old!r} → {new!r}")
+        for old, new in self.relinked:
+            print(f"  🔗 heroine {old} → {new} (matched by name)")
+        for hid in self.removed:
+            print(f"  🗑️  heroine {hid}: no longer in DB, record dropped")
+        if self.unvectored:
+            print(f"  ⚠️  {len(self.unvectored)} DB heroines have no embedding yet: "
+                  f"{', '.join(map(str, self.unvectored))}")
+
+
+def refresh_document(data, catalog, only=None, images=None):
+    """Apply DB metadata (and image manifest records) to `data` in place; `only` limits the
+    diff to those heroine_ids. With images=None (no manifest) image fields are left alone."""
+    strip_images = images is not None
+    images = images or {}
+    changes = Changes()
+    by_name = {pair['heroine']['name_ko']: pair for pair in catalog.by_heroine.values()}
+    kept, seen = [], set()
+
+    for entry in data['characters']:
+        hid = entry.get('heroine_id')
+        pair = catalog.by_heroine.get(hid)
+        if pair is None:
+            pair = by_name.get(entry.get('heroine_name'))
+            if pair is None or pair['heroine']['id'] in seen:
+                changes.removed.append(hid)
+                continue
+            changes.relinked.append((hid, pair['heroine']['id']))
+        seen.add(pair['heroine']['id'])
+        kept.append(entry)
+        if only is not None and pair['heroine']['id'] not in only and pair['heroine']['id'] == hid:
+            continue
+
+        fields = {}
+        metadata = entry_metadata(pair, images.get(pair['heroine']['id']))
+        for field, value in metadata.items():
+            old = entry.get(field, MISSING)
+            if old != value:
+                fields[field] = (None if old is MISSING else old, value)
+                entry[field] = value
+        for field in IMAGE_FIELDS:
+            if strip_images and field in entry and field not in metadata:
+                fields[field] = (entry.pop(field), None)
+        if fields:
+            changes.updated[pair['heroine']['id']] = fields
+            count('records_updated')
+            count('fields_updated', len(fields))
+
+    changes.unvectored = sorted(set(catalog.by_heroine) - seen)
+    if changes.removed:
+        data['characters'] = kept
+    if data.get('count') != len(data['characters']):
+        data['count'] = len(data['characters'])
+    return changes
+
+
+def refresh(path=EMBEDDINGS_PATH, db_path=DB_PATH, dry_run=False, full=False):
+    """Refresh `path` from the DB; returns Changes, or None when the fast path proved a no-op."""
+    with timer('catalog'):
+        catalog = load_catalog(db_path)
+        images = load_manifest()
+        hashes = row_hashes(catalog, images)
+
+    state = {} if full else load_state()
+    trusted = state.get('output') is not None and state.get('output') == file_stamp(path)
+    if trusted and state.get('rows') == hashes:
+        return None
+
+    only = None
+    if trusted:
+        old = state.get('rows', {})
+        only = {int(hid) for hid, h in hashes.items() if old.get(hid) != h}
+
+    with timer('load_json'):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    with timer('diff'):
+        changes = refresh_document(data, catalog, only=only, images=images)
+
+    if dry_run:
+        return changes
+    if changes:
+        from generate_embeddings import save_embeddings
+        save_embeddings(data, path)
+    save_state(hashes, path)
+    return changes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AniMatch — refresh embeddings.json metadata from the DB')
+    parser.add_argument('--dry-run', action='store_true', help='Report changes without writing')
+    parser.add_argument('--verbose', action='store_true', help='Show old → new values')
+    parser.add_argument('--full', action='store_true', help='Ignore saved row hashes and diff every record')
+    add_instrument_args(parser)
+    args = parser.parse_args()
+
+    print("🎌 AniMatch — Metadata Refresh")
+    if not os.path.exists(EMBEDDINGS_PATH):
+        print(f"  ❌ {EMBEDDINGS_PATH} not found — run `main.py embed` first (vectors live only there)")
+        raise SystemExit(1)
+
+    with instrumented('refresh_metadata', args):
+        changes = refresh(dry_run=args.dry_run, full=args.full)
+        if changes is None:
+            print("  ✅ No DB rows changed since the last refresh — nothing to do")
+        else:
+            changes.print(verbose=args.verbose)
+            if changes and not args.dry_run:
+                print(f"  📁 {changes.fields_changed()} fields in {len(changes.updated)} records → {EMBEDDINGS_PATH}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+AniMatch — Similar Characters Graph
+Precomputes each character's nearest neighbours over the dual embeddings
+so CharacterDetail can show "you might also match" without downloading
+or scanning vectors on the device.
+
+Pair similarity is the same blend the matcher uses (src/ml/dualEmbedding.ts):
+ALPHA · CLIP cosine + BETA · ArcFace cosine when both characters have an
+ArcFace vector, CLIP cosine alone otherwise. Neighbours come from the same
+orientation, since those are the characters a user could be matched with.
+
+The N×N similarity matrix is never materialized: rows are processed in
+blocks of BLOCK_ROWS (two matrix products per block) and only each row's
+top-k survives (argpartition). Memory is O(BLOCK_ROWS × N).
+
+Output: public/similar.json, an adjacency list keyed by heroine_id,
+nearest first:
+
+  {"k": 6, "weights": {"clip": 0.3, "arcface": 0.7},
+   "graph": {"12": [34, 56, ...], ...}}
+
+The file is rewritten only when the graph changes.
+
+Usage:
+  python similar_characters.py
+  python similar_characters.py --k 10
+"""
+
+import argparse
+import json
+import os
+
+from instrument import add_instrument_args, instrumented, timer
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+EMBEDDINGS_PATH = os.path.join(SCRIPT_DIR, '..', 'public', 'embeddings.json')
+SIMILAR_PATH = os.path.join(SCRIPT_DIR, '..', 'public', 'similar.json')
+
+# Keep in sync with ALPHA / BETA in src/ml/dualEmbedding.ts
+ALPHA = 0.3  # CLIP weight
+BETA = 0.7   # ArcFace weight
+TOP_K = 6
+BLOCK_ROWS = 1024
+
+
+def normalized(rows, dim):
+    """(N, dim) float32 with unit rows; missing vectors become zero rows. Returns (matrix, present mask)."""
+    import numpy as np
+    present = np.array([bool(r) for r in rows])
+    m = np.zeros((len(rows), dim), dtype=np.float32)
+    if present.any():
+        m[present] = np.array([r for r in rows if r], dtype=np.float32)
+        norms = np.linalg.norm(m, axis=1, keepdims=True)
+        m /= np.where(norms > 0, norms, 1)
+    return m, present
+
+
+def neighbor_graph(characters, k=TOP_K, block_rows=BLOCK_ROWS):
+    """{heroine_id: [(neighbour heroine_id, score), ...]} nearest first."""
+    import numpy as np
+
+    n = len(characters)
+    if n < 2:
+        return {c['heroine_id']: [] for c in characters}
+    clip, _ = normalized([c['embedding'] for c in characters], len(characters[0]['embedding']))
+    faces = [c.get('arcface_embedding') for c in characters]
+    # ArcFace vectors have the face model's width, not CLIP's
+    arcface, has_arcface = normalized(faces, next((len(f) for f in faces if f), 0))
+    orientation = np.array([c['orientation'] for c in characters])
+    ids = [c['heroine_id'] for c in characters]
+    k = min(k, n - 1)
+
+    graph = {}
+    for start in range(0, n, block_rows):
+        stop = min(start + block_rows, n)
+        score = clip[start:stop] @ clip.T
+        dual = has_arcface[start:stop, None] & has_arcface[None, :]
+        if dual.any():
+            score = np.where(dual, ALPHA * score + BETA * (arcface[start:stop] @ arcface.T), score)
+        score[orientation[start:stop, None] != orientation[None, :]] = -np.inf
+        score[np.arange(stop - start), np.arange(start, stop)] = -np.inf  # self
+
+        top = np.argpartition(-score, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(score, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind='stable')
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        for row in range(stop - start):
+            graph[ids[start + row]] = [(ids[j], float(s)) for j, s in zip(top[row], top_scores[row])
+                                       if np.isfinite(s)]
+    return graph
+
+
+def render(graph, k):
+    return json.dumps({
+        'k': k,
+        'weights': {'clip': ALPHA, 'arcface': BETA},
+        'graph': {str(hid): [nid for nid, _ in nbrs] for hid, nbrs in sorted(graph.items())},
+    }, separators=(',', ':')) + '\n'
+
+
+def write_graph(data, path=SIMILAR_PATH, k=TOP_K):
+    """Write the graph for an embeddings document; returns (graph, whether the file changed)."""
+    with timer('graph'):
+        graph = neighbor_graph(data['characters'], k)
+    text = render(graph, k)
+    try:
+        with open(path, encoding='utf-8') as f:
+            if f.read() == text:
+                return graph, False
+    except OSError:
+        pass
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp, path)
+    return graph, True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AniMatch — nearest-neighbour graph for CharacterDetail')
+    parser.add_argument('--k', type=int, default=TOP_K, help='Neighbours per character')
+    parser.add_argument('--verbose', action='store_true', help='Print every character\'s neighbours')
+    add_instrument_args(parser)
+    args = parser.parse_args()
+
+    print("🎌 AniMatch — Similar Characters")
+    with instrumented('similar_characters', args):
+        with timer('load_json'):
+            with open(EMBEDDINGS_PATH, encoding='utf-8') as f:
+                data = json.load(f)
+        graph, changed = write_graph(data, k=args.k)
+        if args.verbose:
+            names = {c['heroine_id']: c.get('heroine_name_en') or c['heroine_name'] for c in data['characters']}
+            for hid, nbrs in graph.items():
+                print(f"  {names[hid]}: " + ', '.join(f"{names[n]} ({s:.3f})" for n, s in nbrs))
+        edges = sum(len(n) for n in graph.values())
+        print(f"  ✅ {len(graph)} characters, {edges} edges"
+              + (f" → {SIMILAR_PATH}" if changed else " — unchanged, not rewritten"))
+
+
+if __name__ == '__main__':
+    main()
@@ -4,18 +4,41 @@ AniMatch — Seed Sync Script
 Exports the current SQLite database (animes, characters) to db/seed.sql
 so that new characters added via add_character.py are persisted in the baseline seed.
 
+The seed is written for D1: multi-row `INSERT ... VALUES (...), (...)`
+statements, each kept under D1's statement size limit, instead of one
+statement per row. Column lists come from the live schema (so translation
+columns added by later migrations are exported too); created_at/updated_at
+are left to their defaults.
+
+partner_id references characters(id), and D1 checks foreign keys at the
+end of each statement. Characters linked by partner_id are therefore
+always placed in the same INSERT, which makes the old trailing UPDATE pass
+unnecessary. Only a partner group too large for one statement falls back
+to NULL + UPDATE.
+
+Rows are streamed from the DB to a temp file and swapped in at the end;
+only rows whose partner hasn't been read yet are buffered.
+
 Usage:
   python ml/sync_seed.py
+  python ml/sync_seed.py --max-rows 50
 """
 
+import argparse
 import sqlite3
 import os
-from datetime import datetime
+from datetime import datetime, timezone
+
+from catalog import table_columns
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(SCRIPT_DIR, '..', 'db', 'animatch.db')
 SEED_PATH = os.path.join(SCRIPT_DIR, '..', 'db', 'seed.sql')
 
+D1_MAX_STATEMENT_BYTES = 100_000  # D1 rejects longer SQL statements
+DEFAULT_MAX_ROWS = 200            # rows per INSERT, keeps each statement's write cheap to retry
+SKIP_COLUMNS = {'created_at', 'updated_at'}
+
 def escape_sql(value):
     if value is None:
         return 'NULL'
@@ -26,55 +49,175 @@ def escape_sql(value):
         return str(value)
     return f"'{str(value)}'"
 
+
+def seed_columns(conn, table):
+    return [c for c in table_columns(conn, table) if c not in SKIP_COLUMNS]
+
+
+class InsertWriter:
+    """Packs row tuples into multi-row INSERTs under the row and byte limits."""
+
+    def __init__(self, f, table, columns, max_rows=DEFAULT_MAX_ROWS, max_bytes=D1_MAX_STATEMENT_BYTES, tail=''):
+        self.f = f
+        self.head = f"INSERT INTO {table} ({', '.join(columns)}) VALUES\n"
+        self.tail = tail  # e.g. an ON CONFLICT clause
+        self.fixed = len(self.head.encode()) + len(tail.encode()) + 2
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.values = []
+        self.size = 0
+        self.statements = 0
+        self.rows = 0
+
+    def fits(self, values):
+        """Whether these rendered rows fit in one statement on their own."""
+        size = self.fixed + sum(len(v.encode()) + 2 for v in values)
+        return len(values) <= self.max_rows and size <= self.max_bytes
+
+    def add(self, values):
+        """Add rendered rows that must share a statement (a partner group)."""
+        added = sum(len(v.encode()) + 2 for v in values)
+        if self.values and (len(self.values) + len(values) > self.max_rows
+                            or self.fixed + self.size + added > self.max_bytes):
+            self.flush()
+        self.values.extend(values)
+        self.size += added
+
+    def flush(self):
+        if not self.values:
+            return
+        self.f.write(self.head + ',\n'.join(self.values) + self.tail + ';\n')
+        self.statements += 1
+        self.rows += len(self.values)
+        self.values, self.size = [], 0
+
+
+def render(row):
+    return '(' + ', '.join(escape_sql(v) for v in row) + ')'
+
+
+def partner_groups(links):
+    """character id → group key for (id, partner_id) links; a group is a connected partner component."""
+    parent = {}
+
+    def find(x):
+        while parent.setdefault(x, x) != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    ids = {cid for cid, _ in links}
+    for cid, partner_id in links:
+        find(cid)
+        if partner_id in ids:
+            parent[find(cid)] = find(partner_id)
+    return {cid: find(cid) for cid in ids}
+
+
+def add_characters(writer, rows, partner_idx, links, known_ids):
+    """Feed character rows (any iterable, in id order) to `writer`, keeping partner groups in one
+    statement. partner_ids outside `known_ids` are dangling and written as NULL. Returns the
+    (id, partner_id) links that had to be deferred to UPDATEs."""
+    group_of = partner_groups(links)
+    group_size = {}
+    for g in group_of.values():
+        group_size[g] = group_size.get(g, 0) + 1
+
+    deferred, pending = [], {}
+    for row in rows:
+        row = list(row)
+        if row[partner_idx] is not None and row[partner_idx] not in known_ids:
+            row[partner_idx] = None  # the FK would reject the whole statement
+        g = group_of[row[0]]
+        group = pending.setdefault(g, [])
+        group.append(row)
+        if len(group) < group_size[g]:
+            continue
+        del pending[g]
+        values = [render(r) for r in group]
+        if writer.fits(values):
+            writer.add(values)
+            continue
+        for r in group:
+            if r[partner_idx] is not None:
+                deferred.append((r[0], r[partner_idx]))
+                r[partner_idx] = None
+            writer.add([render(r)])
+    writer.flush()
+    return deferred
+
+
+def write_partner_updates(f, deferred):
+    if deferred:
+        f.write("\n-- === PARTNER LINKS (groups too large for one statement) ===\n")
+        for cid, partner_id in deferred:
+            f.write(f"UPDATE characters SET partner_id = {partner_id} WHERE id = {cid};\n")
+
+
+def write_seed(db_path=DB_PATH, seed_path=SEED_PATH, max_rows=DEFAULT_MAX_ROWS,
+               max_bytes=D1_MAX_STATEMENT_BYTES):
+    """Stream the DB into seed_path; returns a stats dict."""
+    conn = sqlite3.connect(db_path)
+    tmp = seed_path + '.tmp'
+    try:
+        anime_cols = seed_columns(conn, 'animes')
+        char_cols = seed_columns(conn, 'characters')
+        partner_idx = char_cols.index('partner_id')
+        n_animes = conn.execute("SELECT COUNT(*) FROM animes").fetchone()[0]
+        n_chars = conn.execute("SELECT COUNT(*) FROM characters").fetchone()[0]
+
+        links = conn.execute("SELECT id, partner_id FROM characters").fetchall()
+        ids = {cid for cid, _ in links}
+
+        now_str = datetime.now(timezone.utc).replace(tzinfo=None).isoformat()[:-3] + "Z"
+
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write("-- AniMatch Seed Data\n")
+            f.write(f"-- Generated: {now_str}\n")
+            f.write(f"-- Total: {n_animes} works, {n_chars} characters\n\n")
+
+            f.write("-- === ANIMES ===\n")
+            animes = InsertWriter(f, 'animes', anime_cols, max_rows, max_bytes)
+            for row in conn.execute(f"SELECT {', '.join(anime_cols)} FROM animes ORDER BY id"):
+                animes.add([render(row)])
+            animes.flush()
+
+            f.write("\n-- === CHARACTERS (partners share a statement) ===\n")
+            chars = InsertWriter(f, 'characters', char_cols, max_rows, max_bytes)
+            rows = conn.execute(f"SELECT {', '.join(char_cols)} FROM characters ORDER BY id")
+            deferred = add_characters(chars, rows, partner_idx, links, ids)
+            write_partner_updates(f, deferred)
+        os.replace(tmp, seed_path)
+    finally:
+        conn.close()
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+    return {
+        'animes': animes.rows, 'characters': chars.rows,
+        'statements': animes.statements + chars.statements + len(deferred),
+        'deferred_links': len(deferred),
+    }
+
+
 def main():
+    parser = argparse.ArgumentParser(description='AniMatch — export animatch.db to db/seed.sql')
+    parser.add_argument('--max-rows', type=int, default=DEFAULT_MAX_ROWS, help='Rows per INSERT statement')
+    parser.add_argument('--max-bytes', type=int, default=D1_MAX_STATEMENT_BYTES, help='Bytes per INSERT statement')
+    args = parser.parse_args()
+
     if not os.path.exists(DB_PATH):
         print(f"❌ Database not found at {DB_PATH}")
         return
 
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-
-    # Get animes
-    cursor.execute("SELECT id, title_ko, title_jp, title_en, genre, genre_en, orientation, tier FROM animes ORDER BY id")
-    animes = cursor.fetchall()
-    
-    # Get characters
-    cursor.execute("SELECT id, anime_id, name_ko, name_jp, name_en, gender, role, image_url, personality, personality_en, charm_points, charm_points_en, iconic_quote, iconic_quote_en, tags, tags_en, color_primary, emoji, partner_id FROM characters ORDER BY id")
-    characters = cursor.fetchall()
-
-    now_str = datetime.utcnow().isoformat()[:-3] + "Z"
-    
-    with open(SEED_PATH, 'w', encoding='utf-8') as f:
-        f.write("-- AniMatch Seed Data\n")
-        f.write(f"-- Generated: {now_str}\n")
-        f.write(f"-- Total: {len(animes)} works, {len(characters)} characters\n\n")
-
-        f.write("-- === ANIMES ===\n")
-        for a in animes:
-            cols = "id, title_ko, title_jp, title_en, genre, genre_en, orientation, tier"
-            vals = ", ".join([escape_sql(a[c]) for c in ["id", "title_ko", "title_jp", "title_en", "genre", "genre_en", "orientation", "tier"]])
-            f.write(f"INSERT INTO animes ({cols}) VALUES ({vals});\n")
-
-        f.write("\n-- === CHARACTERS ===\n")
-        for c in characters:
-            cols = "id, anime_id, name_ko, name_jp, name_en, gender, role, image_url, personality, personality_en, charm_points, charm_points_en, iconic_quote, iconic_quote_en, tags, tags_en, color_primary, emoji"
-            vals_list = []
-            for col in ["id", "anime_id", "name_ko", "name_jp", "name_en", "gender", "role", "image_url", "personality", "personality_en", "charm_points", "charm_points_en", "iconic_quote", "iconic_quote_en", "tags", "tags_en", "color_primary", "emoji"]:
-                vals_list.append(escape_sql(c[col]))
-            vals = ", ".join(vals_list)
-            f.write(f"INSERT INTO characters ({cols}) VALUES ({vals});\n")
-
-        f.write("\n-- === PARTNER LINKS ===\n")
-        for c in characters:
-            if c['partner_id'] is not None:
-                f.write(f"UPDATE characters SET partner_id = {c['partner_id']} WHERE id = {c['id']};\n")
-
-    conn.close()
-    
+    stats = write_seed(max_rows=args.max_rows, max_bytes=args.max_bytes)
+
     kb = os.path.getsize(SEED_PATH) / 1024
     print(f"✅ Generated {SEED_PATH} ({kb:.1f} KB)")
-    print(f"   Exported {len(animes)} animes and {len(characters)} characters.")
+    print(f"   Exported {stats['animes']} animes and {stats['characters']} characters "
+          f"in {stats['statements']} statements.")
+    if stats['deferred_links']:
+        print(f"   ⚠️ {stats['deferred_links']} partner links written as UPDATEs (group too large)")
 
 if __name__ == '__main__':
     main()
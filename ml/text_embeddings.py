@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+AniMatch — Tag / Genre Text Embeddings
+Runs the CLIP text encoder once, offline, over every phrase the catalog
+describes characters with (heroine_tags, genre, heroine_personality), so
+CharacterBrowse can rank characters by "vibe" without loading a text
+model in the browser.
+
+Outputs (rewritten only when they change):
+
+  public/text_embeddings.bin   float16, phrases × dim, row-major, unit rows
+  public/text_vocab.json       {"model", "pretrained", "dim", "dtype",
+                                "version", "languages", "phrases": [...],
+                                "aliases": {phrase: [phrase index, ...]},
+                                "characters": {heroine_id: [phrase index, ...]}}
+
+In the browser a query picks the vocabulary phrases it mentions, their
+vectors are averaged into a query vector, and one (phrases × dim)
+product against the matrix scores every phrase; a character scores the
+best of its own phrases (src/utils/textSearch.ts).
+
+Vectors are cached in ml/cache/text_embeddings.npz keyed by a hash of
+model + phrase, so a catalog edit only encodes the phrases it adds.
+
+Only phrases in --languages are encoded and scored. The default model is
+the one generate_embeddings.py uses, whose text tower was trained on
+English captions and places ko / ja / zh-TW phrases close together
+whatever they mean, so by default only the _en fields are encoded. A
+phrase in any other language becomes an alias of the phrase at the same
+position of the same field (heroine_tags[i] → heroine_tags_en[i]): a
+Korean query picks the English vectors and is never scored against
+Korean ones. With a multilingual open_clip model (e.g. --model
+xlm-roberta-base-ViT-B-32 --pretrained laion5b_s13b_b90k --languages
+ko en ja zh-TW) every language is encoded directly; re-check the
+browser's VIBE_THRESHOLD after switching models.
+
+Usage:
+  python text_embeddings.py
+  python text_embeddings.py --batch-size 512
+  python text_embeddings.py --model xlm-roberta-base-ViT-B-32 --pretrained laion5b_s13b_b90k --languages ko en ja zh-TW
+"""
+
+import argparse
+import hashlib
+import json
+import os
+
+from generate_embeddings import MODEL_NAME, PRETRAINED
+from instrument import add_instrument_args, count, instrumented, timer
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+EMBEDDINGS_PATH = os.path.join(SCRIPT_DIR, '..', 'public', 'embeddings.json')
+MATRIX_PATH = os.path.join(SCRIPT_DIR, '..', 'public', 'text_embeddings.bin')
+VOCAB_PATH = os.path.join(SCRIPT_DIR, '..', 'public', 'text_vocab.json')
+CACHE_PATH = os.path.join(SCRIPT_DIR, 'cache', 'text_embeddings.npz')
+
+PHRASE_FIELDS = ('heroine_tags', 'genre', 'heroine_personality')
+LANGUAGES = {'ko': '', 'en': '_en', 'ja': '_ja', 'zh-TW': '_zh_tw'}   # language → field suffix
+DEFAULT_LANGUAGES = ('en',)   # what the default (English-caption) text tower can read
+BATCH_SIZE = 256
+
+
+def phrase_key(phrase, model=MODEL_NAME, pretrained=PRETRAINED):
+    return hashlib.sha1(f"{model}|{pretrained}|{phrase}".encode()).hexdigest()[:16]
+
+
+def collect_phrases(characters, languages=DEFAULT_LANGUAGES):
+    """(sorted unique phrases, {heroine_id: [phrase, ...]}, {alias: {phrase, ...}}).
+
+    Phrases come from the `languages` fields; a phrase in any other language
+    is an alias of the phrases at the same position of the same field, when
+    the lists line up.
+    """
+    by_character = {}
+    aliases = {}
+    for c in characters:
+        own = []
+        for field in PHRASE_FIELDS:
+            lists = {lang: [p.strip() if isinstance(p, str) else '' for p in c.get(field + suffix) or []]
+                     for lang, suffix in LANGUAGES.items()}
+            for lang in languages:
+                for phrase in lists[lang]:
+                    if phrase and phrase not in own:
+                        own.append(phrase)
+            for lang, translated in lists.items():
+                if lang in languages:
+                    continue
+                for i, alias in enumerate(translated):
+                    targets = {lists[l][i] for l in languages if len(lists[l]) == len(translated) and lists[l][i]}
+                    if alias and targets:
+                        aliases.setdefault(alias, set()).update(targets)
+        by_character[c['heroine_id']] = own
+    phrases = sorted({p for own in by_character.values() for p in own})
+    return phrases, by_character, aliases
+
+
+def load_cache(path=CACHE_PATH):
+    """{phrase key: float32 vector} (empty when nothing was encoded yet)."""
+    import numpy as np
+    try:
+        with np.load(path) as f:
+            return dict(zip(f['keys'].tolist(), f['vectors']))
+    except (OSError, KeyError, ValueError):
+        return {}
+
+
+def save_cache(cache, path=CACHE_PATH):
+    import numpy as np
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    keys = sorted(cache)
+    tmp = path + '.tmp.npz'
+    np.savez(tmp, keys=np.array(keys), vectors=np.stack([cache[k] for k in keys]).astype(np.float32))
+    os.replace(tmp, path)
+
+
+def encode_phrases(phrases, model_name=MODEL_NAME, pretrained=PRETRAINED, batch_size=BATCH_SIZE):
+    """(len(phrases), dim) float32 unit vectors from the open_clip text tower."""
+    import numpy as np
+    import torch
+    import open_clip
+
+    device = 'cuda' if torch.cuda.is_available() else 'mps' if torch.backends.mps.is_available() else 'cpu'
+    with timer('load_model'):
+        model, _, _ = open_clip.create_model_and_transforms(model_name, pretrained=pretrained, device=device)
+        model.eval()
+        tokenizer = open_clip.get_tokenizer(model_name)
+    print(f"  Model: {model_name} ({pretrained}) on {device}")
+
+    out = []
+    with timer('encode'), torch.no_grad():
+        for start in range(0, len(phrases), batch_size):
+            tokens = tokenizer(phrases[start:start + batch_size]).to(device)
+            features = model.encode_text(tokens).float()
+            features /= features.norm(dim=-1, keepdim=True)
+            out.append(features.cpu().numpy())
+            count('phrases_encoded', len(tokens))
+    return np.concatenate(out).astype(np.float32)
+
+
+def write_if_changed(path, data):
+    """Atomically write bytes unless the file already holds them; returns whether it was written."""
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return True
+
+
+def export(phrases, by_character, aliases, vectors, model_name=MODEL_NAME, pretrained=PRETRAINED,
+           languages=DEFAULT_LANGUAGES, matrix_path=MATRIX_PATH, vocab_path=VOCAB_PATH):
+    """Write the float16 matrix and vocabulary index; returns (bytes, whether anything changed)."""
+    matrix = vectors.astype('<f2').tobytes()
+    index = {p: i for i, p in enumerate(phrases)}
+    vocab = json.dumps({
+        'model': model_name,
+        'pretrained': pretrained,
+        'dim': int(vectors.shape[1]),
+        'dtype': 'float16',
+        'version': hashlib.sha256(matrix).hexdigest()[:12],   # cache-busts the .bin fetch
+        'languages': list(languages),
+        'phrases': phrases,
+        'aliases': {a: sorted(index[p] for p in targets) for a, targets in sorted(aliases.items())},
+        'characters': {str(hid): [index[p] for p in own] for hid, own in sorted(by_character.items())},
+    }, ensure_ascii=False, separators=(',', ':')) + '\n'
+    changed = write_if_changed(matrix_path, matrix)
+    changed = write_if_changed(vocab_path, vocab.encode('utf-8')) or changed
+    return len(matrix), changed
+
+
+def build_text_embeddings(data, model_name=MODEL_NAME, pretrained=PRETRAINED, batch_size=BATCH_SIZE,
+                          languages=DEFAULT_LANGUAGES):
+    """Encode uncached phrases and export; returns a summary dict."""
+    import numpy as np
+    phrases, by_character, aliases = collect_phrases(data['characters'], languages)
+    if not phrases:
+        return {'phrases': 0, 'aliases': 0, 'encoded': 0, 'bytes': 0, 'changed': False}
+    cache = load_cache()
+    keys = [phrase_key(p, model_name, pretrained) for p in phrases]
+    missing = [p for p, k in zip(phrases, keys) if k not in cache]
+    if missing:
+        vectors = encode_phrases(missing, model_name, pretrained, batch_size)
+        for phrase, vec in zip(missing, vectors):
+            cache[phrase_key(phrase, model_name, pretrained)] = vec
+        save_cache(cache)
+    size, changed = export(phrases, by_character, aliases, np.stack([cache[k] for k in keys]),
+                           model_name, pretrained, languages)
+    return {'phrases': len(phrases), 'aliases': len(aliases), 'encoded': len(missing), 'bytes': size,
+            'changed': changed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AniMatch — CLIP text embeddings for tag/genre search')
+    parser.add_argument('--model', default=MODEL_NAME, help='open_clip model name')
+    parser.add_argument('--pretrained', default=PRETRAINED, help='open_clip pretrained tag')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Phrases per encoder batch')
+    parser.add_argument('--languages', nargs='+', choices=list(LANGUAGES), default=list(DEFAULT_LANGUAGES),
+                        help='Languages the text tower reads; the rest become aliases (default: en)')
+    add_instrument_args(parser)
+    args = parser.parse_args()
+
+    print("🎌 AniMatch — Text Embeddings")
+    with instrumented('text_embeddings', args):
+        with timer('load_json'):
+            with open(EMBEDDINGS_PATH, encoding='utf-8') as f:
+                data = json.load(f)
+        s = build_text_embeddings(data, args.model, args.pretrained, args.batch_size, args.languages)
+        print(f"  ✅ {s['phrases']} {'/'.join(args.languages)} phrases ({s['encoded']} newly encoded), "
+              f"{s['aliases']} aliases, {s['bytes'] / 1024:.0f} KB matrix"
+              + (f" → {MATRIX_PATH}" if s['changed'] else " — unchanged, not rewritten"))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+AniMatch — Translation Engine
+Fills the en/ja/zh-TW columns of animatch.db (genres, names, personality,
+charm points, quotes, tags) from a translation memory, replacing
+db/apply_translations.py, db/translate_db.py and scripts/translate_db.py.
+
+The memory is a table in animatch.db, keyed by (source text, locale):
+
+  translation_memory(source, locale, target, origin, updated_at)
+
+Entries come from three places, in order of precedence:
+  glossary    the curated dicts in translation_glossary.py
+  db          translations already present in the DB, harvested once
+  <plug-in>   a machine translator, only for strings the memory lacks
+
+translation_state records a hash of each row's source text per locale.
+A run only looks again at rows whose source changed, whose glossary
+entries changed, or that were incomplete last time. Writes go through
+executemany in one transaction, and a column is written only when its
+value actually differs. A row with any untranslated string is left as it
+is, and the string is counted as missing in the coverage report. Names
+(name_jp, name_zh_tw) are only filled when empty.
+
+Translator plug-ins take (texts, locale) and return one translation or
+None per text:
+  --translator google              deep_translator's GoogleTranslator (pip install deep-translator)
+  --translator mypkg.mt:translate  any importable callable, e.g. a local/offline model
+
+Usage:
+  python translate.py                       # memory + glossary only
+  python translate.py --locales ja,zh-TW --translator google
+  python translate.py --dry-run             # coverage report, no writes
+"""
+
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import sqlite3
+
+from instrument import add_instrument_args, count, instrumented, timer
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(SCRIPT_DIR, '..', 'db', 'animatch.db')
+SOURCE_LANG = 'ko'
+LOCALES = ('en', 'ja', 'zh-TW')
+GOOGLE_WORKERS = 10
+
+
+class Field:
+    """A source column and the column holding its translation per locale."""
+
+    def __init__(self, table, source, targets, is_list=False, fill_only=False):
+        self.table = table
+        self.source = source
+        self.targets = targets        # locale → column
+        self.is_list = is_list        # JSON array of strings, translated item by item
+        self.fill_only = fill_only    # never overwrite a non-empty target
+
+    def strings(self, value):
+        if not value:
+            return []
+        if not self.is_list:
+            return [value]
+        try:
+            items = json.loads(value)
+        except json.JSONDecodeError:
+            return []
+        return [i for i in items if isinstance(i, str) and i] if isinstance(items, list) else []
+
+
+FIELDS = [
+    Field('animes', 'genre', {'en': 'genre_en', 'ja': 'genre_ja', 'zh-TW': 'genre_zh_tw'}, is_list=True),
+    Field('characters', 'name_ko', {'ja': 'name_jp', 'zh-TW': 'name_zh_tw'}, fill_only=True),
+    Field('characters', 'personality',
+          {'en': 'personality_en', 'ja': 'personality_ja', 'zh-TW': 'personality_zh_tw'}, is_list=True),
+    Field('characters', 'charm_points',
+          {'en': 'charm_points_en', 'ja': 'charm_points_ja', 'zh-TW': 'charm_points_zh_tw'}),
+    Field('characters', 'iconic_quote',
+          {'en': 'iconic_quote_en', 'ja': 'iconic_quote_ja', 'zh-TW': 'iconic_quote_zh_tw'}),
+    Field('characters', 'tags', {'en': 'tags_en', 'ja': 'tags_ja', 'zh-TW': 'tags_zh_tw'}, is_list=True),
+]
+TABLES = ('animes', 'characters')
+PERSONALITY = next(f for f in FIELDS if f.source == 'personality')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS translation_memory (
+  source      TEXT NOT NULL,
+  locale      TEXT NOT NULL,
+  target      TEXT NOT NULL,
+  origin      TEXT NOT NULL,            -- glossary | db | translator name
+  updated_at  TEXT DEFAULT (datetime('now')),
+  PRIMARY KEY (source, locale)
+);
+CREATE TABLE IF NOT EXISTS translation_state (
+  table_name  TEXT NOT NULL,
+  row_id      INTEGER NOT NULL,
+  locale      TEXT NOT NULL,
+  source_hash TEXT NOT NULL,            -- hash of the row's source columns when last completed
+  PRIMARY KEY (table_name, row_id, locale)
+);
+"""
+
+
+# --- Translator plug-ins ------------------------------------------------------
+
+def google_translate(texts, locale):
+    from concurrent.futures import ThreadPoolExecutor
+    from deep_translator import GoogleTranslator
+
+    def one(text):
+        try:
+            return GoogleTranslator(source=SOURCE_LANG, target=locale).translate(text)
+        except Exception as e:
+            print(f"  ⚠️ {locale}: {text[:30]!r}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=GOOGLE_WORKERS) as pool:
+        return list(pool.map(one, texts))
+
+
+TRANSLATORS = {'google': google_translate}
+
+
+def load_translator(spec):
+    """(name, callable) for a registered name or a 'module:function' path."""
+    if spec in TRANSLATORS:
+        return spec, TRANSLATORS[spec]
+    module, _, func = spec.partition(':')
+    if not func:
+        raise SystemExit(f"Unknown translator {spec!r} (use {', '.join(TRANSLATORS)} or module:function)")
+    return spec, getattr(importlib.import_module(module), func)
+
+
+# --- Memory -------------------------------------------------------------------
+
+class Memory:
+    """The translation memory in RAM; writes are queued for the run's single transaction."""
+
+    def __init__(self, conn):
+        self.entries = {}   # (source, locale) → (target, origin)
+        if table_columns(conn, 'translation_memory'):  # absent on a dry run before the first real one
+            for source, locale, target, origin in conn.execute(
+                    "SELECT source, locale, target, origin FROM translation_memory"):
+                self.entries[(source, locale)] = (target, origin)
+        self.pending = {}   # (source, locale) → (target, origin)
+        self.changed = set()  # (source, locale) whose target changed this run
+
+    def get(self, source, locale):
+        entry = self.entries.get((source, locale))
+        return entry[0] if entry else None
+
+    def origin(self, source, locale):
+        entry = self.entries.get((source, locale))
+        return entry[1] if entry else None
+
+    def put(self, source, locale, target, origin, overwrite=True):
+        key = (source, locale)
+        old = self.entries.get(key)
+        if old == (target, origin) or (old is not None and not overwrite):
+            return
+        if old is None or old[0] != target:
+            self.changed.add(key)
+        self.entries[key] = self.pending[key] = (target, origin)
+
+    def flush(self, conn):
+        conn.executemany("""
+            INSERT INTO translation_memory (source, locale, target, origin) VALUES (?, ?, ?, ?)
+            ON CONFLICT(source, locale) DO UPDATE SET
+                target = excluded.target, origin = excluded.origin, updated_at = datetime('now')
+        """, [(s, l, t, o) for (s, l), (t, o) in self.pending.items()])
+        return len(self.pending)
+
+
+def load_glossary(memory, rows_by_table):
+    """Curated English into the memory (origin 'glossary'); wins over db/translator entries."""
+    from translation_glossary import GENRE_MAP, PHRASES, TAG_MAP, TRANSLATIONS
+    glossary = {**TAG_MAP, **GENRE_MAP, **PHRASES}
+    # TRANSLATIONS is keyed by character name; pair it with that character's Korean text.
+    # Being specific to one character, it overrides the generic PHRASES.
+    for row in rows_by_table['characters'].values():
+        curated = TRANSLATIONS.get(row['name_ko'])
+        if not curated:
+            continue
+        personality = PERSONALITY.strings(row['personality'])
+        if len(personality) == len(curated.get('personality_en', [])):
+            glossary.update(zip(personality, curated['personality_en']))
+        for field, key in (('charm_points', 'charm_points_en'), ('iconic_quote', 'iconic_quote_en')):
+            if row[field] and curated.get(key):
+                glossary[row[field]] = curated[key]
+    for source, target in glossary.items():
+        memory.put(source, 'en', target, 'glossary')
+
+
+def harvest(memory, field, row, locale):
+    """Existing DB translations of a row not seen before → memory (origin 'db')."""
+    column = field.targets[locale]
+    sources = field.strings(row[field.source])
+    if field.is_list:
+        try:
+            targets = json.loads(row[column]) if row[column] else []
+        except json.JSONDecodeError:
+            return
+        if not isinstance(targets, list) or len(targets) != len(sources):
+            return
+    else:
+        targets = [row[column]] if row[column] else []
+        if len(targets) != len(sources):
+            return
+    for source, target in zip(sources, targets):
+        if isinstance(target, str) and target and target != source:  # identity = untranslated fallback
+            memory.put(source, locale, target, 'db', overwrite=False)
+
+
+# --- Engine -------------------------------------------------------------------
+
+def table_columns(conn, table):
+    return {r[1] for r in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def ensure_schema(conn):
+    conn.executescript(SCHEMA)
+    for table in TABLES:
+        existing = table_columns(conn, table)
+        for field in FIELDS:
+            for column in field.targets.values():
+                if field.table == table and column not in existing:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} TEXT")
+                    existing.add(column)
+
+
+def load_rows(conn):
+    conn.row_factory = sqlite3.Row
+    rows = {}
+    for table in TABLES:
+        cols = {'id'} | {f.source for f in FIELDS if f.table == table} \
+            | {c for f in FIELDS if f.table == table for c in f.targets.values()}
+        if table == 'characters':
+            cols.add('name_ko')
+        # Target columns not added yet (dry run on a fresh DB) read as empty
+        existing = table_columns(conn, table)
+        select = ', '.join(c if c in existing else f"NULL AS {c}" for c in sorted(cols))
+        rows[table] = {r['id']: r for r in conn.execute(f"SELECT {select} FROM {table}")}
+    conn.row_factory = None
+    return rows
+
+
+def source_hash(row, fields):
+    return hashlib.sha256(json.dumps([row[f.source] for f in fields], ensure_ascii=False).encode()).hexdigest()[:16]
+
+
+def render(field, translated):
+    return json.dumps(translated, ensure_ascii=False) if field.is_list else translated[0]
+
+
+def same(field, current, new):
+    if field.is_list and current:
+        try:
+            return json.loads(current) == json.loads(new)
+        except json.JSONDecodeError:
+            return False
+    return (current or None) == (new or None)
+
+
+class Report:
+    def __init__(self):
+        self.strings = {}     # locale → {source: origin or None}
+        self.rows_checked = 0
+        self.columns_written = 0
+        self.rows_written = 0
+        self.memory_written = 0
+
+    def print(self):
+        print(f"\n  {'Locale':<7} {'Strings':>8} {'Glossary':>9} {'DB':>6} {'MT':>6} {'Missing':>8} {'Coverage':>9}")
+        for locale, strings in self.strings.items():
+            origins = list(strings.values())
+            n = len(origins)
+            glossary = origins.count('glossary')
+            db = origins.count('db')
+            missing = origins.count(None)
+            mt = n - glossary - db - missing
+            pct = (n - missing) / n if n else 1
+            print(f"  {locale:<7} {n:>8} {glossary:>9} {db:>6} {mt:>6} {missing:>8} {pct:>9.1%}")
+        print(f"\n  Rows re-checked: {self.rows_checked}, rows updated: {self.rows_written} "
+              f"({self.columns_written} columns), memory entries written: {self.memory_written}")
+
+
+def translate_db(conn, locales=LOCALES, translator=None, full=False, dry_run=False):
+    """Run the engine on an open connection; returns a Report."""
+    report = Report()
+    with timer('load'):
+        if not dry_run:  # a dry run only reports; missing columns and tables count as empty
+            ensure_schema(conn)
+        rows_by_table = load_rows(conn)
+        memory = Memory(conn)
+        state = {}
+        if table_columns(conn, 'translation_state'):
+            state = {(t, i, l): h for t, i, l, h in conn.execute(
+                "SELECT table_name, row_id, locale, source_hash FROM translation_state")}
+        load_glossary(memory, rows_by_table)
+
+    # Which (table, row, locale) need another look
+    stale = []
+    for table, rows in rows_by_table.items():
+        for locale in locales:
+            fields = [f for f in FIELDS if f.table == table and locale in f.targets]
+            if not fields:
+                continue
+            for row_id, row in rows.items():
+                h = source_hash(row, fields)
+                key = (table, row_id, locale)
+                if key not in state:
+                    for field in fields:
+                        harvest(memory, field, row, locale)
+                strings = [s for f in fields for s in f.strings(row[f.source])]
+                if full or state.get(key) != h or any((s, locale) in memory.changed for s in strings):
+                    stale.append((table, row_id, locale, fields, h))
+                report.strings.setdefault(locale, {}).update({s: None for s in strings})
+
+    # Machine-translate what the memory still lacks (stale rows only)
+    if translator:
+        name, fn = translator
+        for locale in locales:
+            todo = sorted({s for t, i, l, fields, _ in stale if l == locale
+                           for f in fields for s in f.strings(rows_by_table[t][i][f.source])
+                           if memory.get(s, locale) is None})
+            if not todo:
+                continue
+            print(f"  🌐 {name}: {len(todo)} strings → {locale}")
+            with timer(f'translate:{locale}'):
+                results = fn(todo, locale)
+            for source, target in zip(todo, results):
+                if target:
+                    memory.put(source, locale, target, name)
+                    count('machine_translated')
+
+    for locale, strings in report.strings.items():
+        for source in strings:
+            strings[source] = memory.origin(source, locale)
+
+    # Work out the writes
+    updates = {}       # (table, columns) → [values..., id]
+    done_state = []
+    for table, row_id, locale, fields, h in stale:
+        row = rows_by_table[table][row_id]
+        report.rows_checked += 1
+        changed, complete = {}, True
+        for field in fields:
+            column = field.targets[locale]
+            if field.fill_only and row[column]:
+                continue
+            sources = field.strings(row[field.source])
+            if not sources:
+                continue
+            translated = [memory.get(s, locale) for s in sources]
+            if None in translated:
+                complete = False
+                continue
+            value = render(field, translated)
+            if not same(field, row[column], value):
+                changed[column] = value
+        if changed:
+            columns = tuple(sorted(changed))
+            updates.setdefault((table, columns), []).append([changed[c] for c in columns] + [row_id])
+            report.rows_written += 1
+            report.columns_written += len(changed)
+        if complete:
+            done_state.append((table, row_id, locale, h))
+
+    if dry_run:
+        return report
+
+    with timer('write'):
+        with conn:  # one transaction for memory, rows and state
+            report.memory_written = memory.flush(conn)
+            for (table, columns), params in updates.items():
+                sets = ', '.join(f"{c} = ?" for c in columns)
+                conn.executemany(f"UPDATE {table} SET {sets} WHERE id = ?", params)
+            conn.executemany("""
+                INSERT INTO translation_state (table_name, row_id, locale, source_hash) VALUES (?, ?, ?, ?)
+                ON CONFLICT(table_name, row_id, locale) DO UPDATE SET source_hash = excluded.source_hash
+            """, done_state)
+    count('rows_updated', report.rows_written)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AniMatch — translation engine')
+    parser.add_argument('--locales', type=str, default=','.join(LOCALES),
+                        help=f"Comma-separated locales (default: {','.join(LOCALES)})")
+    parser.add_argument('--translator', type=str, default=None,
+                        help=f"Machine translator for strings the memory lacks: "
+                             f"{', '.join(TRANSLATORS)} or module:function")
+    parser.add_argument('--full', action='store_true', help='Re-check every row, not just changed ones')
+    parser.add_argument('--dry-run', action='store_true', help='Report coverage without writing')
+    add_instrument_args(parser)
+    args = parser.parse_args()
+
+    print("🎌 AniMatch — Translation Engine")
+    if not os.path.exists(DB_PATH):
+        print(f"❌ Database not found at {DB_PATH}")
+        return
+    locales = [l for l in args.locales.split(',') if l]
+    unknown = set(locales) - set(LOCALES)
+    if unknown:
+        raise SystemExit(f"Unknown locale(s): {', '.join(sorted(unknown))}")
+    translator = load_translator(args.translator) if args.translator else None
+
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        with instrumented('translate', args):
+            report = translate_db(conn, locales, translator, full=args.full, dry_run=args.dry_run)
+            report.print()
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
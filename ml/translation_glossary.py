@@ -1,8 +1,15 @@
-import sqlite3
-import json
-import os
+"""
+Curated English glossary for the translation engine (translate.py).
 
-DB_PATH = os.path.join(os.path.dirname(__file__), 'animatch.db')
+These are hand-written translations; the engine loads them into the
+translation memory with origin 'glossary', where they take precedence
+over anything a machine translator produced.
+
+  TRANSLATIONS  per-character personality/charm/quote, keyed by name_ko
+  TAG_MAP       character tags
+  GENRE_MAP     anime genres
+  PHRASES       free-standing sentences (personality items, charm, quotes)
+"""
 
 # High-quality English translations for characters
 # This maps name_ko -> { 'personality_en': [...], 'charm_points_en': "...", 'iconic_quote_en': "..." }
@@ -169,7 +176,7 @@ TRANSLATIONS = {
         'charm_points_en': "The moment the greatest beauty in the land becomes weak only to you. To you, who lives for poison, he is the sweetest poison.",
         'iconic_quote_en': "What a cat-like woman."
     },
-    # Blue Lock 
+    # Blue Lock
     '이사기 요이치': {
         'personality_en': ["Growth-type who awakens from mediocrity to the strongest", "Coexistence of cold judgment and burning competitive spirit", "An egoist who chooses his ego over the team", "Genius intuition that shines in crucial moments"],
         'charm_points_en': "Pure passion aimed at becoming the world's best striker. Getting lost in his eyes will make you want to sprint toward your own dreams.",
@@ -418,12 +425,12 @@ TAG_MAP = {
     "편연": "Slight Affection", "요리치": "Terrible Cook", "전설": "Legend", "피겨": "Figure",
     "러시아": "Russia", "노래": "Singing", "차가움": "Coldness", "아르바이트": "Part-time Job",
     "과거": "Past", "무뚝뚝": "Blunt", "쿨": "Cool", "시점": "POV", "솔로플레이": "Solo Play", "게이머": "Gamer",
-    "리더십": "Leadership", "완벽남": "Perfect Guy", "군인": "Soldier", "솔직": "Honest", "원포올": "One For All", 
+    "리더십": "Leadership", "완벽남": "Perfect Guy", "군인": "Soldier", "솔직": "Honest", "원포올": "One For All",
     "백안": "Byakugan", "긍정": "Positive", "전국무장": "Sengoku Warlord"
 }
 
 GENRE_MAP = {
-    "순정": "Sojo", "학원": "School", "일상": "Slice of Life", "판타지": "Fantasy",
+    "순정": "Romance", "학원": "School", "일상": "Slice of Life", "판타지": "Fantasy",
     "액션": "Action", "코미디": "Comedy", "스릴러": "Thriller", "미스터리": "Mystery",
     "이세계": "Isekai", "다크판타지": "Dark Fantasy", "스포츠": "Sports", "닌자": "Ninja",
     "성장": "Growth", "피겨스케이팅": "Figure Skating", "댄스": "Dance", "테니스": "Tennis",
@@ -433,67 +440,24 @@ GENRE_MAP = {
     "농구": "Basketball", "배구": "Volleyball", "청춘": "Youth", "로맨스": "Romance", "러브코미디": "RomCom"
 }
 
-def translate_list(items, mapping):
-    if not items: return []
-    return [mapping.get(item, item) for item in items]
-
-def main():
-    if not os.path.exists(DB_PATH):
-        print(f"Error: Database not found at {DB_PATH}")
-        return
-
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-
-    # Create missing columns if they don't exist (schema was updated, but DB might not be)
-    try:
-        cursor.execute("ALTER TABLE animes ADD COLUMN genre_en TEXT")
-    except sqlite3.OperationalError:
-        pass # Column already exists
-    
-    try:
-        cursor.execute("ALTER TABLE characters ADD COLUMN personality_en TEXT")
-        cursor.execute("ALTER TABLE characters ADD COLUMN charm_points_en TEXT")
-        cursor.execute("ALTER TABLE characters ADD COLUMN iconic_quote_en TEXT")
-        cursor.execute("ALTER TABLE characters ADD COLUMN tags_en TEXT")
-    except sqlite3.OperationalError:
-        pass
+PHRASES = {
+    # Akane Kurokawa (Oshi no Ko)
+    "천재적 관찰력으로 어떤 역할이든 완벽히 소화": "Perfectly embodies any role with genius observational skills",
+    "겉으로는 침착하지만 내면은 열정적": "Calm on the outside but passionate on the inside",
+    "상대를 깊이 이해하고 분석하는 능력": "Possesses the ability to deeply understand and analyze others",
+    "사랑하는 사람을 위해 자신을 바꿀 수 있는 헌신": "Devotion to change oneself for the person they love",
+    "당신이 원하는 모습이 되어줄 수 있는 사람. 하지만 진짜 매력은, 연기가 아닌 진심으로 당신을 바라보는 그 눈빛.": "Someone who can become whoever you want. But her true charm is that gaze looking at you with sincerity, not acting.",
+    "당신이 원하는 내가 되어줄게": "I'll become the person you want me to be",
 
-    # Update Animes
-    print("Updating anime genres...")
-    cursor.execute("SELECT id, genre FROM animes")
-    for row in cursor.fetchall():
-        genres = json.loads(row['genre']) if row['genre'] else []
-        genres_en = translate_list(genres, GENRE_MAP)
-        cursor.execute("UPDATE animes SET genre_en = ? WHERE id = ?", (json.dumps(genres_en), row['id']))
-
-    # Update Characters
-    print("Updating character translations...")
-    cursor.execute("SELECT id, name_ko, tags, personality, charm_points FROM characters")
-    for row in cursor.fetchall():
-        tags = json.loads(row['tags']) if row['tags'] else []
-        tags_en = translate_list(tags, TAG_MAP)
-        
-        name_ko = row['name_ko']
-        en_data = TRANSLATIONS.get(name_ko, {})
-        
-        pers_en = en_data.get('personality_en', [])
-        if not pers_en and row['personality']:
-            pers_en = json.loads(row['personality']) # Fallback to KO if missing
-            
-        charm_en = en_data.get('charm_points_en', row['charm_points'] or "")
-        quote_en = en_data.get('iconic_quote_en', "")
-        
-        cursor.execute("""
-            UPDATE characters 
-            SET tags_en = ?, personality_en = ?, charm_points_en = ?, iconic_quote_en = ?
-            WHERE id = ?
-        """, (json.dumps(tags_en), json.dumps(pers_en), charm_en, quote_en, row['id']))
-
-    conn.commit()
-    conn.close()
-    print("✅ Translation applied successfully to animatch.db")
-
-if __name__ == "__main__":
-    main()
+    # General/Other
+    "처음에는 거칠지만 마음을 열면 한없이 순수": "Rough at first, but infinitely pure once opened up",
+    "혼자 있을 때 외로움을 많이 타는 여린 마음": "A delicate heart that gets lonely when alone",
+    "사랑을 깨닫고 나면 누구보다 솔직해짐": "Becomes more honest than anyone once realizing love",
+    "작은 체구에 폭발적인 성격 — 손바닥 위의 호랑이": "Explosive personality in a small body — Palmtop Tiger",
+    "완벽해 보이지만 사실은 허당끼 있는 매력": "Looks perfect but has a clumsy, charming side",
+    "자신의 감정에 솔직하지 못한 츤데레": "A tsundere who can't be honest with their feelings",
+    "동료를 아끼는 마음이 누구보다 강함": "Cares for comrades more than anyone",
+    "포기를 모르는 끈질긴 근성": "Persistent spirit that never gives up",
+    "다재다능하고 배려심 깊은 성격": "Versatile and deeply considerate character",
+    "겉으로는 까칠하지만 속은 누구보다 따뜻함": "Prickly on the outside but warmer than anyone inside"
+}
@@ -12,6 +12,7 @@ const PRECACHE_URLS = [
 function isCacheFirstResource(url) {
     const path = url.pathname;
     return (
+        // /models/chunks/ is cached per chunk by the ML worker (src/ml/chunkedModel.ts)
         path.endsWith('.onnx') ||
         path.endsWith('.wasm') ||
         path.includes('embeddings.json') ||
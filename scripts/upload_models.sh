@@ -0,0 +1,41 @@
+#!/usr/bin/env bash
+
+# upload_models.sh
+# Uploads the chunked model packages (ml/package_models.py) to the R2 `animatch-models` bucket,
+# served at /models/* by functions/models/[[path]].ts.
+# Graphs and chunks go first and each manifest last, so a client never reads a manifest
+# that names files not uploaded yet. Content-hashed files are never overwritten with
+# different bytes, so re-running is safe.
+
+set -e
+
+BUCKET="animatch-models"
+MODEL_DIR="public/models"
+
+shopt -s nullglob
+manifests=("${MODEL_DIR}"/*.manifest.json)
+if [ ${#manifests[@]} -eq 0 ]; then
+  echo "❌ No manifests in ${MODEL_DIR}. Run: python ml/package_models.py"
+  exit 1
+fi
+
+for manifest in "${manifests[@]}"; do
+  name=$(basename "$manifest")
+  echo "==== ${name} ===="
+  # base + graph + chunk file names, one path per line, relative to MODEL_DIR
+  files=$(node -e '
+    const m = require(process.argv[1]);
+    const ext = m.external_data;
+    for (const f of [m.graph.file, ...ext.chunks.map((c) => c.file)]) console.log(m.base + f);
+  ' "$(realpath "$manifest")")
+  for file in $files; do
+    echo "Uploading ${file}..."
+    npx wrangler r2 object put "${BUCKET}/${file}" --file "${MODEL_DIR}/${file}" \
+      --content-type "application/octet-stream" --remote
+  done
+  npx wrangler r2 object put "${BUCKET}/${name}" --file "$manifest" \
+    --content-type "application/json" --remote
+done
+
+echo ""
+echo "✅ Uploaded ${#manifests[@]} model package(s) to R2 bucket: ${BUCKET}"
@@ -9,6 +9,9 @@ import AdBanner from '@/components/shared/AdBanner';
 import { useMLStore } from '@/stores/mlStore';
 import { useLocalizedChar } from '@/hooks/useLocalizedChar';
 import type { CharacterEmbedding } from '@/types/character';
+import { getHeroineImageSources, placeholderBackground } from '@/utils/heroineImage';
+import { loadTextIndex, vibeScores, VIBE_THRESHOLD } from '@/utils/textSearch';
+import type { TextIndex } from '@/utils/textSearch';
 import styles from './CharacterBrowse.module.css';
 
 type OrientationFilter = 'all' | 'male' | 'female';
@@ -20,6 +23,9 @@ const GENRE_KEYS = [
 
 type GenreKey = typeof GENRE_KEYS[number];
 
+// Matches the .grid columns in CharacterBrowse.module.css
+const CARD_SIZES = '(max-width: 480px) 50vw, (max-width: 768px) 200px, 260px';
+
 const GENRE_MAP: Record<string, string[]> = {
     romance: ['로맨스', 'Romance'],
     action: ['액션', 'Action'],
@@ -35,6 +41,7 @@ function CharacterCard({ char, onClick }: { char: CharacterEmbedding; onClick: (
     const [imgState, setImgState] = useState<'official' | 'emoji'>('official');
     const localized = useLocalizedChar(char);
     const fallbackBg = char.heroine_color || 'linear-gradient(135deg, #667eea, #764ba2)';
+    const sources = getHeroineImageSources(char);
 
     return (
         <motion.article
@@ -48,16 +55,24 @@ function CharacterCard({ char, onClick }: { char: CharacterEmbedding; onClick: (
             role="button"
             tabIndex={0}
         >
-            <div className={styles.cardImage} style={{ background: fallbackBg }}>
-                {imgState === 'official' && char.heroine_image ? (
-                    <img
-                        src={char.heroine_image}
-                        alt={`AniMatch character: ${char.heroine_name_en} from ${char.anime_en}`}
-                        className={styles.cardImg}
-                        referrerPolicy="no-referrer"
-                        loading="lazy"
-                        onError={() => setImgState('emoji')}
-                    />
+            <div
+                className={styles.cardImage}
+                style={{ background: imgState === 'official' ? placeholderBackground(sources, fallbackBg) : fallbackBg }}
+            >
+                {imgState === 'official' && sources.src ? (
+                    <picture className={styles.cardPicture}>
+                        {sources.avifSrcSet && <source type="image/avif" srcSet={sources.avifSrcSet} sizes={CARD_SIZES} />}
+                        {sources.webpSrcSet && <source type="image/webp" srcSet={sources.webpSrcSet} sizes={CARD_SIZES} />}
+                        <img
+                            src={sources.src}
+                            alt={`AniMatch character: ${char.heroine_name_en} from ${char.anime_en}`}
+                            className={styles.cardImg}
+                            referrerPolicy="no-referrer"
+                            loading="lazy"
+                            decoding="async"
+                            onError={() => setImgState('emoji')}
+                        />
+                    </picture>
                 ) : (
                     <span className={styles.cardEmoji}>{char.heroine_emoji || '💖'}</span>
                 )}
@@ -84,6 +99,7 @@ export default function CharacterBrowse() {
     const [orientation, setOrientation] = useState<OrientationFilter>('all');
     const [genre, setGenre] = useState<GenreKey>('all');
     const [isLoading, setIsLoading] = useState(false);
+    const [textIndex, setTextIndex] = useState<TextIndex | null>(null);
 
     // Load embeddings if not already loaded
     useEffect(() => {
@@ -126,6 +142,17 @@ export default function CharacterBrowse() {
         return () => { cancelled = true; };
     }, [embeddingsData, setEmbeddingsData]);
 
+    // Phrase vectors for vibe search, fetched on the first search only
+    const hasSearch = search.trim() !== '';
+    useEffect(() => {
+        if (!hasSearch || textIndex) return;
+        let cancelled = false;
+        loadTextIndex().then((index) => {
+            if (!cancelled && index) setTextIndex(index);
+        });
+        return () => { cancelled = true; };
+    }, [hasSearch, textIndex]);
+
     const characters = embeddingsData?.characters ?? [];
 
     const filteredCharacters = useMemo(() => {
@@ -147,6 +174,7 @@ export default function CharacterBrowse() {
 
         if (search.trim()) {
             const q = search.trim().toLowerCase();
+            const candidates = result;
             result = result.filter((c) => {
                 const searchableFields = [
                     c.heroine_name, c.heroine_name_en,
@@ -156,10 +184,20 @@ export default function CharacterBrowse() {
                 ].filter(Boolean);
                 return searchableFields.some((f) => f!.toLowerCase().includes(q));
             });
+
+            // Then characters whose tags/genre/personality are semantically close
+            const scores = textIndex ? vibeScores(textIndex, q) : null;
+            if (scores) {
+                const matched = new Set(result.map((c) => c.heroine_id));
+                const vibe = candidates
+                    .filter((c) => !matched.has(c.heroine_id) && (scores.get(c.heroine_id) ?? -1) >= VIBE_THRESHOLD)
+                    .sort((a, b) => scores.get(b.heroine_id)! - scores.get(a.heroine_id)!);
+                result = [...result, ...vibe];
+            }
         }
 
         return result;
-    }, [characters, orientation, genre, search]);
+    }, [characters, orientation, genre, search, textIndex]);
 
     return (
         <motion.section
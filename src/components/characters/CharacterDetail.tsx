@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useMemo } from 'react';
 import { useParams, Link } from 'react-router-dom';
 import { useTranslation } from 'react-i18next';
 import { motion } from 'framer-motion';
@@ -9,6 +9,8 @@ import AdBanner from '@/components/shared/AdBanner';
 import { useMLStore } from '@/stores/mlStore';
 import { useLocalizedChar } from '@/hooks/useLocalizedChar';
 import type { CharacterEmbedding } from '@/types/character';
+import { getLocalizedChar } from '@/utils/localize';
+import { getSimilarIds } from '@/utils/similar';
 import styles from './CharacterDetail.module.css';
 
 const isMobile = typeof navigator !== 'undefined' && /iPhone|iPad|iPod|Android/i.test(navigator.userAgent);
@@ -48,6 +50,50 @@ function HeroImage({ char }: { char: CharacterEmbedding }) {
     );
 }
 
+function SimilarCharacters({ char }: { char: CharacterEmbedding }) {
+    const { t, i18n } = useTranslation();
+    const characters = useMLStore((s) => s.embeddingsData?.characters);
+    const [ids, setIds] = useState<number[]>([]);
+
+    useEffect(() => {
+        let cancelled = false;
+        getSimilarIds(char.heroine_id).then((similar) => {
+            if (!cancelled) setIds(similar);
+        });
+        return () => { cancelled = true; };
+    }, [char.heroine_id]);
+
+    const similar = useMemo(() => {
+        const byId = new Map(characters?.map((c) => [c.heroine_id, c]));
+        return ids.map((id) => byId.get(id)).filter((c): c is CharacterEmbedding => !!c);
+    }, [ids, characters]);
+
+    if (similar.length === 0) return null;
+
+    return (
+        <div className={styles.similarSection}>
+            <h3 className={styles.detailTitle}>{t('characters.similarTitle')}</h3>
+            <div className={styles.similarList}>
+                {similar.map((c) => {
+                    const localized = getLocalizedChar(c, i18n.language);
+                    return (
+                        <Link key={c.heroine_id} to={`/characters/${c.heroine_id}`} className={styles.similarItem}>
+                            <span
+                                className={styles.similarEmoji}
+                                style={{ background: c.heroine_color || 'linear-gradient(135deg, #667eea, #764ba2)' }}
+                            >
+                                {c.heroine_emoji || '💖'}
+                            </span>
+                            <span className={styles.similarName}>{localized.name}</span>
+                            <span className={styles.similarAnime}>{localized.anime}</span>
+                        </Link>
+                    );
+                })}
+            </div>
+        </div>
+    );
+}
+
 export default function CharacterDetail() {
     const { id } = useParams<{ id: string }>();
     const { t } = useTranslation();
@@ -205,6 +251,8 @@ function CharacterDetailContent({ char }: { char: CharacterEmbedding }) {
                     </div>
                 </motion.div>
 
+                <SimilarCharacters char={char} />
+
                 {/* Action Buttons */}
                 <div className={styles.actionButtons}>
                     <Link to="/characters" className={styles.listBtn}>
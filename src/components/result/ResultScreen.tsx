@@ -15,12 +15,18 @@ import type { MatchCandidate, MatchResult } from '@/types/match';
 import type { CharacterEmbedding } from '@/types/character';
 import AdBanner from '@/components/shared/AdBanner';
 import { getLocalizedChar } from '@/utils/localize';
+import { getHeroineImageSources, placeholderBackground } from '@/utils/heroineImage';
 import styles from './ResultScreen.module.css';
 
+// Rendered widths of the hero card and runner-up thumbnails (ResultScreen.module.css)
+const HERO_SIZES = '(max-width: 768px) 100vw, 380px';
+const RUNNER_UP_SIZES = '44px';
+
 function HeroImage({ char, children }: { char: CharacterEmbedding; children: React.ReactNode }) {
   const [isFlipped, setIsFlipped] = useState(false);
   const [imgState, setImgState] = useState<'loading' | 'official' | 'emoji'>('loading');
   const fallbackBg = char.heroine_color || 'linear-gradient(135deg, #f093fb, #f5576c)';
+  const sources = getHeroineImageSources(char);
 
   useEffect(() => {
     setIsFlipped(false);
@@ -41,10 +47,14 @@ function HeroImage({ char, children }: { char: CharacterEmbedding; children: Rea
     img.onerror = () => {
       if (isMounted) setImgState('emoji');
     };
-    img.src = char.heroine_image;
+    if (sources.webpSrcSet) {
+      img.sizes = HERO_SIZES;
+      img.srcset = sources.webpSrcSet;
+    }
+    img.src = sources.src;
 
     return () => { isMounted = false; };
-  }, [char.heroine_id, char.heroine_image]);
+  }, [char.heroine_id, char.heroine_image, sources.src, sources.webpSrcSet]);
 
   return (
     <div
@@ -57,11 +67,16 @@ function HeroImage({ char, children }: { char: CharacterEmbedding; children: Rea
           <span className={styles.emojiLg}>{char.heroine_emoji || '💖'}</span>
         </div>
         {/* Back: Official Character Image */}
-        <div className={styles.flipBack} style={{ background: fallbackBg }}>
+        <div
+          className={styles.flipBack}
+          style={{ background: imgState === 'emoji' ? fallbackBg : placeholderBackground(sources, fallbackBg) }}
+        >
           {imgState === 'official' && char.heroine_image && (
             <img
               className={styles.heroTarotImg}
-              src={char.heroine_image}
+              src={sources.src}
+              srcSet={sources.webpSrcSet}
+              sizes={sources.webpSrcSet ? HERO_SIZES : undefined}
               alt={'AniMatch character result: ' + char.heroine_name}
               style={{ objectFit: 'cover' }}
               crossOrigin="anonymous"
@@ -83,6 +98,7 @@ function HeroImage({ char, children }: { char: CharacterEmbedding; children: Rea
 function RunnerUpImage({ char }: { char: CharacterEmbedding }) {
   const [imgState, setImgState] = useState<'loading' | 'official' | 'emoji'>('loading');
   const fallbackBg = char.heroine_color || 'linear-gradient(135deg, #667eea, #764ba2)';
+  const sources = getHeroineImageSources(char);
 
   useEffect(() => {
     let isMounted = true;
@@ -102,10 +118,14 @@ function RunnerUpImage({ char }: { char: CharacterEmbedding }) {
     img.onerror = () => {
       if (isMounted) setImgState('emoji');
     };
-    img.src = char.heroine_image;
+    if (sources.webpSrcSet) {
+      img.sizes = RUNNER_UP_SIZES;
+      img.srcset = sources.webpSrcSet;
+    }
+    img.src = sources.src;
 
     return () => { isMounted = false; };
-  }, [char.heroine_id, char.heroine_image]);
+  }, [char.heroine_id, char.heroine_image, sources.src, sources.webpSrcSet]);
 
   if (imgState === 'emoji' || imgState === 'loading' || !char.heroine_image) {
     return (
@@ -119,7 +139,9 @@ function RunnerUpImage({ char }: { char: CharacterEmbedding }) {
     <div className={styles.runnerUpEmoji}>
       <img
         className={styles.runnerUpTarotImg}
-        src={char.heroine_image}
+        src={sources.src}
+        srcSet={sources.webpSrcSet}
+        sizes={sources.webpSrcSet ? RUNNER_UP_SIZES : undefined}
         alt={'AniMatch character runner-up: ' + char.heroine_name}
         style={{ objectFit: 'cover' }}
         crossOrigin="anonymous"
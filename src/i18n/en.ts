@@ -136,5 +136,6 @@ export default {
     headerIcon: 'Character Gallery',
     detailTitle: 'Character Profile',
     backToList: '← Back to Gallery',
+    similarTitle: 'You might also match',
   },
 };
@@ -136,5 +136,6 @@ export default {
         headerIcon: 'キャラクター図鑑',
         detailTitle: 'キャラクタープロフィール',
         backToList: '← 一覧に戻る',
+        similarTitle: 'こちらのキャラにも似ています',
     },
 };
@@ -136,5 +136,6 @@ export default {
     headerIcon: '캐릭터 도감',
     detailTitle: '캐릭터 프로필',
     backToList: '← 목록으로',
+    similarTitle: '이런 캐릭터도 닮았어요',
   },
 };
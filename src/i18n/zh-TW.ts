@@ -136,5 +136,6 @@ export default {
         headerIcon: '角色圖鑑',
         detailTitle: '角色檔案',
         backToList: '← 返回列表',
+        similarTitle: '你可能也像這些角色',
     },
 };
@@ -0,0 +1,159 @@
+/**
+ * Loader for models packaged by ml/package_models.py: a small graph plus
+ * content-hashed weight chunks, listed in /models/<stem>.manifest.json.
+ *
+ * Chunks download a few at a time, are checked against their SHA-256 and
+ * stored one by one in Cache Storage, so a dropped connection resumes from
+ * the chunks already stored instead of restarting the whole download. The
+ * weights are reassembled into the single external-data file the graph
+ * names and handed to onnxruntime-web as `externalData`.
+ */
+
+interface ChunkEntry {
+    file: string;
+    offset: number;
+    size: number;
+    sha256: string;
+}
+
+export interface ModelManifest {
+    version: number;
+    model: string;
+    base: string; // relative to the manifest URL
+    graph: { file: string; size: number; sha256: string };
+    external_data: {
+        location: string;
+        size: number;
+        sha256: string;
+        chunk_size: number;
+        chunks: ChunkEntry[];
+    };
+}
+
+export interface ChunkedModel {
+    graph: Uint8Array;
+    externalData: { path: string; data: Uint8Array }[];
+}
+
+const MANIFEST_VERSION = 1;
+/** Not `animatch-*`: sw.js deletes those caches on every CACHE_VERSION bump. */
+const CHUNK_CACHE = 'model-chunks-v1';
+const PARALLEL_FETCHES = 4;
+const FETCH_ATTEMPTS = 3;
+
+/** `/assets/models/clip-image-encoder-q8.onnx` → `/models/clip-image-encoder-q8.manifest.json` */
+export function manifestUrl(modelPath: string): string {
+    const stem = modelPath.split('/').pop()!.replace(/\.onnx$/, '');
+    return `/models/${stem}.manifest.json`;
+}
+
+async function sha256Hex(data: ArrayBuffer): Promise<string> {
+    const digest = new Uint8Array(await crypto.subtle.digest('SHA-256', data));
+    return Array.from(digest, (b) => b.toString(16).padStart(2, '0')).join('');
+}
+
+async function openCache(): Promise<Cache | null> {
+    if (typeof caches === 'undefined') return null;
+    try {
+        return await caches.open(CHUNK_CACHE);
+    } catch {
+        return null; // e.g. storage disabled in private browsing
+    }
+}
+
+/** The current manifest, or the last one stored when offline; null when the model isn't packaged. */
+async function loadManifest(url: string, cache: Cache | null): Promise<ModelManifest | null> {
+    let response: Response | undefined;
+    try {
+        response = await fetch(url, { cache: 'no-cache' });
+    } catch {
+        response = await cache?.match(url);
+    }
+    if (!response?.ok) return null;
+    // The dev server answers unknown paths with index.html
+    const manifest = (await response.clone().json().catch(() => null)) as ModelManifest | null;
+    if (manifest?.version !== MANIFEST_VERSION) return null;
+    await cache?.put(url, response).catch(() => undefined);
+    return manifest;
+}
+
+/** One content-hashed file: from the cache when intact, otherwise fetched (with retries), verified and stored. */
+async function loadFile(url: string, size: number, sha256: string, cache: Cache | null): Promise<ArrayBuffer> {
+    const cached = await cache?.match(url);
+    if (cached) {
+        const data = await cached.arrayBuffer();
+        if (data.byteLength === size && (await sha256Hex(data)) === sha256) return data;
+        await cache!.delete(url);
+    }
+
+    let lastError: unknown;
+    for (let attempt = 0; attempt < FETCH_ATTEMPTS; attempt++) {
+        try {
+            const response = await fetch(url);
+            if (!response.ok) throw new Error(`${url}: HTTP ${response.status}`);
+            const data = await response.arrayBuffer();
+            if (data.byteLength !== size || (await sha256Hex(data)) !== sha256) {
+                throw new Error(`${url}: content does not match the manifest`);
+            }
+            // Over quota the chunk is still usable for this load, just not resumable
+            await cache?.put(url, new Response(data)).catch(() => undefined);
+            return data;
+        } catch (e) {
+            lastError = e;
+        }
+    }
+    throw lastError;
+}
+
+/** Run `fn` over `items` with at most `limit` calls in flight. */
+async function forEachLimit<T>(items: T[], limit: number, fn: (item: T) => Promise<void>): Promise<void> {
+    let next = 0;
+    const lanes = Array.from({ length: Math.min(limit, items.length) }, async () => {
+        while (next < items.length) await fn(items[next++]!);
+    });
+    await Promise.all(lanes);
+}
+
+/** Drop cached chunks of this model that the current manifest no longer lists. */
+async function evictStale(cache: Cache, base: string, keep: Set<string>): Promise<void> {
+    for (const request of await cache.keys()) {
+        if (request.url.startsWith(base) && !keep.has(request.url)) await cache.delete(request);
+    }
+}
+
+/**
+ * Graph and reassembled weights for `modelPath`, or null when no manifest
+ * is deployed for it (the caller then loads the monolithic .onnx). Throws
+ * when a chunk can't be fetched intact; chunks stored so far are kept for
+ * the next attempt.
+ */
+export async function loadChunkedModel(modelPath: string): Promise<ChunkedModel | null> {
+    const url = new URL(manifestUrl(modelPath), self.location.href).href;
+    const cache = await openCache();
+    const manifest = await loadManifest(url, cache);
+    if (!manifest) return null;
+
+    const base = new URL(manifest.base, url).href;
+    const ext = manifest.external_data;
+    let expected = 0;
+    for (const chunk of ext.chunks) {
+        if (chunk.offset !== expected) throw new Error(`${manifest.model}: chunk ${chunk.file} is not contiguous`);
+        expected += chunk.size;
+    }
+    if (expected !== ext.size) throw new Error(`${manifest.model}: chunks cover ${expected} of ${ext.size} bytes`);
+
+    const weights = new Uint8Array(ext.size);
+    const [graph] = await Promise.all([
+        loadFile(base + manifest.graph.file, manifest.graph.size, manifest.graph.sha256, cache),
+        forEachLimit(ext.chunks, PARALLEL_FETCHES, async (chunk) => {
+            const data = await loadFile(base + chunk.file, chunk.size, chunk.sha256, cache);
+            weights.set(new Uint8Array(data), chunk.offset);
+        }),
+    ]);
+
+    if (cache) {
+        const keep = new Set([manifest.graph.file, ...ext.chunks.map((c) => c.file)].map((f) => base + f));
+        evictStale(cache, base, keep).catch(() => undefined);
+    }
+    return { graph: new Uint8Array(graph), externalData: [{ path: ext.location, data: weights }] };
+}
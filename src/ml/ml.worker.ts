@@ -1,5 +1,6 @@
 import * as ort from 'onnxruntime-web';
 import { PREPROCESS, MODEL_PATH } from './types';
+import { loadChunkedModel } from './chunkedModel';
 
 // Web Worker context
 const ctx = self as unknown as Worker;
@@ -22,8 +23,18 @@ const SESSION_OPTIONS: ort.InferenceSession.SessionOptions = {
     enableCpuMemArena: true,
 };
 
-/** Create an ONNX InferenceSession, fetching the model as ArrayBuffer first (with dev-server fallback). */
+/**
+ * Create an ONNX InferenceSession from the model's chunked package when one is deployed,
+ * else by fetching the model as ArrayBuffer first (with dev-server fallback).
+ */
 async function createSession(modelPath: string): Promise<ort.InferenceSession> {
+    const chunked = await loadChunkedModel(modelPath);
+    if (chunked) {
+        return await ort.InferenceSession.create(chunked.graph, {
+            ...SESSION_OPTIONS,
+            externalData: chunked.externalData,
+        });
+    }
     try {
         const response = await fetch(modelPath, { cache: 'force-cache' });
         const arrayBuffer = await response.arrayBuffer();
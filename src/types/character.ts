@@ -16,6 +16,9 @@ export interface CharacterEmbedding {
   heroine_name_ja?: string;
   heroine_name_zh_tw?: string;
   heroine_image: string;
+  heroine_image_avif?: string;   // srcset of AVIF derivatives (ml/heroine_images.py)
+  heroine_image_webp?: string;   // srcset of WebP derivatives
+  heroine_image_lqip?: string;   // blurred data-URI placeholder
   heroine_personality: string[];
   heroine_personality_en: string[];
   heroine_personality_ja?: string[];
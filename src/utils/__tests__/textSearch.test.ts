@@ -0,0 +1,118 @@
+import { describe, it, expect } from 'vitest';
+import { float16ToFloat32, vibeScores, type TextIndex } from '@/utils/textSearch';
+
+// ── Helpers ───────────────────────────────────────────────────────────────────
+
+function unit(v: number[]): number[] {
+    const norm = Math.hypot(...v);
+    return v.map((x) => x / norm);
+}
+
+/** A 3-d index: each phrase is a unit row, each character owns some phrases. */
+function createIndex(
+    rows: Record<string, number[]>,
+    characters: Record<string, number[]>,
+    aliases: Record<string, number> = {},
+): TextIndex {
+    const phrases = Object.keys(rows);
+    return {
+        dim: 3,
+        phrases,
+        terms: [...phrases, ...Object.keys(aliases)].map((t) => t.toLowerCase()),
+        termPhrases: [...phrases.map((_, i) => i), ...Object.values(aliases)],
+        matrix: Float32Array.from(phrases.flatMap((p) => unit(rows[p]))),
+        characters,
+    };
+}
+
+const index = createIndex(
+    {
+        Tsundere: [1, 0, 0],
+        'Cool beauty': [0.9, 0.44, 0],
+        Cheerful: [0, 1, 0],
+        Airhead: [0, 0.2, 1],
+    },
+    {
+        1: [0],     // Tsundere
+        2: [1],     // Cool beauty
+        3: [2, 3],  // Cheerful, Airhead
+    },
+    { 츤데레: 0, 쿨뷰티: 1, 천연: 3 },
+);
+
+// ── float16ToFloat32 ──────────────────────────────────────────────────────────
+
+describe('float16ToFloat32', () => {
+    it('decodes normal values', () => {
+        const out = float16ToFloat32(Uint16Array.from([0x3c00, 0xc000, 0x3555, 0x7bff]));
+        expect(out[0]).toBe(1);
+        expect(out[1]).toBe(-2);
+        expect(out[2]).toBeCloseTo(1 / 3, 3);
+        expect(out[3]).toBe(65504); // largest finite float16
+    });
+
+    it('decodes zero and subnormal values', () => {
+        const out = float16ToFloat32(Uint16Array.from([0x0000, 0x8000, 0x0001, 0x03ff, 0x8200]));
+        expect(out[0]).toBe(0);
+        expect(Object.is(out[1], -0)).toBe(true);
+        expect(out[2]).toBe(2 ** -24);
+        expect(out[3]).toBe(1023 * 2 ** -24);
+        expect(out[4]).toBe(-(2 ** -15));
+    });
+
+    it('decodes ±Infinity and NaN', () => {
+        const out = float16ToFloat32(Uint16Array.from([0x7c00, 0xfc00, 0x7e00]));
+        expect(out[0]).toBe(Infinity);
+        expect(out[1]).toBe(-Infinity);
+        expect(out[2]).toBeNaN();
+    });
+});
+
+// ── vibeScores ────────────────────────────────────────────────────────────────
+
+describe('vibeScores', () => {
+    it('returns null when the query mentions no known phrase', () => {
+        expect(vibeScores(index, 'yandere')).toBeNull();
+    });
+
+    it('does not substring-match a one-character query', () => {
+        expect(vibeScores(index, 'e')).toBeNull();
+        expect(vibeScores(index, ' C ')).toBeNull();
+        expect(vibeScores(index, 'ch')?.get(3)).toBeCloseTo(1, 5); // two characters do
+    });
+
+    it('matches phrases case-insensitively, as a word or substring of the query', () => {
+        expect(vibeScores(index, 'TSUNDERE')?.get(1)).toBeCloseTo(1, 5);
+        expect(vibeScores(index, 'a tsundere, please')?.get(1)).toBeCloseTo(1, 5);
+        expect(vibeScores(index, 'cool')?.get(2)).toBeCloseTo(1, 5);
+    });
+
+    it('scores aliases on the vectors of the phrases they stand for', () => {
+        expect(vibeScores(index, '츤데레')).toEqual(vibeScores(index, 'tsundere'));
+        expect(vibeScores(index, '천연')?.get(3)).toBeCloseTo(1, 5);
+        expect(vibeScores(index, '츤')).toBeNull(); // one syllable: no substring match
+    });
+
+    it('scores every character by its best phrase', () => {
+        const scores = vibeScores(index, 'airhead')!;
+        expect(scores.size).toBe(3);
+        expect(scores.get(3)).toBeCloseTo(1, 5); // owns Airhead itself
+        expect(scores.get(1)).toBeCloseTo(0, 5);
+    });
+
+    it('ranks characters by similarity to the query', () => {
+        const scores = vibeScores(index, 'tsundere')!;
+        const ranked = [...scores.entries()].sort((a, b) => b[1] - a[1]).map(([id]) => id);
+        expect(ranked).toEqual([1, 2, 3]);
+        expect(scores.get(2)!).toBeGreaterThan(0.85);
+        expect(scores.get(3)!).toBeLessThan(0.85);
+    });
+
+    it('averages the phrases a multi-phrase query mentions', () => {
+        const scores = vibeScores(index, 'tsundere cheerful')!;
+        // Query vector sits halfway between Tsundere and Cheerful
+        expect(scores.get(1)).toBeCloseTo(Math.SQRT1_2, 5);
+        expect(scores.get(3)).toBeCloseTo(Math.SQRT1_2, 5);
+        expect(scores.get(2)!).toBeGreaterThan(scores.get(1)!);
+    });
+});
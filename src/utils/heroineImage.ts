@@ -0,0 +1,37 @@
+/**
+ * Responsive sources for a heroine image.
+ * ml/heroine_images.py builds AVIF/WebP derivatives at a few widths and a
+ * tiny LQIP placeholder; characters exported before that (or whose image
+ * could not be fetched) only have the original AniList URL.
+ */
+import type { CharacterEmbedding } from '@/types/character';
+
+export interface HeroineImageSources {
+    src: string;
+    avifSrcSet?: string;
+    webpSrcSet?: string;
+    placeholder?: string;
+}
+
+/** Largest entry of a srcset string ("url 160w, url 320w") — the fallback `src`. */
+function largestSrc(srcSet: string): string {
+    const last = srcSet.split(',').pop() ?? '';
+    return last.trim().split(' ')[0];
+}
+
+export function getHeroineImageSources(char: CharacterEmbedding): HeroineImageSources {
+    if (!char.heroine_image_webp) {
+        return { src: char.heroine_image };
+    }
+    return {
+        src: largestSrc(char.heroine_image_webp),
+        avifSrcSet: char.heroine_image_avif || undefined,
+        webpSrcSet: char.heroine_image_webp,
+        placeholder: char.heroine_image_lqip || undefined,
+    };
+}
+
+/** Background style that shows the blurred placeholder under `fallbackBg` until the image paints. */
+export function placeholderBackground(sources: HeroineImageSources, fallbackBg: string): string {
+    return sources.placeholder ? `center / cover no-repeat url("${sources.placeholder}"), ${fallbackBg}` : fallbackBg;
+}
@@ -0,0 +1,28 @@
+/**
+ * Precomputed "similar characters" graph (public/similar.json, built by
+ * ml/similar_characters.py with the dual-embedding blend weights).
+ * Fetched once per session; no vectors are scanned on the device.
+ */
+
+export interface SimilarGraph {
+    k: number;
+    weights: { clip: number; arcface: number };
+    graph: Record<string, number[]>;
+}
+
+let graphPromise: Promise<SimilarGraph | null> | null = null;
+
+export function loadSimilarGraph(): Promise<SimilarGraph | null> {
+    if (!graphPromise) {
+        graphPromise = fetch('/similar.json')
+            .then((resp) => (resp.ok ? (resp.json() as Promise<SimilarGraph>) : null))
+            .catch(() => null);
+    }
+    return graphPromise;
+}
+
+/** Neighbour heroine_ids of `heroineId`, nearest first (empty when unknown). */
+export async function getSimilarIds(heroineId: number): Promise<number[]> {
+    const data = await loadSimilarGraph();
+    return data?.graph[String(heroineId)] ?? [];
+}
@@ -0,0 +1,145 @@
+/**
+ * "Vibe" search over precomputed CLIP text embeddings of every tag, genre
+ * and personality phrase (public/text_vocab.json + text_embeddings.bin,
+ * built by ml/text_embeddings.py). No text model runs on the device: a
+ * query is the average of the vocabulary phrases it mentions, scored
+ * against all phrases with one matrix-vector product.
+ *
+ * Only phrases in the text tower's languages are embedded (English for the
+ * default model). A tag or personality line in another language is an
+ * alias that selects its English counterpart's vector, so a Korean query
+ * is never scored against Korean vectors the tower can't tell apart.
+ */
+
+export interface TextIndex {
+    dim: number;
+    phrases: string[];
+    terms: string[];       // lowercased phrases and aliases a query is matched against
+    termPhrases: number[]; // phrase index selected by each term
+    matrix: Float32Array;  // phrases × dim, unit rows
+    characters: Record<string, number[]>;
+}
+
+interface TextVocab {
+    dim: number;
+    dtype: 'float16';
+    version: string;
+    languages: string[];
+    phrases: string[];
+    aliases: Record<string, number[]>;
+    characters: Record<string, number[]>;
+}
+
+/**
+ * Characters whose best phrase scores below this are not vibe matches.
+ *
+ * Set by hand for the default model (generate_embeddings.py's ViT-B-32
+ * text tower): short English tags that mean the same thing score about
+ * 0.9 and up against each other, while unrelated tags mostly land at
+ * 0.7–0.8, so 0.85 keeps near-synonyms and drops the rest. Queries in
+ * other languages go through aliases and are scored on the same English
+ * vectors. Re-check it when ml/text_embeddings.py switches models.
+ */
+export const VIBE_THRESHOLD = 0.85;
+
+let indexPromise: Promise<TextIndex | null> | null = null;
+
+export function float16ToFloat32(bits: Uint16Array): Float32Array {
+    const out = new Float32Array(bits.length);
+    for (let i = 0; i < bits.length; i++) {
+        const h = bits[i];
+        const sign = h & 0x8000 ? -1 : 1;
+        const exp = (h >> 10) & 0x1f;
+        const frac = h & 0x3ff;
+        if (exp === 0) out[i] = sign * frac * 2 ** -24;
+        else if (exp === 0x1f) out[i] = frac ? NaN : sign * Infinity;
+        else out[i] = sign * (1 + frac / 1024) * 2 ** (exp - 15);
+    }
+    return out;
+}
+
+export function loadTextIndex(): Promise<TextIndex | null> {
+    if (!indexPromise) {
+        indexPromise = (async () => {
+            const vocabResp = await fetch('/text_vocab.json');
+            if (!vocabResp.ok) return null;
+            const vocab = (await vocabResp.json()) as TextVocab;
+            const binResp = await fetch(`/text_embeddings.bin?v=${vocab.version}`);
+            if (!binResp.ok) return null;
+            const bits = new Uint16Array(await binResp.arrayBuffer());
+            if (bits.length !== vocab.phrases.length * vocab.dim) return null;
+            const terms = vocab.phrases.map((p) => p.toLowerCase());
+            const termPhrases = vocab.phrases.map((_, i) => i);
+            for (const [alias, targets] of Object.entries(vocab.aliases ?? {})) {
+                for (const i of targets) {
+                    terms.push(alias.toLowerCase());
+                    termPhrases.push(i);
+                }
+            }
+            return {
+                dim: vocab.dim,
+                phrases: vocab.phrases,
+                terms,
+                termPhrases,
+                matrix: float16ToFloat32(bits),
+                characters: vocab.characters,
+            };
+        })().catch(() => null);
+    }
+    return indexPromise;
+}
+
+/** Shortest query matched as a substring; below this only whole phrases count. */
+const MIN_SUBSTRING_LENGTH = 2;
+
+/**
+ * Indices of vocabulary phrases the query mentions (or that contain the
+ * whole query), directly or through an alias. A one-letter query (the first keystroke) would otherwise be
+ * a substring of most phrases and average them into a near-mean vector.
+ */
+function queryPhrases(index: TextIndex, query: string): number[] {
+    const q = query.trim().toLowerCase();
+    const substring = q.length >= MIN_SUBSTRING_LENGTH;
+    const words = q.split(/[\s,./]+/).filter((w) => w.length >= MIN_SUBSTRING_LENGTH);
+    const hits = new Set<number>();
+    index.terms.forEach((t, i) => {
+        if ((substring && (t.includes(q) || q.includes(t))) || t === q || words.some((w) => t === w)) {
+            hits.add(index.termPhrases[i]);
+        }
+    });
+    return [...hits];
+}
+
+/**
+ * Vibe score per heroine_id (best cosine between the query and any of the
+ * character's phrases), or null when the query mentions no known phrase.
+ */
+export function vibeScores(index: TextIndex, query: string): Map<number, number> | null {
+    const hits = queryPhrases(index, query);
+    if (hits.length === 0) return null;
+
+    const { dim, matrix } = index;
+    const q = new Float32Array(dim);
+    for (const i of hits) {
+        for (let d = 0; d < dim; d++) q[d] += matrix[i * dim + d];
+    }
+    let norm = 0;
+    for (let d = 0; d < dim; d++) norm += q[d] * q[d];
+    norm = Math.sqrt(norm) || 1;
+
+    const phraseScores = new Float32Array(index.phrases.length);
+    for (let i = 0; i < phraseScores.length; i++) {
+        let dot = 0;
+        const row = i * dim;
+        for (let d = 0; d < dim; d++) dot += matrix[row + d] * q[d];
+        phraseScores[i] = dot / norm;
+    }
+
+    const scores = new Map<number, number>();
+    for (const [id, phrases] of Object.entries(index.characters)) {
+        let best = -1;
+        for (const i of phrases) best = Math.max(best, phraseScores[i]);
+        scores.set(Number(id), best);
+    }
+    return scores;
+}